@@ -2,7 +2,7 @@
 main.py
 
 Created on 2021-05-03
-Updated on 2021-05-15
+Updated on 2026-10-19
 
 Copyright © Ryan Kan
 
@@ -12,21 +12,42 @@ Description: The main file.
 # IMPORTS
 import argparse
 import os
+import sys
 
-from src.conversion import video_to_wav, audio_to_wav, timetable_to_subrip, timetable_to_webvtt, \
-    SUPPORTED_VIDEO_EXTENSIONS, SUPPORTED_AUDIO_EXTENSIONS
-from src.gentle_interface import get_timetable
-from src.timetable_fixing import Aligner
+from src.alignment_backends import BACKENDS
+from src.commands import batch_command, live_command, queue_command, render_command, tune_command
+from src.commands.common import add_formatting_arguments, add_workspace_arguments, parse_megabytes, \
+    validate_formatting_arguments
+from src.conversion import DEFAULT_MARKUP, MARKUP_KINDS, SUPPORTED_VIDEO_EXTENSIONS, SUPPORTED_AUDIO_EXTENSIONS
+from src.metrics import start_http_server, write_textfile
+from src.pipeline import caption_media, caption_media_bounded, caption_media_in_background, draft_captions, DRAFT_MODES
 
 # CONSTANTS
-CAPTION_TYPE_TO_EXTENSION = {
-    "webvtt": ".vtt",
-    "subrip": ".srt"
+COMMANDS = {
+    "render": render_command,
+    "queue": queue_command,
+    "live": live_command,
+    "batch": batch_command,
+    "tune": tune_command
 }
 
+# SUBCOMMANDS
+# Run a subcommand instead of captioning a video if one was given
+if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+    command = COMMANDS[sys.argv[1]]
+
+    commandParser = argparse.ArgumentParser(prog=f"main.py {sys.argv[1]}", description=command.DESCRIPTION)
+    command.add_arguments(commandParser)
+    command.run(commandParser.parse_args(sys.argv[2:]))
+
+    sys.exit(0)
+
 # INPUT
 # Initialise the argument parser
 parser = argparse.ArgumentParser(description="A Program that helps convert a video into a transcript with timestamps.",
+                                 epilog="Other commands (run `main.py [command] -h` for their options):\n" +
+                                        "\n".join(f"  {name}: {module.DESCRIPTION}"
+                                                  for name, module in COMMANDS.items()),
                                  formatter_class=argparse.RawTextHelpFormatter)
 
 # Add the arguments
@@ -34,20 +55,62 @@ parser.add_argument("video_or_audio_file", help=f"The video/audio file to be cap
                                                 f"should be in one of the following lists:\n"
                                                 f"Video: {list(SUPPORTED_VIDEO_EXTENSIONS.keys())}\n"
                                                 f"Audio: {list(SUPPORTED_AUDIO_EXTENSIONS.keys())}")
-parser.add_argument("transcript_file", help="The transcript of the video.")
-
-parser.add_argument("-b", "--block-type", choices=["time", "sentence"], default="sentence",
-                    help="How the captions should be grouped.")
-parser.add_argument("-d", "--block-duration", type=int, default=5,
-                    help="The length of time that makes up each block. Must be a positive integer."
-                         "Provide it only if `block-type` is 'time'.")
-parser.add_argument("-l", "--max-block-length", type=int, default=15,
-                    help="The maximum number of timetabled words that can be in each caption block. Must be a "
-                         "positive integer. Provide it only if `block-type` is 'sentence'.")
-parser.add_argument("-c", "--caption-type", choices=["webvtt", "subrip"], default="webvtt",
-                    help="Format of the captions.")
+parser.add_argument("transcript_files", nargs="+",
+                    help="The transcript(s) of the video. If more than one transcript is given, all of them are "
+                         "aligned against the same audio and one captions file is written per transcript.")
+
+add_formatting_arguments(parser)
+parser.add_argument("-a", "--backend", choices=list(BACKENDS.keys()), default="gentle",
+                    help="The alignment backend to use. 'gentle' uses the gentle docker container; 'dtw' is a less "
+                         "accurate aligner that runs in-process.")
+parser.add_argument("-f", "--fallback-backend", choices=list(BACKENDS.keys()), default=None,
+                    help="The alignment backend used for the words that the main backend failed to align.")
+parser.add_argument("-r", "--refine", action="store_true",
+                    help="Re-align only the regions that the backend lost track of, sending a padded window of audio "
+                         "and the matching slice of the transcript for each region.")
+parser.add_argument("-n", "--cut-non-speech", action="store_true",
+                    help="Cut the long stretches without speech (e.g. music intros, outros and interludes) out of the "
+                         "audio before it is sent to the alignment backend. The captions still use the original times.")
+parser.add_argument("-m", "--strip-markup", nargs="*", choices=MARKUP_KINDS, default=None,
+                    help=f"Strip the markup that is not spoken out of the transcripts before alignment, so that the "
+                         f"backend does not try to find it in the audio. The captions still show it. Give the kinds "
+                         f"of markup to strip, or none to strip {list(DEFAULT_MARKUP)}.")
+parser.add_argument("--markup-pattern", action="append", default=[],
+                    help="A regular expression of other markup to strip out of the transcripts before alignment. Can "
+                         "be given more than once.")
+parser.add_argument("--deadline", type=float, default=None,
+                    help="Number of seconds in which the captions must be written. The audio is aligned region by "
+                         "region, and the regions that cannot be aligned in time get timings interpolated from the "
+                         "aligned words around them. Cannot be used with '--fallback-backend' or '--refine'.")
+parser.add_argument("--memory-budget", type=parse_megabytes, default=None,
+                    help="Number of megabytes of memory that captioning should stay within, however long the file is. "
+                         "The audio is streamed and aligned window by window, and the timetable and captions are "
+                         "written to disk as they are made. Cannot be used with '--fallback-backend', '--refine', "
+                         "'--cut-non-speech', '--deadline' or '--draft'.")
+parser.add_argument("-w", "--warm-up", action="store_true",
+                    help="Send a tiny alignment to the gentle server once it is up, so that the first real alignment "
+                         "does not have to wait for gentle to load its models.")
+parser.add_argument("-t", "--transport-format", choices=["wav", "flac"], default="wav",
+                    help="Container of the audio that is sent to the alignment backend. 'flac' is lossless but smaller "
+                         "to upload. Backends that do not accept it fall back to 'wav'.")
+parser.add_argument("--draft", choices=DRAFT_MODES, default=None,
+                    help="Write approximate captions within seconds, before aligning, and replace them with the "
+                         "aligned captions once done. 'spread' spreads the words evenly over the duration of the file; "
+                         "'energy' also decodes the audio to skip over the silences.")
+parser.add_argument("--draft-only", action="store_true",
+                    help="Only write the approximate captions, without aligning. Uses the '--draft' mode, or 'energy' "
+                         "if none is given.")
+parser.add_argument("-s", "--save-timetable", action="store_true",
+                    help="Also save each timetable next to its captions file, with the extension '.timetable', so that "
+                         "the captions can be re-rendered with the `render` command without aligning again.")
+add_workspace_arguments(parser)
+parser.add_argument("--metrics-file", default=None,
+                    help="Path to write the throughput metrics to, in the Prometheus text format, once done.")
+parser.add_argument("--metrics-port", type=int, default=None,
+                    help="Port to serve the throughput metrics on, in the Prometheus text format, while running.")
 parser.add_argument("-o", "--output-file-name", default="transcript",
-                    help="Name of the output file, without the extension.")
+                    help="Name of the output file, without the extension. If more than one transcript is given, "
+                         "the name of each transcript is appended to this name.")
 
 # Parse the arguments
 args = parser.parse_args()
@@ -56,11 +119,22 @@ args = parser.parse_args()
 if not os.path.isfile(args.video_or_audio_file):
     raise FileNotFoundError(f"A file does not exist at the path '{args.video_or_audio_file}'.")
 
-if not os.path.isfile(args.transcript_file):
-    raise FileNotFoundError(f"A transcript does not exist at the path '{args.transcript}'.")
+for transcript_file in args.transcript_files:
+    if not os.path.isfile(transcript_file):
+        raise FileNotFoundError(f"A transcript does not exist at the path '{transcript_file}'.")
+
+validate_formatting_arguments(args)
+
+assert args.deadline is None or args.deadline > 0, "The deadline must be positive."
+assert args.deadline is None or (args.fallback_backend is None and not args.refine), \
+    "A deadline cannot be used with '--fallback-backend' or '--refine'."
 
-assert args.block_duration > 0, "The block duration must be a positive integer."
-assert args.max_block_length > 0, "The maximum block length must be a positive integer."
+assert args.memory_budget is None or args.memory_budget > 0, "The memory budget must be positive."
+assert args.memory_budget is None or (args.fallback_backend is None and not args.refine and not args.cut_non_speech and
+                                      args.deadline is None and args.draft is None and not args.draft_only and
+                                      args.transport_format == "wav" and args.workspace_quota is None), \
+    "A memory budget cannot be used with '--fallback-backend', '--refine', '--cut-non-speech', '--deadline', " \
+    "'--draft', '--transport-format flac' or '--workspace-quota'."
 
 extension = os.path.splitext(args.video_or_audio_file)[-1]
 assert extension in SUPPORTED_VIDEO_EXTENSIONS or extension in SUPPORTED_AUDIO_EXTENSIONS, \
@@ -68,46 +142,49 @@ assert extension in SUPPORTED_VIDEO_EXTENSIONS or extension in SUPPORTED_AUDIO_E
     f"(Supported: {list(SUPPORTED_VIDEO_EXTENSIONS.keys()) + list(SUPPORTED_AUDIO_EXTENSIONS.keys())}"
 
 # PROCESSES
-# Get the extension of the video or audio file
-extension = os.path.splitext(args.video_or_audio_file)[-1]
-
-# Extract the audio from the video or audio file depending on the file's extension
-print("Extracting audio from the video or audio file...")
-if extension in SUPPORTED_VIDEO_EXTENSIONS:
-    audioFilePath = video_to_wav(args.video_or_audio_file, wav_file_name="audio_temp")
-else:
-    audioFilePath = audio_to_wav(args.video_or_audio_file, wav_file_name="audio_temp")
-
-# Get the timetable from the audio file and the transcript
-print("Getting timetable from transcript and audio file...")
-alignedTimetable = get_timetable(audioFilePath, args.transcript_file)
-
-# Align the timetable with the transcript
-print("Aligning timetable with transcript...")
-aligner = Aligner(open(args.transcript_file, "r").read(), alignedTimetable)
-
-if args.block_type == "time":
-    alignedTimetable = aligner.align_time(args.block_duration)
-elif args.block_type == "sentence":
-    alignedTimetable = aligner.align_sentence(args.max_block_length)
-
-# Convert the `alignedTimetable` into a captions string
-print("Converting aligned timetable to captions...")
-if args.caption_type == "webvtt":
-    captionContent = timetable_to_webvtt(alignedTimetable)
-elif args.caption_type == "subrip":
-    captionContent = timetable_to_subrip(alignedTimetable)
+# Start serving the metrics, if needed
+if args.metrics_port is not None:
+    start_http_server(args.metrics_port)
+
+formattingOptions = {"block_type": args.block_type, "block_duration": args.block_duration,
+                     "max_block_length": args.max_block_length, "caption_type": args.caption_type}
+markupOptions = {"strip_markup": DEFAULT_MARKUP if args.strip_markup == [] else tuple(args.strip_markup or ()),
+                 "markup_patterns": tuple(args.markup_pattern)}
+
+if args.draft_only:
+    # Only write the approximate captions
+    print("Writing the draft captions...")
+    draft_captions(args.video_or_audio_file, args.transcript_files, output_file_name=args.output_file_name,
+                   mode=args.draft or "energy", **formattingOptions)
+elif args.memory_budget is not None:
+    # Stream the audio through the alignment and the captions, staying within the memory budget
+    print("Captioning the video or audio file within the memory budget...")
+    caption_media_bounded(args.video_or_audio_file, args.transcript_files, args.memory_budget,
+                          output_file_name=args.output_file_name, backend=args.backend, warm_up=args.warm_up,
+                          save_timetables=args.save_timetable, **formattingOptions, **markupOptions)
 else:
-    # This should never get here, but just in case include an else clause
-    captionContent = ""
+    # Extract the audio, align the transcripts against it and write the captions
+    captionOptions = {"backend": args.backend, "fallback_backend": args.fallback_backend, "warm_up": args.warm_up,
+                      "transport_format": args.transport_format, "save_timetables": args.save_timetable,
+                      "refine": args.refine, "workspace_quota": args.workspace_quota,
+                      "cut_non_speech": args.cut_non_speech, "deadline": args.deadline, **markupOptions}
+
+    if args.draft is not None:
+        # Write the drafts first, then upgrade them once the alignment is done
+        draftPaths, upgrade = caption_media_in_background(args.video_or_audio_file, args.transcript_files,
+                                                          output_file_name=args.output_file_name,
+                                                          draft_mode=args.draft, **formattingOptions,
+                                                          **captionOptions)
+        print(f"Draft captions written to {draftPaths}. Aligning to replace them...")
+        upgrade.result()
+    else:
+        print("Captioning the video or audio file...")
+        caption_media(args.video_or_audio_file, args.transcript_files, output_file_name=args.output_file_name,
+                      **formattingOptions, **captionOptions)
+
+print("Done. Please review the generated file(s) and fix any errors that may arise during captioning.")
 
 # OUTPUT
-print("Writing captions to file...")
-with open(args.output_file_name + CAPTION_TYPE_TO_EXTENSION[args.caption_type], "w+") as f:
-    f.write(captionContent)
-
-print("Done. Please review the generated file and fix any errors that may arise during captioning.")
-
-# CLEANUP
-# Remove the temporary audio file
-os.remove("audio_temp.wav")
+# Export the metrics, if needed
+if args.metrics_file is not None:
+    write_textfile(args.metrics_file)
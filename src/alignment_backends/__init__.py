@@ -0,0 +1,8 @@
+from .approximate_backend import ApproximateBackend, spread_transcript
+from .backend import AlignmentBackend
+from .deadline import align_within_deadline, plan_regions
+from .dtw_backend import DTWBackend
+from .fallback import fill_unaligned_words, find_unaligned_runs, is_aligned
+from .gentle_backend import GentleBackend
+from .refinement import find_low_confidence_regions, refine_timetable
+from .registry import BACKENDS, get_backend
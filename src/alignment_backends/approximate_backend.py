@@ -0,0 +1,172 @@
+"""
+approximate_backend.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: An alignment backend that does not align at all, but spreads the words of the transcript over the speech
+             in the audio in proportion to their lengths.
+
+Notes:
+    - Each word is given a share of the speech that is proportional to its number of characters, including the
+      punctuation and whitespace after it (so that sentence ends get slightly longer pauses). The speech is found with a
+      cheap energy scan, so long silences (e.g. music or pauses between scenes) are skipped over.
+    - This takes milliseconds, but the timings drift by a few seconds over a long file. It is meant for draft captions,
+      and for filling in the words that a real backend could not align in time.
+"""
+
+# IMPORTS
+import os
+import re
+
+import numpy as np
+
+from src.alignment_backends.backend import AlignmentBackend
+from src.audio_analysis import find_speech_segments, read_wav_samples
+from src.conversion.audio_format import AudioFormat
+
+# CONSTANTS
+WORD_REGEX = re.compile(r"(\w|\’\w|\'\w)+", re.UNICODE)  # Same word definition as gentle's
+
+
+# CLASS
+class ApproximateBackend(AlignmentBackend):
+    """
+    Alignment backend that spreads the words of the transcript over the speech in proportion to their lengths.
+    """
+
+    # Attributes
+    name = "approximate"
+    audio_format = AudioFormat(sample_rate=8000, channels=1, sample_width=2, containers=("wav",))
+
+    # Dunder methods
+    def __init__(self, use_energy=True):
+        """
+        Initialisation method.
+
+        Args:
+            use_energy (bool):
+                Whether the words should only be spread over the parts of the audio that contain speech. Otherwise they
+                are spread evenly over the whole audio.
+                (Default = True)
+        """
+
+        self.use_energy = use_energy
+
+        # Cache the speech segments of the last audio file, since regions of the same file are usually spread in
+        # succession
+        self._cached_audio_file_path = None
+        self._cached_segments = None
+
+    # Methods
+    def get_timetable(self, audio_file_path, transcript_path):
+        # Check if the transcript exists
+        if not os.path.isfile(transcript_path):
+            raise FileNotFoundError(f"The transcript cannot be found at the path '{transcript_path}'.")
+
+        with open(transcript_path, "r") as f:
+            transcript = f.read()
+
+        return spread_transcript(transcript, self._get_speech_segments(audio_file_path))
+
+    def align_region(self, audio_file_path, transcript, start_offset, end_offset, start_time, end_time,
+                     open_end=False):
+        # Only keep the speech inside the window
+        segments = [(max(start, start_time), min(end, end_time)) for start, end in
+                    self._get_speech_segments(audio_file_path) if start < end_time and end > start_time]
+
+        return spread_transcript(transcript, segments or [(start_time, end_time)], start_offset=start_offset,
+                                 end_offset=end_offset)
+
+    # Helper Methods
+    def _get_speech_segments(self, audio_file_path):
+        """
+        Helper method that gets the segments of speech in the audio file.
+
+        Args:
+            audio_file_path (str):
+                Path to the WAV file.
+
+        Returns:
+            list[tuple[float, float]]:
+                The start and end times in seconds of each segment of speech.
+        """
+
+        if audio_file_path != self._cached_audio_file_path:
+            samples, sample_rate = read_wav_samples(audio_file_path)
+            duration = len(samples) / sample_rate
+
+            segments = find_speech_segments(samples, sample_rate) if self.use_energy else []
+
+            # Set the path last, so that other threads spreading regions of the same file never see stale segments
+            self._cached_segments = segments or [(0.0, duration)]
+            self._cached_audio_file_path = audio_file_path
+
+        return self._cached_segments
+
+
+# FUNCTIONS
+def spread_transcript(transcript, speech_segments, start_offset=0, end_offset=None):
+    """
+    Spreads the words of a transcript over segments of speech in proportion to their numbers of characters.
+
+    Args:
+        transcript (str):
+            The transcript.
+
+        speech_segments (list[tuple[float, float]]):
+            The start and end times in seconds of each segment of speech, in order. Use `[(0, duration)]` to spread
+            the words evenly over the whole audio.
+
+        start_offset (int):
+            Position of the first character of the transcript slice to spread.
+            (Default = 0)
+
+        end_offset (int):
+            Position of the character that is one after the transcript slice. Use `None` to spread the rest of the
+            transcript.
+            (Default = None)
+
+    Returns:
+        list[dict]:
+            The timetable of the words in the transcript slice, in the same format as the other backends'.
+    """
+
+    end_offset = len(transcript) if end_offset is None else end_offset
+    words = list(WORD_REGEX.finditer(transcript, start_offset, end_offset))
+
+    if not words or not speech_segments:
+        return []
+
+    # Each word owns the characters from its start up to the start of the next word
+    word_starts = np.array([word.start() for word in words] + [end_offset], dtype=np.float64) - words[0].start()
+    word_ends = np.array([word.end() for word in words], dtype=np.float64) - words[0].start()
+    num_chars = word_starts[-1]
+
+    # Map the characters onto the speech time, then the speech time onto the audio's time
+    segment_starts = np.array([start for start, _ in speech_segments], dtype=np.float64)
+    segment_durations = np.array([end - start for start, end in speech_segments], dtype=np.float64)
+    speech_before = np.concatenate(([0], np.cumsum(segment_durations)))  # Speech before the start of each segment
+
+    def __to_time(char_positions, side):
+        """Helper function that converts character positions into times."""
+        speech_times = char_positions / num_chars * speech_before[-1]
+        segment_indices = np.clip(np.searchsorted(speech_before, speech_times, side=side) - 1, 0,
+                                  len(speech_segments) - 1)
+        return segment_starts[segment_indices] + speech_times - speech_before[segment_indices]
+
+    # Words that start on a segment's boundary start in the later segment, and words that end on it end in the earlier
+    start_times = __to_time(word_starts[:-1], "right")
+    end_times = __to_time(word_ends, "left")
+
+    return [{
+        "alignedWord": word.group().lower(),
+        "case": "success",
+        "end": round(float(end_time), 2),
+        "endOffset": word.end(),
+        "start": round(float(start_time), 2),
+        "startOffset": word.start(),
+        "word": word.group()
+    } for word, start_time, end_time in zip(words, start_times, end_times)]
@@ -0,0 +1,126 @@
+"""
+backend.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: The interface that every alignment backend implements.
+"""
+
+# IMPORTS
+from src.conversion.audio_format import AudioFormat
+
+
+# CLASS
+class AlignmentBackend:
+    """
+    The alignment backend interface.
+
+    An alignment backend aligns a transcript against an audio file and produces the timetable of spoken words. Every
+    backend must produce the same word dictionaries as the gentle server, i.e. each word has the keys
+        - "word", "startOffset" and "endOffset", which locate the word in the transcript;
+        - "case", which is "success" if the word was aligned and something else (e.g. "not-found-in-audio") if not; and
+        - "alignedWord", "start" and "end" (in seconds), which are only present if the word was aligned.
+    """
+
+    # Attributes
+    name = None
+    audio_format = AudioFormat()  # The audio format that the backend accepts
+
+    # Dunder methods
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    # Methods
+    def start(self):
+        """
+        Method that prepares the backend for alignment.
+        """
+
+        pass
+
+    def stop(self):
+        """
+        Method that releases any resources that the backend holds.
+        """
+
+        pass
+
+    def get_timetable(self, audio_file_path, transcript_path):
+        """
+        Method that aligns a transcript against an audio file.
+
+        Args:
+            audio_file_path (str):
+                Path to the audio file.
+
+            transcript_path (str):
+                Path to the transcript.
+
+        Returns:
+            list[dict]:
+                The timetable of spoken words.
+        """
+
+        raise NotImplementedError
+
+    def get_timetables(self, audio_file_path, transcript_paths):
+        """
+        Method that aligns several transcripts against the same audio file.
+
+        Args:
+            audio_file_path (str):
+                Path to the audio file.
+
+            transcript_paths (list[str]):
+                Paths to the transcripts.
+
+        Returns:
+            list[list[dict]]:
+                The timetables, in the same order as `transcript_paths`.
+        """
+
+        return [self.get_timetable(audio_file_path, transcript_path) for transcript_path in transcript_paths]
+
+    def align_region(self, audio_file_path, transcript, start_offset, end_offset, start_time, end_time,
+                     open_end=False):
+        """
+        Method that aligns a slice of the transcript against a window of the audio file.
+
+        Args:
+            audio_file_path (str):
+                Path to the audio file.
+
+            transcript (str):
+                The full transcript.
+
+            start_offset (int):
+                Position of the first character of the transcript slice.
+
+            end_offset (int):
+                Position of the character that is one after the transcript slice.
+
+            start_time (float):
+                Start of the audio window in seconds.
+
+            end_time (float):
+                End of the audio window in seconds.
+
+            open_end (bool):
+                Whether the audio window may end before the transcript slice does, e.g. because the rest of the slice
+                has not been said yet. The words that the window does not reach are returned unaligned.
+                (Default = False)
+
+        Returns:
+            list[dict]:
+                The timetable of the words in the transcript slice. The offsets are relative to the full transcript and
+                the times are relative to the start of the audio file.
+        """
+
+        raise NotImplementedError
@@ -0,0 +1,412 @@
+"""
+deadline.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Aligns as much of the transcripts as possible by a deadline, and interpolates the timings of the rest.
+
+Notes:
+    - The words are first spread over the speech in the audio (see `approximate_backend.py`), which takes milliseconds
+      and says roughly where each word was said. The transcripts are then cut into regions of roughly equal duration,
+      and each region is aligned against a padded window of the audio around it.
+    - The regions are aligned in an order that spreads them out over the audio (the first, the middle, the quarters,
+      and so on), so that however many of them are aligned by the deadline, the regions that are not are short and lie
+      between aligned ones. Their timings are then interpolated between the aligned words on either side.
+    - The time that each region will take is predicted from the tuning profile until the first regions are done, and
+      from the observed time per second of audio after that. A region that is predicted to miss the deadline is not
+      started at all.
+    - A backend call cannot be interrupted, so the regions that are still being aligned at the deadline are abandoned
+      rather than waited for. At most one region per worker can therefore run past the deadline, and its result is
+      thrown away.
+"""
+
+# IMPORTS
+import concurrent.futures
+import os
+import threading
+import time
+
+from src.alignment_backends.approximate_backend import ApproximateBackend
+from src.alignment_backends.fallback import fill_unaligned_words, is_aligned
+from src.conversion.audio_info import get_audio_duration
+from src.metrics import REGISTRY
+from src.tuning.profile import load_backend_settings
+
+# CONSTANTS
+MIN_REGION_DURATION = 20  # Shortest region in seconds; shorter regions give the backend too little context
+MAX_REGION_DURATION = 300  # Longest region in seconds; longer regions make falling back too coarse
+REGIONS_PER_WORKER = 4  # Number of regions to aim for per worker, so that the workers finish at about the same time
+MAX_OVERHEAD_FRACTION = 0.2  # Largest fraction of the time of a region that may be spent on the fixed time per request
+REGION_PADDING = 5  # Number of seconds of audio to add on either side of a region's window, since the spread drifts
+
+DEADLINE_REGIONS = REGISTRY.counter("video_to_captions_deadline_regions_total",
+                                    "Number of regions that were aligned or approximated to meet a deadline, by "
+                                    "outcome.", label_names=("outcome",))
+
+
+# HELPER FUNCTIONS
+def spread_order(num_items):
+    """
+    Orders items so that every prefix of the order is spread out evenly, e.g. 0, 4, 2, 6, 1, 3, 5, 7 for eight items.
+
+    Args:
+        num_items (int):
+            Number of items.
+
+    Returns:
+        list[int]:
+            The indices of the items.
+    """
+
+    order, seen = [], set()
+    step = 1 << max(0, (num_items - 1).bit_length())
+
+    while step:
+        for i in range(0, num_items, step):
+            if i not in seen:
+                seen.add(i)
+                order.append(i)
+
+        step //= 2
+
+    return order
+
+
+def cut_regions(draft_timetable, region_duration, audio_duration, padding=REGION_PADDING):
+    """
+    Cuts a spread timetable into regions of roughly equal duration.
+
+    Args:
+        draft_timetable (list[dict]):
+            The timetable of the words spread over the speech, where every word has a start and end time.
+
+        region_duration (float):
+            Duration of each region in seconds.
+
+        audio_duration (float):
+            Duration of the audio in seconds.
+
+        padding (float):
+            Number of seconds of audio to add on either side of each region's window.
+            (Default = 5)
+
+    Returns:
+        list[tuple[int, int, float, float]]:
+            The index of the first word and the index of the last word of each region, and the start and end times of
+            the audio window to align it against.
+    """
+
+    # Group the words by the region that they start in
+    bounds = []  # [index of the first word, index of the last word, region number]
+
+    for i, word in enumerate(draft_timetable):
+        region_number = int(word["start"] // region_duration)
+
+        if bounds and bounds[-1][2] == region_number:
+            bounds[-1][1] = i
+        else:
+            bounds.append([i, i, region_number])
+
+    return [(first_index, last_index, max(0.0, draft_timetable[first_index]["start"] - padding),
+             min(audio_duration, draft_timetable[last_index]["end"] + padding))
+            for first_index, last_index, _ in bounds]
+
+
+def get_region_times(timetable, region):
+    """
+    Gets the times that a region of a timetable spans, for reporting.
+
+    Args:
+        timetable (list[dict]):
+            The timetable of spoken words.
+
+        region (tuple[int, int, float, float]):
+            The region, as from `cut_regions()`.
+
+    Returns:
+        tuple[float, float]:
+            The start time of the first word and the end time of the last word of the region. The edges of the region's
+            window are used for words without times.
+    """
+
+    first_index, last_index, start_time, end_time = region
+    return timetable[first_index].get("start", start_time), timetable[last_index].get("end", end_time)
+
+
+# FUNCTIONS
+def plan_regions(audio_duration, budget, real_time_factor, job_overhead, max_workers):
+    """
+    Chooses the duration of the regions and the number of regions to align at a time.
+
+    The regions are made long enough that the fixed time per request is a small part of their time, short enough that
+    every worker gets a few of them, and short enough that one of them fits in the budget.
+
+    Args:
+        audio_duration (float):
+            Number of seconds of audio to align, over all the transcripts.
+
+        budget (float):
+            Number of seconds left to align in.
+
+        real_time_factor (float):
+            Seconds taken to align each second of audio.
+
+        job_overhead (float):
+            Seconds taken by each request regardless of its duration.
+
+        max_workers (int):
+            Largest number of regions that the backend can align at a time.
+
+    Returns:
+        tuple[float, int]:
+            The duration of each region in seconds and the number of regions to align at a time.
+    """
+
+    real_time_factor = max(real_time_factor, 1e-6)
+
+    # Find the shortest region whose fixed time is a small enough part of its time
+    shortest = job_overhead * (1 - MAX_OVERHEAD_FRACTION) / (MAX_OVERHEAD_FRACTION * real_time_factor)
+    shortest = max(MIN_REGION_DURATION, shortest)
+
+    # Give every worker a few regions, but fit at least one region in the budget
+    region_duration = min(max(audio_duration / (max_workers * REGIONS_PER_WORKER), shortest), MAX_REGION_DURATION)
+    region_duration = max(MIN_REGION_DURATION, min(region_duration, (budget - job_overhead) / real_time_factor))
+
+    return region_duration, max(1, min(max_workers, int(audio_duration // region_duration) + 1))
+
+
+def predict_alignment_time(audio_duration, num_regions, num_workers, real_time_factor, job_overhead):
+    """
+    Predicts how long aligning regions will take.
+
+    The prediction assumes that aligning several regions at a time only hides the fixed time per request, and does not
+    align more seconds of audio per second, which holds for a gentle server that already uses all of its threads for
+    one request. It is therefore pessimistic for backends whose workers really run in parallel.
+
+    Args:
+        audio_duration (float):
+            Number of seconds of audio in all the regions.
+
+        num_regions (int):
+            Number of regions.
+
+        num_workers (int):
+            Number of regions that are aligned at a time.
+
+        real_time_factor (float):
+            Seconds taken to align each second of audio.
+
+        job_overhead (float):
+            Seconds taken by each request regardless of its duration.
+
+    Returns:
+        float:
+            The predicted number of seconds.
+    """
+
+    return -(-num_regions // num_workers) * job_overhead + real_time_factor * audio_duration
+
+
+def align_within_deadline(backend, audio_file_path, transcript_paths, deadline_time, settings=None, max_workers=None):
+    """
+    Aligns the transcripts region by region until a deadline, and interpolates the timings of the regions that were not
+    aligned by then.
+
+    Args:
+        backend (AlignmentBackend):
+            The started backend to align the regions with. Use `None` to approximate every region, e.g. because the
+            backend failed to start.
+
+        audio_file_path (str):
+            Path to the WAV file.
+
+        transcript_paths (list[str]):
+            Paths to the transcripts.
+
+        deadline_time (float):
+            The time, as given by `time.monotonic()`, by which the timetables must be returned.
+
+        settings (dict):
+            The backend's settings from the tuning profile, which hold its `real_time_factor` and `job_overhead`. Use
+            `None` to load them from the tuning profile.
+            (Default = None)
+
+        max_workers (int):
+            Largest number of regions to align at a time. Use `None` to use the number of threads or workers in the
+            settings, or one per CPU.
+            (Default = None)
+
+    Returns:
+        tuple[list[list[dict]], list[dict]]:
+            The timetables, in the same order as `transcript_paths`, and a report for each transcript holding the
+            `aligned` and `approximated` stretches of it as lists of start and end times in seconds. The regions that
+            are still being aligned at the deadline (at most one per worker) are left running in the background, so
+            they may fail once the caller removes the audio file or stops the backend.
+    """
+
+    # Get the settings that the plan is based on
+    if settings is None:
+        settings = load_backend_settings(backend.name) if backend is not None else {}
+
+    real_time_factor = settings.get("real_time_factor", 1)
+    job_overhead = settings.get("job_overhead", 0)
+
+    if max_workers is None:
+        max_workers = settings.get("threads") or settings.get("workers")
+        max_workers = max_workers if isinstance(max_workers, int) else os.cpu_count() or 1
+
+    # Spread the words of each transcript over the speech, which gives every word a rough time
+    approximator = ApproximateBackend()
+    transcripts, draft_timetables = [], []
+
+    for transcript_path in transcript_paths:
+        with open(transcript_path, "r") as f:
+            transcripts.append(f.read())
+        draft_timetables.append(approximator.get_timetable(audio_file_path, transcript_path))
+
+    # Plan the regions
+    audio_duration = get_audio_duration(audio_file_path)
+    region_duration, num_workers = plan_regions(audio_duration * len(transcripts), deadline_time - time.monotonic(),
+                                                real_time_factor, job_overhead, max_workers)
+
+    all_regions = [cut_regions(draft_timetable, region_duration, audio_duration) for draft_timetable in
+                   draft_timetables]
+
+    # Order the regions so that the aligned ones are spread out over the audio, taking turns between the transcripts
+    work = sorted(((rank, transcript_index, region_index)
+                   for transcript_index, regions in enumerate(all_regions)
+                   for rank, region_index in enumerate(spread_order(len(regions)))))
+    work = [(transcript_index, region_index) for _, transcript_index, region_index in work]
+
+    if backend is not None:
+        window_seconds = sum(end - start for regions in all_regions for _, _, start, end in regions)
+        predicted_time = predict_alignment_time(window_seconds, len(work), num_workers, real_time_factor,
+                                                job_overhead)
+        print(f"Aligning {len(work)} region(s) of about {region_duration:.0f}s, {num_workers} at a time; predicted to "
+              f"take {predicted_time:.0f}s of the {max(0.0, deadline_time - time.monotonic()):.0f}s left.")
+
+    # Align the regions in the background
+    observed = {"seconds": 0.0, "audio_seconds": 0.0}  # Time taken by, and audio in, the regions aligned so far
+    lock = threading.Lock()
+    given_up = threading.Event()  # Set at the deadline, so that no region is started after it
+
+    def __align_helper(transcript_index, region_index):
+        """Helper function that aligns a region, unless it is predicted to miss the deadline."""
+        first_index, last_index, start_time, end_time = all_regions[transcript_index][region_index]
+        window_duration = end_time - start_time
+
+        # Predict how long the region will take, assuming no speed-up from aligning several at a time until observed
+        with lock:
+            if observed["audio_seconds"] > 0:
+                predicted = window_duration * observed["seconds"] / observed["audio_seconds"]
+            else:
+                predicted = job_overhead + real_time_factor * window_duration * num_workers
+
+        if given_up.is_set() or time.monotonic() + predicted > deadline_time:
+            return None
+
+        region_start_time = time.monotonic()
+        draft_timetable = draft_timetables[transcript_index]
+        region_words = backend.align_region(audio_file_path, transcripts[transcript_index],
+                                            draft_timetable[first_index]["startOffset"],
+                                            draft_timetable[last_index]["endOffset"], start_time, end_time)
+
+        with lock:
+            observed["seconds"] += time.monotonic() - region_start_time
+            observed["audio_seconds"] += window_duration
+
+        return region_words
+
+    region_results = {}
+    pending = work if backend is not None else []
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=num_workers)
+
+    while pending:
+        futures = {executor.submit(__align_helper, *item): item for item in pending}
+        done, not_done = concurrent.futures.wait(futures, timeout=max(0.0, deadline_time - time.monotonic()))
+
+        # Give up on the regions that are not done by the deadline; the ones that have not started yet are cancelled,
+        # and the ones that are being aligned are abandoned
+        if not_done:
+            given_up.set()
+
+        for future in not_done:
+            future.cancel()
+
+        skipped = set()
+        for future in done:
+            if future.exception() is None:
+                if future.result() is None:
+                    skipped.add(futures[future])
+                else:
+                    region_results[futures[future]] = future.result()
+
+        # Retry the regions that were predicted to miss the deadline, if the predictions have since changed
+        if not_done or len(skipped) == len(pending):
+            break
+
+        pending = [item for item in pending if item in skipped]
+
+    # Every region that had not started has been cancelled, so this only leaves the ones being aligned running
+    executor.shutdown(wait=False)
+
+    # Build the timetables from the aligned regions, and interpolate the rest
+    timetables, reports = [], []
+
+    for transcript_index, (transcript, draft_timetable, regions) in enumerate(zip(transcripts, draft_timetables,
+                                                                                  all_regions)):
+        timetable = [{"case": "not-found-in-audio", "endOffset": word["endOffset"],
+                      "startOffset": word["startOffset"], "word": word["word"]} for word in draft_timetable]
+
+        for region_index, (first_index, last_index, _, _) in enumerate(regions):
+            region_words = region_results.get((transcript_index, region_index))
+            if region_words is None:
+                continue
+
+            region_words = {word["startOffset"]: word for word in region_words if is_aligned(word)}
+
+            for word in timetable[first_index:last_index + 1]:
+                region_word = region_words.get(word["startOffset"])
+
+                if region_word is not None:
+                    word.update(alignedWord=region_word["alignedWord"], case=region_word["case"],
+                                start=region_word["start"], end=region_word["end"])
+
+        # Drop the timings that go back in time, which happens where the windows of two regions overlap
+        previous_end = 0
+
+        for word in timetable:
+            if not is_aligned(word):
+                continue
+
+            if word["start"] < previous_end:
+                word.update(case="not-found-in-audio")
+                del word["alignedWord"], word["start"], word["end"]
+            else:
+                previous_end = word["end"]
+
+        fill_unaligned_words(timetable, audio_file_path, transcript, approximator)
+
+        # Report which regions were aligned, merging neighbouring regions with the same outcome
+        report = {"aligned": [], "approximated": []}
+        previous_outcome = None
+
+        for region_index, region in enumerate(regions):
+            outcome = "aligned" if (transcript_index, region_index) in region_results else "approximated"
+            start_time, end_time = get_region_times(timetable, region)
+
+            if outcome == previous_outcome:
+                report[outcome][-1] = (report[outcome][-1][0], end_time)
+            else:
+                report[outcome].append((start_time, end_time))
+
+            previous_outcome = outcome
+            DEADLINE_REGIONS.inc(outcome=outcome)
+
+        timetables.append(timetable)
+        reports.append(report)
+
+    return timetables, reports
@@ -0,0 +1,338 @@
+"""
+dtw_backend.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: An in-process alignment backend that uses MFCC features and dynamic time warping.
+
+Notes:
+    - The transcript is turned into a sequence of tokens, each with an expected loudness (vowels are loud, consonants
+      are slightly quieter and punctuation marks are silent) and a flag that marks the start of a word. The audio is
+      turned into frames with a loudness (from the first MFCC) and a spectral change (from the remaining MFCCs). Dynamic
+      time warping then finds the monotonic assignment of frames to tokens with the lowest total mismatch.
+    - This is much less accurate than gentle, but needs neither a container nor a network connection.
+"""
+
+# IMPORTS
+import os
+import re
+
+import numpy as np
+
+from src.alignment_backends.backend import AlignmentBackend
+from src.audio_analysis import mfcc, read_wav_samples
+from src.conversion.audio_format import AudioFormat
+from src.tuning.profile import load_backend_settings
+
+# CONSTANTS
+WORD_REGEX = re.compile(r"(\w|\’\w|\'\w)+", re.UNICODE)  # Same word definition as gentle's
+
+PAUSE_CHARACTERS = ".,;:!?"
+VOWELS = "aeiouy"
+
+PAUSE_TARGET = 0.0
+WORD_BOUNDARY_TARGET = 0.4
+CONSONANT_TARGET = 0.8
+VOWEL_TARGET = 1.0
+
+ONSET_WEIGHT = 0.5  # Weight of the spectral change at the start of words
+DIAGONAL_WEIGHT = 0.02  # Weight of the penalty for straying from a constant speaking rate
+DIAGONAL_TOLERANCE = 0.2  # Fraction of the window that the alignment can stray before being penalised fully
+MIN_TOKEN_FRAMES = 6  # Minimum number of frames per token when the end is open; allows up to ~16 characters a second
+
+QUIET_PERCENTILE = 10  # Percentile of the log energy that is considered silent
+LOUD_PERCENTILE = 90  # Percentile of the log energy that is considered fully loud
+
+WINDOW_SEARCH_DURATION = 2  # Seconds to search on either side of a window boundary for the quietest frame
+
+
+# HELPER FUNCTIONS
+def build_tokens(text):
+    """
+    Converts text into the tokens that the audio frames are aligned against.
+
+    Each alphanumeric character is a token. Each run of non-alphanumeric characters is a single token, which is a pause
+    if the run contains a punctuation mark and a word boundary otherwise.
+
+    Args:
+        text (str):
+            The text to be tokenised.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]:
+            - The expected loudness of each token.
+            - Whether each token is the start of a word.
+            - The index of the token that each character of `text` belongs to.
+    """
+
+    targets = []
+    onsets = []
+    char_to_token = np.empty(len(text), dtype=np.int64)
+
+    previous_is_alnum = None
+    for pos, char in enumerate(text):
+        if char.isalnum():
+            targets.append(VOWEL_TARGET if char.lower() in VOWELS else CONSONANT_TARGET)
+            onsets.append(previous_is_alnum is not True)
+            previous_is_alnum = True
+
+        elif previous_is_alnum is False:
+            # Extend the current run of non-alphanumeric characters
+            if char in PAUSE_CHARACTERS:
+                targets[-1] = PAUSE_TARGET
+
+        else:
+            targets.append(PAUSE_TARGET if char in PAUSE_CHARACTERS else WORD_BOUNDARY_TARGET)
+            onsets.append(False)
+            previous_is_alnum = False
+
+        char_to_token[pos] = len(targets) - 1
+
+    return np.array(targets), np.array(onsets, dtype=float), char_to_token
+
+
+def dynamic_time_warp(cost, open_end=False):
+    """
+    Finds the monotonic assignment of frames to tokens with the lowest total cost.
+
+    Every frame is assigned to exactly one token, every token up to the last one assigned is assigned at least one
+    frame, the first frame is assigned to the first token and the last frame is assigned to the last token.
+
+    Args:
+        cost (np.ndarray):
+            The cost of assigning each frame to each token, of shape `(num_tokens, num_frames)`.
+
+        open_end (bool):
+            Whether the last frame may be assigned to any token instead of the last one, leaving the tokens after it
+            unassigned.
+            (Default = False)
+
+    Returns:
+        np.ndarray:
+            The token that each frame is assigned to.
+
+    Raises:
+        AssertionError:
+            If there are fewer frames than tokens and `open_end` is `False`.
+    """
+
+    num_tokens, num_frames = cost.shape
+    assert open_end or num_frames >= num_tokens, "There must be at least as many frames as tokens."
+
+    # Accumulate the costs frame by frame, recording whether each step advanced to the next token
+    accumulated = np.full(num_tokens, np.inf)
+    accumulated[0] = cost[0, 0]
+    advanced = np.zeros((num_frames, num_tokens), dtype=bool)
+
+    shifted = np.empty(num_tokens)
+    shifted[0] = np.inf
+    for frame in range(1, num_frames):
+        shifted[1:] = accumulated[:-1]
+        advanced[frame] = shifted < accumulated
+        accumulated = np.where(advanced[frame], shifted, accumulated) + cost[:, frame]
+
+    # Backtrack from the last token (or the cheapest token, if the end is open) at the last frame
+    frame_tokens = np.empty(num_frames, dtype=np.int64)
+    token = int(np.argmin(accumulated)) if open_end else num_tokens - 1
+    for frame in range(num_frames - 1, -1, -1):
+        frame_tokens[frame] = token
+        if advanced[frame, token]:
+            token -= 1
+
+    return frame_tokens
+
+
+# CLASS
+class DTWBackend(AlignmentBackend):
+    """
+    Alignment backend that aligns the transcript in-process using MFCC features and dynamic time warping.
+    """
+
+    # Attributes
+    name = "dtw"
+    audio_format = AudioFormat(sample_rate=16000, channels=1, sample_width=2, containers=("wav",))
+
+    # Dunder methods
+    def __init__(self, window_duration=None, hop_duration=0.01):
+        """
+        Initialisation method.
+
+        Args:
+            window_duration (float):
+                Approximate duration in seconds of the windows that the audio is aligned in.
+                Longer windows are more accurate but use quadratically more memory. Use `None` to use the duration from
+                the tuning profile (60 seconds if the machine has not been tuned).
+                (Default = None)
+
+            hop_duration (float):
+                Duration of each audio frame in seconds.
+                (Default = 0.01)
+        """
+
+        self.window_duration = window_duration or load_backend_settings(self.name)["window_duration"]
+        self.hop_duration = hop_duration
+
+        # Cache the features of the last audio file, since regions of the same file are usually aligned in succession
+        self._cached_audio_file_path = None
+        self._cached_features = None
+
+    # Methods
+    def get_timetable(self, audio_file_path, transcript_path):
+        # Check if the transcript exists
+        if not os.path.isfile(transcript_path):
+            raise FileNotFoundError(f"The transcript cannot be found at the path '{transcript_path}'.")
+
+        with open(transcript_path, "r") as f:
+            transcript = f.read()
+
+        # Get the features of the whole audio file
+        loudness, _ = self._get_frame_features(audio_file_path)
+        duration = len(loudness) * self.hop_duration
+
+        # Split the audio into windows, cutting the transcript in proportion to the amount of speech before each cut
+        num_windows = max(1, int(round(duration / self.window_duration)))
+        cumulative_speech = np.cumsum(loudness)
+        search_frames = int(WINDOW_SEARCH_DURATION / self.hop_duration)
+
+        boundary_frames = [0]
+        boundary_offsets = [0]
+        for window_num in range(1, num_windows):
+            # Cut the audio at the quietest frame near the ideal boundary
+            ideal_frame = len(loudness) * window_num // num_windows
+            search_start = max(boundary_frames[-1] + 1, ideal_frame - search_frames)
+            search_end = min(len(loudness) - 1, ideal_frame + search_frames)
+            if search_end <= search_start:
+                continue
+
+            frame = search_start + int(np.argmin(loudness[search_start:search_end]))
+
+            # Cut the transcript at the next whitespace character
+            offset = int(len(transcript) * cumulative_speech[frame] / cumulative_speech[-1])
+            while offset < len(transcript) and not transcript[offset].isspace():
+                offset += 1
+
+            if offset <= boundary_offsets[-1] or offset >= len(transcript):
+                continue
+
+            boundary_frames.append(frame)
+            boundary_offsets.append(offset)
+
+        boundary_frames.append(len(loudness))
+        boundary_offsets.append(len(transcript))
+
+        # Align each window
+        timetable = []
+        for i in range(len(boundary_frames) - 1):
+            timetable += self.align_region(audio_file_path, transcript, boundary_offsets[i], boundary_offsets[i + 1],
+                                           boundary_frames[i] * self.hop_duration,
+                                           boundary_frames[i + 1] * self.hop_duration)
+
+        return timetable
+
+    def align_region(self, audio_file_path, transcript, start_offset, end_offset, start_time, end_time,
+                     open_end=False):
+        # Get the words in the transcript slice
+        words = list(WORD_REGEX.finditer(transcript, start_offset, end_offset))
+        if not words:
+            return []
+
+        # Get the features of the audio window
+        loudness, change = self._get_frame_features(audio_file_path)
+        first_frame = max(0, int(start_time / self.hop_duration))
+        last_frame = min(len(loudness), int(np.ceil(end_time / self.hop_duration)))
+        loudness = loudness[first_frame:last_frame]
+        change = change[first_frame:last_frame]
+
+        # Get the frames that each token spans
+        targets, onsets, char_to_token = build_tokens(transcript[start_offset:end_offset])
+        num_tokens, num_frames = len(targets), len(loudness)
+
+        reached_token = num_tokens - 1  # Last token that the audio reaches
+
+        if num_frames >= num_tokens or (open_end and num_frames > 0):
+            # Compute the cost of assigning each frame to each token
+            cost = (targets[:, np.newaxis] - loudness[np.newaxis, :]) ** 2
+            cost += ONSET_WEIGHT * onsets[:, np.newaxis] * (1 - change[np.newaxis, :]) ** 2
+
+            if not open_end:  # The audio may stop partway through an open-ended slice, so progress cannot be compared
+                token_progress = np.arange(num_tokens)[:, np.newaxis] / num_tokens
+                frame_progress = np.arange(num_frames)[np.newaxis, :] / num_frames
+                cost += DIAGONAL_WEIGHT * ((token_progress - frame_progress) / DIAGONAL_TOLERANCE) ** 2
+
+            # Find the best assignment
+            if open_end:
+                # Without the diagonal prior, nothing stops the path from racing through the tokens, so make every
+                # token last at least a few frames by splitting it into that many states
+                frame_tokens = dynamic_time_warp(np.repeat(cost, MIN_TOKEN_FRAMES, axis=0),
+                                                 open_end=True) // MIN_TOKEN_FRAMES
+            else:
+                frame_tokens = dynamic_time_warp(cost)
+
+            reached_token = frame_tokens[-1]
+            token_start_frames = np.searchsorted(frame_tokens, np.arange(num_tokens), side="left")
+            token_end_frames = np.searchsorted(frame_tokens, np.arange(num_tokens), side="right")
+        else:
+            # The window is too short to align; spread the tokens evenly over it
+            token_start_frames = np.arange(num_tokens) * num_frames // num_tokens
+            token_end_frames = (np.arange(num_tokens) + 1) * num_frames // num_tokens
+
+        # Convert the token spans into the word dictionaries
+        timetable = []
+        for word in words:
+            first_token = char_to_token[word.start() - start_offset]
+            last_token = char_to_token[word.end() - 1 - start_offset]
+
+            if last_token > reached_token:
+                # The audio ended before the word was said
+                timetable.append({"case": "not-found-in-audio", "endOffset": word.end(), "startOffset": word.start(),
+                                  "word": word.group()})
+                continue
+
+            timetable.append({
+                "alignedWord": word.group().lower(),
+                "case": "success",
+                "end": round(float(first_frame + token_end_frames[last_token]) * self.hop_duration, 2),
+                "endOffset": word.end(),
+                "start": round(float(first_frame + token_start_frames[first_token]) * self.hop_duration, 2),
+                "startOffset": word.start(),
+                "word": word.group()
+            })
+
+        return timetable
+
+    # Helper Methods
+    def _get_frame_features(self, audio_file_path):
+        """
+        Helper method that gets the loudness and spectral change of every frame of the audio file.
+
+        Args:
+            audio_file_path (str):
+                Path to the WAV file.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]:
+                The loudness and the spectral change of each frame, both scaled to the range [0, 1].
+        """
+
+        if audio_file_path != self._cached_audio_file_path:
+            # Compute the MFCCs of the audio file
+            samples, sample_rate = read_wav_samples(audio_file_path)
+            coefficients = mfcc(samples, sample_rate, hop_duration=self.hop_duration)
+
+            # Scale the log energy into a loudness between 0 (quiet frames) and 1 (loud frames)
+            log_energy = coefficients[:, 0]
+            quiet_level, loud_level = np.percentile(log_energy, [QUIET_PERCENTILE, LOUD_PERCENTILE])
+            loudness = np.clip((log_energy - quiet_level) / (loud_level - quiet_level + 1e-6), 0, 1)
+
+            # Measure the spectral change between consecutive frames
+            deltas = np.linalg.norm(np.diff(coefficients[:, 1:], axis=0, prepend=coefficients[:1, 1:]), axis=1)
+            change = np.clip(deltas / (np.percentile(deltas, 95) + 1e-6), 0, 1)
+
+            # Set the path last, so that other threads aligning regions of the same file never see stale features
+            self._cached_features = (loudness, change)
+            self._cached_audio_file_path = audio_file_path
+
+        return self._cached_features
@@ -0,0 +1,166 @@
+"""
+fallback.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Fills in the words that one alignment backend failed to align using another backend.
+"""
+
+# IMPORTS
+from src.conversion.audio_info import get_audio_duration
+
+
+# FUNCTIONS
+def is_aligned(word):
+    """
+    Checks whether a timetable word was aligned.
+
+    Args:
+        word (dict):
+            A word from the timetable.
+
+    Returns:
+        bool
+    """
+
+    return word.get("case") == "success" and "start" in word and "end" in word
+
+
+def find_unaligned_runs(timetable):
+    """
+    Finds the runs of consecutive words in the timetable that were not aligned.
+
+    Args:
+        timetable (list[dict]):
+            The timetable of spoken words.
+
+    Returns:
+        list[tuple[int, int]]:
+            The index of the first word and the index of the last word of each run.
+    """
+
+    runs = []
+    run_start = None
+
+    for i, word in enumerate(timetable):
+        if not is_aligned(word):
+            if run_start is None:
+                run_start = i
+        elif run_start is not None:
+            runs.append((run_start, i - 1))
+            run_start = None
+
+    if run_start is not None:
+        runs.append((run_start, len(timetable) - 1))
+
+    return runs
+
+
+def fill_unaligned_words(timetable, audio_file_path, transcript, fallback_backend):
+    """
+    Aligns the runs of words that were not aligned using a fallback backend.
+
+    Each run is aligned against the audio between the end of the aligned word before it and the start of the aligned
+    word after it. The timetable is updated in place.
+
+    Args:
+        timetable (list[dict]):
+            The timetable of spoken words.
+
+        audio_file_path (str):
+            Path to the audio file.
+
+        transcript (str):
+            The transcript.
+
+        fallback_backend (AlignmentBackend):
+            The backend to align the runs of unaligned words with.
+
+    Returns:
+        list[dict]:
+            The updated timetable.
+    """
+
+    # Get the duration of the audio file, which ends the window of a run at the end of the timetable
+    audio_duration = get_audio_duration(audio_file_path)
+
+    for first_index, last_index in find_unaligned_runs(timetable):
+        # Get the audio window that the run must have been spoken in
+        start_time = timetable[first_index - 1]["end"] if first_index > 0 else 0
+        end_time = timetable[last_index + 1]["start"] if last_index + 1 < len(timetable) else audio_duration
+
+        if end_time <= start_time:
+            continue  # No audio to align against; leave the run for the `Aligner` to extrapolate over
+
+        # Align the run
+        region_words = fallback_backend.align_region(audio_file_path, transcript,
+                                                     timetable[first_index]["startOffset"],
+                                                     timetable[last_index]["endOffset"], start_time, end_time)
+
+        # Copy the timings into the words of the run that start at the same position, if the fallback aligned them
+        region_words = {word["startOffset"]: word for word in region_words if is_aligned(word)}
+
+        for word in timetable[first_index:last_index + 1]:
+            region_word = region_words.get(word["startOffset"])
+
+            if region_word is not None:
+                word.update(alignedWord=region_word["alignedWord"], case=region_word["case"],
+                            start=region_word["start"], end=region_word["end"])
+
+    return timetable
+
+
+# TESTING CODE
+if __name__ == "__main__":
+    # Imports
+    import os
+    import re
+    import tempfile
+    import wave
+
+    from src.alignment_backends.backend import AlignmentBackend
+
+    # A stand-in fallback that only finds every other word of the region it is given
+    class StandInBackend(AlignmentBackend):
+        name = "stand-in"
+
+        def align_region(self, audio_file_path, transcript, start_offset, end_offset, start_time, end_time,
+                         open_end=False):
+            words = []
+            for i, match in enumerate(re.finditer(r"\w+", transcript[start_offset:end_offset])):
+                word = {"case": "not-found-in-audio", "word": match.group(),
+                        "startOffset": start_offset + match.start(), "endOffset": start_offset + match.end()}
+
+                if i % 2 == 0:
+                    word.update(case="success", alignedWord=match.group(), start=start_time + i * 0.5,
+                                end=start_time + i * 0.5 + 0.4)
+
+                words.append(word)
+
+            return words
+
+    # Make a timetable where only the first and last words were aligned
+    testTranscript = "one two three four five six"
+    testTimetable = [{"case": "not-found-in-audio", "word": match.group(), "startOffset": match.start(),
+                      "endOffset": match.end()} for match in re.finditer(r"\w+", testTranscript)]
+    testTimetable[0].update(case="success", alignedWord="one", start=0.0, end=0.4)
+    testTimetable[-1].update(case="success", alignedWord="six", start=4.0, end=4.4)
+
+    with tempfile.TemporaryDirectory() as testDir:
+        audioPath = os.path.join(testDir, "silence.wav")
+        with wave.open(audioPath, "wb") as wavObj:
+            wavObj.setnchannels(1)
+            wavObj.setsampwidth(2)
+            wavObj.setframerate(8000)
+            wavObj.writeframes(bytes(5 * 8000 * 2))
+
+        fill_unaligned_words(testTimetable, audioPath, testTranscript, StandInBackend())
+
+    print(testTimetable)
+
+    # Check that the words that the fallback found were filled in, and that the rest were left unaligned
+    assert [is_aligned(word) for word in testTimetable] == [True, True, False, True, False, True], \
+        "The words that the fallback found were not filled in correctly."
@@ -0,0 +1,90 @@
+"""
+gentle_backend.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: The alignment backend that uses the gentle docker container.
+"""
+
+# IMPORTS
+from src.alignment_backends.backend import AlignmentBackend
+from src.conversion.audio_format import AudioFormat
+from src.conversion.audio_slicing import slice_audio
+from src.gentle_interface.client import GENTLE_SAMPLE_RATE
+from src.gentle_interface.gentle import Gentle
+
+
+# CLASS
+class GentleBackend(AlignmentBackend):
+    """
+    Alignment backend that sends the audio and transcript to the gentle server.
+    """
+
+    # Attributes
+    name = "gentle"
+    audio_format = AudioFormat(sample_rate=GENTLE_SAMPLE_RATE, channels=1, sample_width=2, containers=("wav", "flac"))
+
+    # Dunder methods
+    def __init__(self, refresh_interval=0.5, warm_up=False, **gentle_kwargs):
+        """
+        Initialisation method.
+
+        Args:
+            refresh_interval (float):
+                Duration in seconds to wait before refreshing the progress bar.
+                (Default = 0.5)
+
+            warm_up (bool):
+                Whether a tiny alignment should be sent once the gentle server is up.
+                (Default = False)
+
+            **gentle_kwargs:
+                Keyword arguments that are passed to the `Gentle` object, such as the host and port of the server.
+        """
+
+        self.refresh_interval = refresh_interval
+        self.warm_up = warm_up
+        self.gentle = Gentle(**gentle_kwargs)
+
+    # Methods
+    def start(self):
+        self.gentle.start_gentle_container(warm_up=self.warm_up)
+        self.gentle.open_client()  # Kept open so that the regions sent by `align_region` share keep-alive connections
+
+    def stop(self):
+        try:
+            self.gentle.close_client()
+        finally:
+            self.gentle.stop_gentle_container()
+
+    def get_timetable(self, audio_file_path, transcript_path):
+        return self.gentle.get_timetable(audio_file_path, transcript_path, refresh_interval=self.refresh_interval)
+
+    def get_timetables(self, audio_file_path, transcript_paths):
+        return self.gentle.get_timetables(audio_file_path, transcript_paths)
+
+    def align_region(self, audio_file_path, transcript, start_offset, end_offset, start_time, end_time,
+                     open_end=False):
+        # Gentle already leaves the words that it cannot find unaligned, so an open end needs no special handling
+
+        # Send only the window of audio and the slice of the transcript
+        timetable = self.gentle.get_timetable_from_data(slice_audio(audio_file_path, start_time, end_time),
+                                                        transcript[start_offset:end_offset].encode("utf-8"),
+                                                        end_time - start_time)
+
+        # Shift the offsets and times so that they are relative to the full transcript and audio file
+        start_time = max(0.0, start_time)  # The window was clipped to the start of the audio
+
+        for word in timetable:
+            word["startOffset"] += start_offset
+            word["endOffset"] += start_offset
+
+            if "start" in word:
+                word["start"] += start_time
+            if "end" in word:
+                word["end"] += start_time
+
+        return timetable
@@ -0,0 +1,160 @@
+"""
+refinement.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Re-aligns only the regions of a timetable where the first alignment pass lost track of the audio.
+"""
+
+# IMPORTS
+from src.alignment_backends.fallback import is_aligned
+from src.conversion.audio_info import get_audio_duration
+from src.metrics import REGISTRY
+
+# CONSTANTS
+MIN_UNALIGNED_WORDS = 3  # Minimum number of unaligned words in a region for it to be worth re-aligning
+MAX_ALIGNED_GAP = 2  # Maximum number of aligned words between two unaligned runs for them to be merged into a region
+MIN_DENSITY = 0.5  # Minimum fraction of the words in a region that must be unaligned
+REGION_PADDING = 1  # Number of seconds of audio to add on either side of a region's window
+
+REFINED_WORDS = REGISTRY.counter("video_to_captions_refined_words_total",
+                                 "Number of words that were aligned by the second alignment pass.")
+REFINED_AUDIO_SECONDS = REGISTRY.counter("video_to_captions_refined_audio_seconds_total",
+                                         "Number of seconds of audio that were re-submitted by the second alignment "
+                                         "pass.")
+
+
+# FUNCTIONS
+def find_low_confidence_regions(timetable, min_unaligned_words=MIN_UNALIGNED_WORDS, max_aligned_gap=MAX_ALIGNED_GAP,
+                                min_density=MIN_DENSITY):
+    """
+    Finds the regions of the timetable that are dense with unaligned words.
+
+    Runs of unaligned words that are only separated by a few aligned words are merged into one region, since the
+    aligned words between them are usually guesses too.
+
+    Args:
+        timetable (list[dict]):
+            The timetable of spoken words.
+
+        min_unaligned_words (int):
+            Minimum number of unaligned words in a region.
+            (Default = 3)
+
+        max_aligned_gap (int):
+            Maximum number of aligned words between two unaligned runs for them to be merged.
+            (Default = 2)
+
+        min_density (float):
+            Minimum fraction of the words in a region that must be unaligned.
+            (Default = 0.5)
+
+    Returns:
+        list[tuple[int, int]]:
+            The index of the first word and the index of the last word of each region.
+    """
+
+    regions = []
+    region = None  # [first index, last index, number of unaligned words]
+
+    for i, word in enumerate(timetable):
+        if is_aligned(word):
+            continue
+
+        if region is not None and i - region[1] - 1 <= max_aligned_gap:
+            region[1] = i
+            region[2] += 1
+        else:
+            if region is not None:
+                regions.append(region)
+            region = [i, i, 1]
+
+    if region is not None:
+        regions.append(region)
+
+    # Keep only the regions that are large and dense enough
+    return [(first, last) for first, last, num_unaligned in regions
+            if num_unaligned >= min_unaligned_words and num_unaligned / (last - first + 1) >= min_density]
+
+
+def refine_timetable(timetable, audio_file_path, transcript, backend, padding=REGION_PADDING, **region_kwargs):
+    """
+    Re-aligns the low-confidence regions of the timetable, sending only a padded window of audio and the slice of the
+    transcript for each region to the backend.
+
+    Only the words that were not aligned are updated, and only with timings that fit between the aligned words around
+    them. The timetable is updated in place.
+
+    Args:
+        timetable (list[dict]):
+            The timetable of spoken words.
+
+        audio_file_path (str):
+            Path to the audio file.
+
+        transcript (str):
+            The transcript.
+
+        backend (AlignmentBackend):
+            The started backend to re-align the regions with.
+
+        padding (float):
+            Number of seconds of audio to add on either side of each region's window.
+            (Default = 1)
+
+        **region_kwargs:
+            Keyword arguments for `find_low_confidence_regions()`.
+
+    Returns:
+        dict:
+            Statistics of the pass: the number of `regions` re-aligned, the number of `words` that became aligned and
+            the number of `audio_seconds` re-submitted.
+    """
+
+    audio_duration = get_audio_duration(audio_file_path)
+    statistics = {"regions": 0, "words": 0, "audio_seconds": 0}
+
+    for first_index, last_index in find_low_confidence_regions(timetable, **region_kwargs):
+        # Get the times of the aligned words around the region, which the new timings must fit between
+        earliest = next((word["end"] for word in reversed(timetable[:first_index]) if is_aligned(word)), 0)
+        latest = next((word["start"] for word in timetable[last_index + 1:] if is_aligned(word)), audio_duration)
+
+        if latest <= earliest:
+            continue  # No audio to align against
+
+        # Re-align the region against a padded window
+        start_time = max(0, earliest - padding)
+        end_time = min(audio_duration, latest + padding)
+
+        region_words = backend.align_region(audio_file_path, transcript, timetable[first_index]["startOffset"],
+                                            timetable[last_index]["endOffset"], start_time, end_time)
+
+        statistics["regions"] += 1
+        statistics["audio_seconds"] += end_time - start_time
+
+        # Copy the timings into the unaligned words of the region
+        region_words = {word["startOffset"]: word for word in region_words if is_aligned(word)}
+        previous_end = earliest
+
+        for word in timetable[first_index:last_index + 1]:
+            if is_aligned(word):
+                previous_end = word["end"]
+                continue
+
+            region_word = region_words.get(word["startOffset"])
+
+            if region_word is None or region_word["start"] < previous_end or region_word["end"] > latest:
+                continue  # Keep the timings monotonic
+
+            word.update(alignedWord=region_word["alignedWord"], case=region_word["case"],
+                        start=region_word["start"], end=region_word["end"])
+            previous_end = word["end"]
+            statistics["words"] += 1
+
+    REFINED_WORDS.inc(statistics["words"])
+    REFINED_AUDIO_SECONDS.inc(statistics["audio_seconds"])
+
+    return statistics
@@ -0,0 +1,46 @@
+"""
+registry.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Looks up the alignment backends by name.
+"""
+
+# IMPORTS
+from src.alignment_backends.approximate_backend import ApproximateBackend
+from src.alignment_backends.dtw_backend import DTWBackend
+from src.alignment_backends.gentle_backend import GentleBackend
+
+# CONSTANTS
+BACKENDS = {
+    GentleBackend.name: GentleBackend,
+    DTWBackend.name: DTWBackend,
+    ApproximateBackend.name: ApproximateBackend
+}
+
+
+# FUNCTIONS
+def get_backend(name, **kwargs):
+    """
+    Creates an alignment backend given its name.
+
+    Args:
+        name (str):
+            Name of the backend. Must be a key of `BACKENDS`.
+
+        **kwargs:
+            Keyword arguments that are passed to the backend's initialisation method.
+
+    Returns:
+        AlignmentBackend
+
+    Raises:
+        AssertionError:
+            If the backend's name is not in the `BACKENDS` dictionary.
+    """
+
+    assert name in BACKENDS, f"The alignment backend '{name}' does not exist. (Available: {list(BACKENDS.keys())})"
+    return BACKENDS[name](**kwargs)
@@ -0,0 +1,4 @@
+from .energy import find_speech_segments, frame_energy
+from .features import frame_signal, mfcc
+from .samples import read_media_samples, read_wav_samples
+from .voice_activity import find_non_speech_spans
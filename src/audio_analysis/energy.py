@@ -0,0 +1,119 @@
+"""
+energy.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Finds the stretches of audio that contain speech from the energy of short frames.
+"""
+
+# IMPORTS
+import numpy as np
+
+# CONSTANTS
+FRAME_DURATION = 0.03  # Duration of each frame in seconds
+
+QUIET_PERCENTILE = 10  # Percentile of the frame energies that is taken as the level of the background noise
+LOUD_PERCENTILE = 90  # Percentile of the frame energies that is taken as the level of speech
+SPEECH_THRESHOLD = 0.3  # Fraction of the way from the noise level to the speech level above which a frame is speech
+MIN_DYNAMIC_RANGE = 6  # Minimum difference in decibels between the two levels for any frame to count as silence
+
+MIN_SILENCE_DURATION = 0.3  # Shorter pauses are treated as part of the speech around them
+MIN_SPEECH_DURATION = 0.1  # Shorter bursts of energy (e.g. clicks) are treated as silence
+
+
+# FUNCTIONS
+def frame_energy(samples, sample_rate, frame_duration=FRAME_DURATION):
+    """
+    Computes the energy of consecutive, non-overlapping frames of the samples.
+
+    Args:
+        samples (np.ndarray):
+            1D array of samples in the range [-1, 1].
+
+        sample_rate (int):
+            Sample rate of the samples in hertz.
+
+        frame_duration (float):
+            Duration of each frame in seconds.
+            (Default = 0.03)
+
+    Returns:
+        np.ndarray:
+            The energy of each frame in decibels. A trailing partial frame is dropped.
+    """
+
+    frame_len = max(1, int(round(frame_duration * sample_rate)))
+    num_frames = len(samples) // frame_len
+
+    # Reshape into frames without copying, and square and sum each frame without an intermediate array
+    frames = samples[:num_frames * frame_len].reshape(num_frames, frame_len)
+    mean_squares = np.einsum("ij,ij->i", frames, frames) / frame_len
+
+    return 10 * np.log10(mean_squares + 1e-10)
+
+
+def find_speech_segments(samples, sample_rate, frame_duration=FRAME_DURATION, threshold=SPEECH_THRESHOLD,
+                         min_silence_duration=MIN_SILENCE_DURATION, min_speech_duration=MIN_SPEECH_DURATION):
+    """
+    Finds the stretches of the samples that contain speech.
+
+    Args:
+        samples (np.ndarray):
+            1D array of samples in the range [-1, 1].
+
+        sample_rate (int):
+            Sample rate of the samples in hertz.
+
+        frame_duration (float):
+            Duration of each frame in seconds.
+            (Default = 0.03)
+
+        threshold (float):
+            Fraction of the way from the level of the background noise to the level of speech above which a frame is
+            considered to be speech.
+            (Default = 0.3)
+
+        min_silence_duration (float):
+            Minimum duration in seconds of a pause between two segments.
+            (Default = 0.3)
+
+        min_speech_duration (float):
+            Minimum duration in seconds of a segment.
+            (Default = 0.1)
+
+    Returns:
+        list[tuple[float, float]]:
+            The start and end times in seconds of each segment of speech, in order.
+    """
+
+    energy = frame_energy(samples, sample_rate, frame_duration=frame_duration)
+    if len(energy) == 0:
+        return []
+
+    # Classify each frame
+    quiet_level, loud_level = np.percentile(energy, [QUIET_PERCENTILE, LOUD_PERCENTILE])
+    if loud_level - quiet_level < MIN_DYNAMIC_RANGE:
+        return [(0.0, len(energy) * frame_duration)]  # Too uniform to tell speech from silence
+
+    is_speech = energy > quiet_level + threshold * (loud_level - quiet_level)
+
+    # Get the runs of speech frames
+    edges = np.diff(np.concatenate(([0], is_speech.astype(np.int8), [0])))
+    run_starts, run_ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+    # Merge runs that are separated by short pauses, then drop short runs
+    min_silence_frames = int(round(min_silence_duration / frame_duration))
+    min_speech_frames = int(round(min_speech_duration / frame_duration))
+
+    segments = []
+    for run_start, run_end in zip(run_starts, run_ends):
+        if segments and run_start - segments[-1][1] < min_silence_frames:
+            segments[-1][1] = run_end
+        else:
+            segments.append([run_start, run_end])
+
+    return [(float(start * frame_duration), float(end * frame_duration)) for start, end in segments
+            if end - start >= min_speech_frames]
@@ -0,0 +1,207 @@
+"""
+features.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Computes frame-level features of audio samples using NumPy.
+
+References:
+    - http://practicalcryptography.com/miscellaneous/machine-learning/guide-mel-frequency-cepstral-coefficients-mfccs/
+"""
+
+# IMPORTS
+import numpy as np
+
+# CONSTANTS
+PRE_EMPHASIS = 0.97
+FRAMES_PER_BATCH = 8192  # Number of frames whose spectra are held in memory at once
+
+
+# FUNCTIONS
+def frame_signal(samples, frame_len, hop_len):
+    """
+    Splits the samples into overlapping frames without copying them.
+
+    The end of the samples is zero-padded so that every sample belongs to at least one frame.
+
+    Args:
+        samples (np.ndarray):
+            1D array of samples.
+
+        frame_len (int):
+            Number of samples in each frame.
+
+        hop_len (int):
+            Number of samples between the starts of consecutive frames.
+
+    Returns:
+        np.ndarray:
+            A read-only 2D array of shape `(num_frames, frame_len)`.
+    """
+
+    # Pad the samples so that the last frame is complete
+    num_frames = max(1, int(np.ceil((len(samples) - frame_len) / hop_len)) + 1)
+    padded_len = (num_frames - 1) * hop_len + frame_len
+
+    if padded_len > len(samples):
+        samples = np.concatenate((samples, np.zeros(padded_len - len(samples), dtype=samples.dtype)))
+
+    # Create a strided view over the samples
+    stride = samples.strides[0]
+    return np.lib.stride_tricks.as_strided(samples, shape=(num_frames, frame_len), strides=(hop_len * stride, stride),
+                                           writeable=False)
+
+
+def hz_to_mel(hz):
+    """
+    Converts a frequency in hertz to the mel scale.
+
+    Args:
+        hz (union[float, np.ndarray])
+
+    Returns:
+        union[float, np.ndarray]
+    """
+
+    return 2595 * np.log10(1 + hz / 700)
+
+
+def mel_to_hz(mel):
+    """
+    Converts a frequency on the mel scale to hertz.
+
+    Args:
+        mel (union[float, np.ndarray])
+
+    Returns:
+        union[float, np.ndarray]
+    """
+
+    return 700 * (10 ** (mel / 2595) - 1)
+
+
+def mel_filterbank(num_filters, fft_size, sample_rate):
+    """
+    Generates triangular filters that are evenly spaced on the mel scale.
+
+    Args:
+        num_filters (int):
+            Number of filters.
+
+        fft_size (int):
+            Size of the FFT that the filters will be applied to.
+
+        sample_rate (int):
+            Sample rate of the audio.
+
+    Returns:
+        np.ndarray:
+            The filterbank, of shape `(num_filters, fft_size // 2 + 1)`.
+    """
+
+    # Get the bins of the filters' edges
+    mel_points = np.linspace(hz_to_mel(0), hz_to_mel(sample_rate / 2), num_filters + 2)
+    bins = np.floor((fft_size + 1) * mel_to_hz(mel_points) / sample_rate).astype(int)
+
+    # Create the triangular filters
+    filterbank = np.zeros((num_filters, fft_size // 2 + 1))
+    for i in range(1, num_filters + 1):
+        left, centre, right = bins[i - 1], bins[i], bins[i + 1]
+
+        if centre > left:
+            filterbank[i - 1, left:centre] = (np.arange(left, centre) - left) / (centre - left)
+        if right > centre:
+            filterbank[i - 1, centre:right] = (right - np.arange(centre, right)) / (right - centre)
+
+    return filterbank
+
+
+def dct_matrix(num_inputs, num_outputs):
+    """
+    Generates the orthonormal type-II discrete cosine transform matrix.
+
+    Args:
+        num_inputs (int):
+            Length of the vectors to be transformed.
+
+        num_outputs (int):
+            Number of coefficients to keep.
+
+    Returns:
+        np.ndarray:
+            The DCT matrix, of shape `(num_outputs, num_inputs)`.
+    """
+
+    n = np.arange(num_inputs)
+    k = np.arange(num_outputs)[:, np.newaxis]
+
+    matrix = np.cos(np.pi * k * (2 * n + 1) / (2 * num_inputs)) * np.sqrt(2 / num_inputs)
+    matrix[0] /= np.sqrt(2)
+
+    return matrix
+
+
+def mfcc(samples, sample_rate, num_coefficients=13, frame_duration=0.025, hop_duration=0.01, num_filters=26):
+    """
+    Computes the mel-frequency cepstral coefficients (MFCCs) of the samples.
+
+    The first coefficient is the log energy of the frame.
+
+    Args:
+        samples (np.ndarray):
+            1D array of samples.
+
+        sample_rate (int):
+            Sample rate of the samples.
+
+        num_coefficients (int):
+            Number of coefficients to keep for each frame.
+            (Default = 13)
+
+        frame_duration (float):
+            Duration of each frame in seconds.
+            (Default = 0.025)
+
+        hop_duration (float):
+            Duration between the starts of consecutive frames in seconds.
+            (Default = 0.01)
+
+        num_filters (int):
+            Number of mel filters.
+            (Default = 26)
+
+    Returns:
+        np.ndarray:
+            The MFCCs, of shape `(num_frames, num_coefficients)`.
+    """
+
+    # Apply the pre-emphasis filter
+    samples = np.asarray(samples, dtype=np.float32)
+    emphasised = np.empty_like(samples)
+    emphasised[:1] = samples[:1]
+    emphasised[1:] = samples[1:] - PRE_EMPHASIS * samples[:-1]
+
+    # Split the samples into frames
+    frame_len = int(round(frame_duration * sample_rate))
+    hop_len = int(round(hop_duration * sample_rate))
+    frames = frame_signal(emphasised, frame_len, hop_len)
+
+    # Prepare the constant matrices
+    fft_size = 1 << (frame_len - 1).bit_length()  # Smallest power of 2 that fits a frame
+    window = np.hamming(frame_len).astype(np.float32)
+    filterbank = mel_filterbank(num_filters, fft_size, sample_rate).T
+    dct = dct_matrix(num_filters, num_coefficients).T
+
+    # Process the frames in batches so that the spectra of long files do not have to fit in memory at once
+    coefficients = np.empty((len(frames), num_coefficients), dtype=np.float32)
+
+    for start in range(0, len(frames), FRAMES_PER_BATCH):
+        batch = frames[start:start + FRAMES_PER_BATCH] * window
+        power = np.abs(np.fft.rfft(batch, fft_size)) ** 2 / fft_size
+        log_energies = np.log(np.maximum(power @ filterbank, np.finfo(np.float32).eps))
+        coefficients[start:start + FRAMES_PER_BATCH] = log_energies @ dct
+
+    return coefficients
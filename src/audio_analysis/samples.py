@@ -0,0 +1,111 @@
+"""
+samples.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Reads the samples of a WAV file (or of any audio or video file) into a NumPy array.
+"""
+
+# IMPORTS
+import os
+import wave
+
+import numpy as np
+from pydub import AudioSegment
+
+# CONSTANTS
+SAMPLE_WIDTH_TO_DTYPE = {
+    1: np.uint8,  # 8-bit WAV files are unsigned
+    2: np.int16,
+    4: np.int32
+}
+
+
+# FUNCTIONS
+def read_wav_samples(wav_file_path):
+    """
+    Reads the samples of a WAV file, downmixed to mono and scaled to the range [-1, 1].
+
+    Args:
+        wav_file_path (str):
+            Path to the WAV file.
+
+    Returns:
+        tuple[np.ndarray, int]:
+            The samples (as a 1D `float32` array) and the sample rate of the WAV file.
+
+    Raises:
+        AssertionError:
+            If the sample width of the WAV file is not supported.
+
+        FileNotFoundError:
+            If the WAV file does not exist or is not found.
+    """
+
+    # Check if the WAV file exists
+    if not os.path.isfile(wav_file_path):
+        raise FileNotFoundError(f"A WAV file does not exist at the path '{wav_file_path}'.")
+
+    # Read the raw frames
+    with wave.open(wav_file_path, "rb") as wav_obj:
+        sample_width = wav_obj.getsampwidth()
+        num_channels = wav_obj.getnchannels()
+        sample_rate = wav_obj.getframerate()
+        raw_frames = wav_obj.readframes(wav_obj.getnframes())
+
+    assert sample_width in SAMPLE_WIDTH_TO_DTYPE, f"The sample width {sample_width} is currently unsupported by the " \
+                                                  "program."
+
+    # Convert the raw frames into floating point samples
+    samples = np.frombuffer(raw_frames, dtype=SAMPLE_WIDTH_TO_DTYPE[sample_width]).astype(np.float32)
+
+    if sample_width == 1:
+        samples = (samples - 128) / 128
+    else:
+        samples /= float(2 ** (8 * sample_width - 1))
+
+    # Downmix to mono
+    if num_channels > 1:
+        samples = samples.reshape(-1, num_channels).mean(axis=1)
+
+    return samples, sample_rate
+
+
+def read_media_samples(video_or_audio_file, sample_rate=8000):
+    """
+    Reads the samples of a video or audio file, downmixed to mono and scaled to the range [-1, 1].
+
+    WAV files are read directly at their own sample rate; other files are decoded with FFmpeg and resampled.
+
+    Args:
+        video_or_audio_file (str):
+            Path to the video or audio file.
+
+        sample_rate (int):
+            Sample rate to decode files other than WAV files at. Lower is faster.
+            (Default = 8000)
+
+    Returns:
+        tuple[np.ndarray, int]:
+            The samples (as a 1D `float32` array) and their sample rate.
+
+    Raises:
+        FileNotFoundError:
+            If the file does not exist or is not found.
+    """
+
+    if os.path.splitext(video_or_audio_file)[-1] == ".wav":
+        return read_wav_samples(video_or_audio_file)
+
+    # Check if the file exists
+    if not os.path.isfile(video_or_audio_file):
+        raise FileNotFoundError(f"A file does not exist at the path '{video_or_audio_file}'.")
+
+    # Decode the file straight into mono 16-bit samples at the requested rate
+    audio = AudioSegment.from_file(video_or_audio_file).set_channels(1).set_frame_rate(sample_rate).set_sample_width(2)
+    samples = np.frombuffer(audio.raw_data, dtype=np.int16).astype(np.float32) / float(2 ** 15)
+
+    return samples, sample_rate
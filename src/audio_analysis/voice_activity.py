@@ -0,0 +1,153 @@
+"""
+voice_activity.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Finds the long stretches of audio that contain no speech (e.g. music intros, outros and interludes) from
+             the energy and spectrum of short frames.
+
+Notes:
+    - A frame is *voiced* if it is well above the background noise and its spectrum is not noise-like (i.e. its spectral
+      flatness is low). Speech is voiced in bursts of syllables and words, so its energy rises and falls by many
+      decibels every second; sustained music is voiced too, but its energy is much steadier. A window of frames is
+      therefore taken to be speech if enough of it is voiced and its energy varies enough.
+    - Mistaking music for speech only costs alignment time, but mistaking speech for music loses words, so only long
+      spans are reported and they are shrunk away from the speech around them.
+"""
+
+# IMPORTS
+import numpy as np
+
+from src.audio_analysis.features import frame_signal, FRAMES_PER_BATCH
+
+# CONSTANTS
+FRAME_DURATION = 0.02  # Duration of each frame in seconds
+WINDOW_DURATION = 1.5  # Duration of the windows that frames are judged in, which must span a few syllables
+
+QUIET_PERCENTILE = 10  # Percentile of the frame energies that is taken as the level of the background noise
+LOUD_PERCENTILE = 90  # Percentile of the frame energies that is taken as the level of speech
+VOICED_THRESHOLD = 0.3  # Fraction of the way from the noise level to the speech level above which a frame may be voiced
+FLATNESS_THRESHOLD = 0.4  # Spectral flatness above which a frame is noise-like rather than voiced
+
+MIN_VOICED_FRACTION = 0.2  # Fraction of a window's frames that must be voiced for it to be speech
+MIN_MODULATION = 4  # Standard deviation in decibels of a window's frame energies for it to be speech
+
+MIN_SPAN_DURATION = 3  # Shortest stretch of non-speech in seconds that is reported; shorter pauses are part of speech
+SPAN_PADDING = 0.5  # Number of seconds of each non-speech span that are left next to the speech around it
+
+
+# FUNCTIONS
+def frame_energy_and_flatness(samples, sample_rate, frame_duration=FRAME_DURATION):
+    """
+    Computes the energy and the spectral flatness of consecutive, non-overlapping frames of the samples.
+
+    Args:
+        samples (np.ndarray):
+            1D array of samples in the range [-1, 1].
+
+        sample_rate (int):
+            Sample rate of the samples in hertz.
+
+        frame_duration (float):
+            Duration of each frame in seconds.
+            (Default = 0.02)
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]:
+            The energy of each frame in decibels, and the spectral flatness of each frame (between 0 for a pure tone and
+            1 for white noise).
+    """
+
+    frame_len = max(2, int(round(frame_duration * sample_rate)))
+    frames = frame_signal(samples, frame_len, frame_len)
+    window = np.hanning(frame_len).astype(np.float32)
+
+    energy = np.empty(len(frames), dtype=np.float64)
+    flatness = np.empty(len(frames), dtype=np.float64)
+
+    # Process the frames in batches so that only a few spectra are held in memory at once
+    for batch_start in range(0, len(frames), FRAMES_PER_BATCH):
+        batch = frames[batch_start:batch_start + FRAMES_PER_BATCH]
+        batch_end = batch_start + len(batch)
+
+        energy[batch_start:batch_end] = 10 * np.log10(np.einsum("ij,ij->i", batch, batch) / frame_len + 1e-10)
+
+        power = np.abs(np.fft.rfft(batch * window, axis=1)) ** 2 + 1e-12
+        flatness[batch_start:batch_end] = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+
+    return energy, flatness
+
+
+def find_non_speech_spans(samples, sample_rate, min_span_duration=MIN_SPAN_DURATION, padding=SPAN_PADDING):
+    """
+    Finds the long stretches of the samples that contain no speech.
+
+    Args:
+        samples (np.ndarray):
+            1D array of samples in the range [-1, 1].
+
+        sample_rate (int):
+            Sample rate of the samples in hertz.
+
+        min_span_duration (float):
+            Shortest stretch of non-speech in seconds that is reported, before padding.
+            (Default = 3)
+
+        padding (float):
+            Number of seconds to shrink each span by on each side that borders speech.
+            (Default = 0.5)
+
+    Returns:
+        list[tuple[float, float]]:
+            The start and end times in seconds of each span of non-speech, in order.
+    """
+
+    energy, flatness = frame_energy_and_flatness(samples, sample_rate)
+    if len(energy) == 0:
+        return []
+
+    duration = len(samples) / sample_rate
+
+    # Classify each frame as voiced or not
+    quiet_level, loud_level = np.percentile(energy, [QUIET_PERCENTILE, LOUD_PERCENTILE])
+    is_voiced = (energy > quiet_level + VOICED_THRESHOLD * (loud_level - quiet_level)) & \
+                (flatness < FLATNESS_THRESHOLD)
+
+    # Get the fraction of voiced frames and the spread of the energy in the window around each frame, using running
+    # sums so that every window takes constant time
+    half_window = max(1, int(WINDOW_DURATION / FRAME_DURATION) // 2)
+    window_starts = np.clip(np.arange(len(energy)) - half_window, 0, len(energy))
+    window_ends = np.clip(np.arange(len(energy)) + half_window + 1, 0, len(energy))
+    window_lens = window_ends - window_starts
+
+    def __window_means(values):
+        """Helper function that gets the mean of the values in the window around each frame."""
+        running_sums = np.concatenate(([0], np.cumsum(values, dtype=np.float64)))
+        return (running_sums[window_ends] - running_sums[window_starts]) / window_lens
+
+    voiced_fraction = __window_means(is_voiced)
+    modulation = np.sqrt(np.maximum(__window_means(energy ** 2) - __window_means(energy) ** 2, 0))
+
+    is_speech = (voiced_fraction >= MIN_VOICED_FRACTION) & (modulation >= MIN_MODULATION)
+
+    # Get the runs of non-speech frames
+    edges = np.diff(np.concatenate(([0], (~is_speech).astype(np.int8), [0])))
+    run_starts, run_ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+    spans = []
+    for run_start, run_end in zip(run_starts, run_ends):
+        start, end = run_start * FRAME_DURATION, min(run_end * FRAME_DURATION, duration)
+        if end - start < min_span_duration:
+            continue
+
+        # Keep some of the span next to the speech, but not at the very start or end of the audio
+        start = start + padding if run_start > 0 else 0.0
+        end = end - padding if run_end < len(energy) else duration
+
+        if end > start:
+            spans.append((float(start), float(end)))
+
+    return spans
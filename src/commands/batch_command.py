@@ -0,0 +1,111 @@
+"""
+batch_command.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: The `batch` command, which captions many files across several gentle servers, ordering them by duration.
+"""
+
+# IMPORTS
+import json
+import os
+
+from src.alignment_backends import BACKENDS
+from src.commands.common import add_formatting_arguments, add_workspace_arguments, validate_formatting_arguments
+from src.scheduling import format_report, parse_worker, POLICIES, read_manifest, run_batch
+from src.tuning import load_backend_settings
+
+# CONSTANTS
+DESCRIPTION = "Captions the files listed in a manifest across several gentle servers, scheduling them by duration."
+
+
+# FUNCTIONS
+def add_arguments(parser):
+    """
+    Adds the arguments of the command.
+
+    Args:
+        parser (argparse.ArgumentParser):
+            The parser to add the arguments to.
+    """
+
+    parser.add_argument("manifest", help="A CSV file with one job per row: the video/audio file followed by its "
+                                         "transcript(s). Relative paths are relative to the manifest.")
+
+    add_formatting_arguments(parser)
+    parser.add_argument("-a", "--backend", choices=list(BACKENDS.keys()), default="gentle",
+                        help="The alignment backend to use.")
+    parser.add_argument("--worker", action="append", default=None,
+                        help="A gentle server to use, as '[container_name]:[port]'. Give it once per server. With "
+                             "other backends, only the number of workers matters. (Default: the workers in the tuning "
+                             "profile, or gentle-container:8765)")
+    parser.add_argument("-p", "--policy", choices=list(POLICIES.keys()), default="lpt",
+                        help="The order to start the jobs in. 'fifo' keeps the manifest's order, 'sjf' starts the "
+                             "shortest jobs first (finishing most jobs soonest) and 'lpt' starts the longest jobs "
+                             "first (finishing the whole batch soonest).")
+    parser.add_argument("--real-time-factor", type=float, default=None,
+                        help="Predicted number of seconds to caption each second of audio, used to plan the batch. "
+                             "The report of each batch shows the observed value. (Default: the value in the tuning "
+                             "profile)")
+    parser.add_argument("--job-overhead", type=float, default=None,
+                        help="Predicted number of seconds that each job takes regardless of its duration. (Default: "
+                             "the value in the tuning profile)")
+    parser.add_argument("-t", "--transport-format", choices=["wav", "flac"], default="wav",
+                        help="Container of the audio that is sent to the alignment backend.")
+    add_workspace_arguments(parser)
+    parser.add_argument("--report-file", default=None,
+                        help="Path to write the predicted and actual finish times of every job to, as JSON.")
+    parser.add_argument("-o", "--output-dir", default=".",
+                        help="Directory to write the captions to. Each captions file is named after its video or "
+                             "audio file.")
+
+
+def run(args):
+    """
+    Runs the command.
+
+    Args:
+        args (argparse.Namespace):
+            The parsed arguments.
+    """
+
+    # Run validation on the provided inputs
+    validate_formatting_arguments(args)
+    jobs = read_manifest(args.manifest)
+
+    # Fill in the settings that were not given from the tuning profile
+    settings = load_backend_settings(args.backend)
+
+    if args.worker:
+        workers = [parse_worker(worker) for worker in args.worker]
+    elif args.backend == "gentle":
+        workers = [parse_worker(worker) for worker in settings["workers"]]
+    else:
+        workers = [{} for _ in range(settings["workers"])]
+
+    real_time_factor = args.real_time_factor if args.real_time_factor is not None else settings["real_time_factor"]
+    job_overhead = args.job_overhead if args.job_overhead is not None else settings["job_overhead"]
+
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    # Caption the batch
+    print(f"Captioning {len(jobs)} job(s) on {len(workers)} worker(s) using the '{args.policy}' policy...")
+    report = run_batch(jobs, args.output_dir, workers=workers, policy=args.policy,
+                       real_time_factor=real_time_factor, job_overhead=job_overhead, backend=args.backend,
+                       transport_format=args.transport_format, block_type=args.block_type,
+                       block_duration=args.block_duration, max_block_length=args.max_block_length,
+                       caption_type=args.caption_type, workspace_quota=args.workspace_quota)
+
+    print(format_report(report))
+
+    for job, error in enumerate(report["errors"]):
+        if error:
+            print(f"Job {job + 1} ({jobs[job][0]}) failed:\n{error}")
+
+    # Write the report, if needed
+    if args.report_file is not None:
+        with open(args.report_file, "w") as f:
+            json.dump(report, f, indent=2)
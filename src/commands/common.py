@@ -0,0 +1,83 @@
+"""
+common.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Command line arguments that are shared between the commands.
+"""
+
+# CONSTANTS
+BYTES_PER_MEGABYTE = 2 ** 20
+
+
+# FUNCTIONS
+def add_formatting_arguments(parser):
+    """
+    Adds the arguments that control how the captions are grouped and formatted.
+
+    Args:
+        parser (argparse.ArgumentParser):
+            The parser to add the arguments to.
+    """
+
+    parser.add_argument("-b", "--block-type", choices=["time", "sentence"], default="sentence",
+                        help="How the captions should be grouped.")
+    parser.add_argument("-d", "--block-duration", type=int, default=5,
+                        help="The length of time that makes up each block. Must be a positive integer."
+                             "Provide it only if `block-type` is 'time'.")
+    parser.add_argument("-l", "--max-block-length", type=int, default=15,
+                        help="The maximum number of timetabled words that can be in each caption block. Must be a "
+                             "positive integer. Provide it only if `block-type` is 'sentence'.")
+    parser.add_argument("-c", "--caption-type", choices=["webvtt", "subrip"], default="webvtt",
+                        help="Format of the captions.")
+
+
+def validate_formatting_arguments(args):
+    """
+    Validates the arguments added by `add_formatting_arguments`.
+
+    Args:
+        args (argparse.Namespace):
+            The parsed arguments.
+
+    Raises:
+        AssertionError:
+            If any of the arguments is invalid.
+    """
+
+    assert args.block_duration > 0, "The block duration must be a positive integer."
+    assert args.max_block_length > 0, "The maximum block length must be a positive integer."
+
+
+def add_workspace_arguments(parser):
+    """
+    Adds the arguments that control the workspaces of the jobs.
+
+    Args:
+        parser (argparse.ArgumentParser):
+            The parser to add the arguments to.
+    """
+
+    parser.add_argument("--workspace-quota", type=parse_megabytes, default=None,
+                        help="Maximum number of megabytes that the extracted audio of each job may take up. Each job "
+                             "gets its own temporary directory, on a RAM-backed filesystem (/dev/shm) when there is "
+                             "room for it, which is removed once the job is done.")
+
+
+def parse_megabytes(value):
+    """
+    Parses a number of megabytes from the command line.
+
+    Args:
+        value (str):
+            The number of megabytes.
+
+    Returns:
+        int:
+            The number of bytes.
+    """
+
+    return int(float(value) * BYTES_PER_MEGABYTE)
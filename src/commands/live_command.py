@@ -0,0 +1,91 @@
+"""
+live_command.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: The `live` command, which captions audio from a growing WAV file or a pipe as it arrives.
+"""
+
+# IMPORTS
+import os
+
+from src.alignment_backends import BACKENDS
+from src.streaming import caption_stream
+
+# CONSTANTS
+DESCRIPTION = "Captions audio from a growing WAV file or a pipe as it arrives, appending cues as they are ready."
+
+
+# FUNCTIONS
+def add_arguments(parser):
+    """
+    Adds the arguments of the command.
+
+    Args:
+        parser (argparse.ArgumentParser):
+            The parser to add the arguments to.
+    """
+
+    parser.add_argument("source", help="A WAV file that is still being written, or '-' to read a WAV stream from the "
+                                       "standard input (e.g. `ffmpeg -i [stream] -f wav -ac 1 -ar 16000 -`).")
+    parser.add_argument("transcript_file", help="The script of the broadcast.")
+
+    parser.add_argument("-a", "--backend", choices=list(BACKENDS.keys()), default="gentle",
+                        help="The alignment backend to use.")
+    parser.add_argument("-d", "--block-duration", type=float, default=5,
+                        help="The maximum number of seconds that each caption block may span.")
+    parser.add_argument("-l", "--max-block-length", type=int, default=15,
+                        help="The maximum number of words in each caption block.")
+    parser.add_argument("-c", "--caption-type", choices=["webvtt", "subrip"], default="webvtt",
+                        help="Format of the captions.")
+    parser.add_argument("--step", type=float, default=2,
+                        help="Number of seconds of new audio to wait for before aligning again.")
+    parser.add_argument("--max-lag", type=float, default=10,
+                        help="Number of seconds behind the audio after which words are committed even if their "
+                             "timings have not settled. Bounds how far the captions lag behind the audio.")
+    parser.add_argument("--max-window", type=float, default=30,
+                        help="Maximum number of seconds of audio to align at a time. Must be longer than the maximum "
+                             "lag plus the step.")
+    parser.add_argument("--idle-timeout", type=float, default=10,
+                        help="Number of seconds that a growing file may go without growing before it is considered "
+                             "finished.")
+    parser.add_argument("-o", "--output-file-name", default="transcript",
+                        help="Name of the output file, without the extension.")
+
+
+def run(args):
+    """
+    Runs the command.
+
+    Args:
+        args (argparse.Namespace):
+            The parsed arguments.
+
+    Raises:
+        FileNotFoundError:
+            If the transcript cannot be found.
+    """
+
+    # Run validation on the provided inputs
+    if not os.path.isfile(args.transcript_file):
+        raise FileNotFoundError(f"A transcript does not exist at the path '{args.transcript_file}'.")
+
+    assert args.block_duration > 0, "The block duration must be positive."
+    assert args.max_block_length > 0, "The maximum block length must be a positive integer."
+    assert args.step > 0, "The step must be positive."
+    assert args.max_lag >= 0, "The maximum lag cannot be negative."
+    assert args.max_window > args.max_lag + args.step, \
+        f"The maximum window ({args.max_window}s) must be longer than the maximum lag plus the step " \
+        f"({args.max_lag + args.step}s)."
+
+    # Caption the stream
+    print("Captioning the stream...")
+    output_path = caption_stream(args.source, args.transcript_file, output_file_name=args.output_file_name,
+                                 backend=args.backend, caption_type=args.caption_type,
+                                 block_duration=args.block_duration, max_block_length=args.max_block_length,
+                                 step_duration=args.step, max_lag=args.max_lag, max_window_duration=args.max_window,
+                                 idle_timeout=args.idle_timeout)
+    print(f"Captions written to '{output_path}'.")
@@ -0,0 +1,134 @@
+"""
+queue_command.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: The `queue` command, which adds captioning jobs to a shared job queue, runs a worker on it or shows its
+             status.
+"""
+
+# IMPORTS
+import os
+
+from src.alignment_backends import BACKENDS
+from src.commands.common import add_formatting_arguments, add_workspace_arguments, validate_formatting_arguments
+from src.job_queue import DEFAULT_LEASE_DURATION, JobQueue, run_worker
+
+# CONSTANTS
+DESCRIPTION = "Shares captioning jobs between several machines through an SQLite database on shared storage."
+
+
+# FUNCTIONS
+def add_arguments(parser):
+    """
+    Adds the arguments of the command.
+
+    Args:
+        parser (argparse.ArgumentParser):
+            The parser to add the arguments to.
+    """
+
+    parser.add_argument("database",
+                        help="Path to the SQLite database of the queue. It is created if it does not exist.")
+    parser.add_argument("--lease-duration", type=float, default=DEFAULT_LEASE_DURATION,
+                        help="Number of seconds a claimed job stays leased without a heartbeat from its worker.")
+
+    actions = parser.add_subparsers(dest="action", required=True)
+
+    # Adding jobs
+    add_parser = actions.add_parser("add", help="Add a job to the queue.")
+    add_parser.add_argument("video_or_audio_file",
+                            help="The video/audio file to be captioned. Must be reachable from every worker.")
+    add_parser.add_argument("transcript_files", nargs="+",
+                            help="The transcript(s) of the video. Must be reachable from every worker.")
+    add_formatting_arguments(add_parser)
+    add_parser.add_argument("-a", "--backend", choices=list(BACKENDS.keys()), default="gentle",
+                            help="The alignment backend to use.")
+    add_parser.add_argument("-f", "--fallback-backend", choices=list(BACKENDS.keys()), default=None,
+                            help="The alignment backend used for the words that the main backend failed to align.")
+    add_parser.add_argument("-r", "--refine", action="store_true",
+                            help="Re-align only the regions that the backend lost track of.")
+    add_parser.add_argument("-n", "--cut-non-speech", action="store_true",
+                            help="Cut the long stretches without speech out of the audio before alignment.")
+    add_parser.add_argument("-t", "--transport-format", choices=["wav", "flac"], default="wav",
+                            help="Container of the audio that is sent to the alignment backend.")
+    add_parser.add_argument("-s", "--save-timetable", action="store_true",
+                            help="Also save each timetable next to its captions file.")
+    add_workspace_arguments(add_parser)
+    add_parser.add_argument("--max-attempts", type=int, default=3,
+                            help="Number of times the job is tried before it is marked as failed.")
+    add_parser.add_argument("-o", "--output-file-name", default="transcript",
+                            help="Name of the output file, without the extension. Must be reachable from every "
+                                 "worker.")
+
+    # Running a worker
+    work_parser = actions.add_parser("work", help="Claim and process jobs from the queue.")
+    work_parser.add_argument("--poll-interval", type=float, default=5,
+                             help="Number of seconds to wait before checking again when there are no pending jobs.")
+    work_parser.add_argument("--exit-when-empty", action="store_true",
+                             help="Stop once there are no pending jobs, instead of waiting for more.")
+
+    # Showing the status
+    actions.add_parser("status", help="Show the jobs in the queue.")
+
+
+def run(args):
+    """
+    Runs the command.
+
+    Args:
+        args (argparse.Namespace):
+            The parsed arguments.
+    """
+
+    with JobQueue(args.database, lease_duration=args.lease_duration) as queue:
+        if args.action == "add":
+            # Run validation on the provided inputs
+            if not os.path.isfile(args.video_or_audio_file):
+                raise FileNotFoundError(f"A file does not exist at the path '{args.video_or_audio_file}'.")
+
+            for transcript_file in args.transcript_files:
+                if not os.path.isfile(transcript_file):
+                    raise FileNotFoundError(f"A transcript does not exist at the path '{transcript_file}'.")
+
+            validate_formatting_arguments(args)
+
+            # Add the job, using absolute paths so that workers in other directories can find the files
+            options = {
+                "backend": args.backend,
+                "fallback_backend": args.fallback_backend,
+                "transport_format": args.transport_format,
+                "block_type": args.block_type,
+                "block_duration": args.block_duration,
+                "max_block_length": args.max_block_length,
+                "caption_type": args.caption_type,
+                "save_timetables": args.save_timetable,
+                "refine": args.refine,
+                "workspace_quota": args.workspace_quota,
+                "cut_non_speech": args.cut_non_speech
+            }
+
+            job_id = queue.enqueue(os.path.abspath(args.video_or_audio_file),
+                                   [os.path.abspath(path) for path in args.transcript_files],
+                                   os.path.abspath(args.output_file_name), options=options,
+                                   max_attempts=args.max_attempts)
+            print(f"Added job {job_id}.")
+
+        elif args.action == "work":
+            num_processed = run_worker(queue, poll_interval=args.poll_interval, exit_when_empty=args.exit_when_empty)
+            print(f"Processed {num_processed} job(s).")
+
+        else:
+            print(", ".join(f"{status}: {count}" for status, count in queue.count_jobs().items()))
+
+            for job in queue.get_jobs():
+                line = f"[{job['id']}] {job['status']:<7} {job['media_file']} (attempts: {job['attempts']})"
+                if job["worker"]:
+                    line += f" worker: {job['worker']}"
+                if job["status"] == "failed" and job["error"]:
+                    line += f" error: {job['error'].splitlines()[0]}"
+
+                print(line)
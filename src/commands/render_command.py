@@ -0,0 +1,73 @@
+"""
+render_command.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: The `render` command, which turns a saved timetable and its transcript into captions without aligning.
+"""
+
+# IMPORTS
+import os
+
+from src.commands.common import add_formatting_arguments, validate_formatting_arguments
+from src.pipeline import render_captions, write_captions
+from src.timetable_storage import load_timetable
+
+# CONSTANTS
+DESCRIPTION = "Renders captions from a saved timetable and its transcript, without aligning them again."
+
+
+# FUNCTIONS
+def add_arguments(parser):
+    """
+    Adds the arguments of the command.
+
+    Args:
+        parser (argparse.ArgumentParser):
+            The parser to add the arguments to.
+    """
+
+    parser.add_argument("timetable_file", help="The timetable file, as saved with `--save-timetable`.")
+    parser.add_argument("transcript_file", help="The transcript that the timetable was aligned against.")
+
+    add_formatting_arguments(parser)
+    parser.add_argument("-j", "--processes", type=int, default=1,
+                        help="Number of processes to group the words into sentences with. Worth it for book-length "
+                             "transcripts; the captions are the same for any number of processes.")
+    parser.add_argument("-o", "--output-file-name", default="transcript",
+                        help="Name of the output file, without the extension.")
+
+
+def run(args):
+    """
+    Runs the command.
+
+    Args:
+        args (argparse.Namespace):
+            The parsed arguments.
+
+    Raises:
+        FileNotFoundError:
+            If either the timetable file or the transcript cannot be found.
+    """
+
+    # Run validation on the provided inputs
+    if not os.path.isfile(args.transcript_file):
+        raise FileNotFoundError(f"A transcript does not exist at the path '{args.transcript_file}'.")
+
+    validate_formatting_arguments(args)
+
+    # Render the captions from the memory-mapped timetable
+    timetable = load_timetable(args.timetable_file)
+
+    with open(args.transcript_file, "r") as f:
+        caption_content = render_captions(f.read(), timetable, block_type=args.block_type,
+                                          block_duration=args.block_duration,
+                                          max_block_length=args.max_block_length, caption_type=args.caption_type,
+                                          num_processes=args.processes)
+
+    output_path = write_captions(caption_content, args.output_file_name, caption_type=args.caption_type)
+    print(f"Captions written to '{output_path}'.")
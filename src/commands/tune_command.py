@@ -0,0 +1,114 @@
+"""
+tune_command.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: The `tune` command, which finds the fastest settings for this machine and saves them to the tuning profile.
+"""
+
+# IMPORTS
+import tempfile
+
+from src.tuning import PROFILE_PATH, save_backend_settings
+from src.tuning.calibration import CALIBRATION_DURATION, CALIBRATION_MEDIA, CALIBRATION_TRANSCRIPT, tune_dtw, \
+    tune_gentle
+
+# CONSTANTS
+DESCRIPTION = "Finds the fastest number of workers, threads and window length on this machine and saves them as the " \
+              "defaults."
+
+
+# FUNCTIONS
+def add_arguments(parser):
+    """
+    Adds the arguments of the command.
+
+    Args:
+        parser (argparse.ArgumentParser):
+            The parser to add the arguments to.
+    """
+
+    parser.add_argument("-a", "--backend", choices=["gentle", "dtw"], default="gentle",
+                        help="The alignment backend to tune. Tuning 'gentle' makes a gentle container for every "
+                             "combination of settings and keeps the fastest ones; 'dtw' runs in-process.")
+    parser.add_argument("--workers", default="1,2,4",
+                        help="Comma-separated numbers of workers (gentle containers, or files aligned at the same time "
+                             "by the 'dtw' backend) to try.")
+    parser.add_argument("--threads", default="1,2,4",
+                        help="Comma-separated numbers of threads per gentle server to try. Only used by 'gentle'.")
+    parser.add_argument("--window-durations", default="30,60,120",
+                        help="Comma-separated lengths in seconds of the windows that the audio is aligned in to try. "
+                             "Only used by 'dtw'; gentle's chunk length is fixed by gentle.")
+    parser.add_argument("--media-file", default=CALIBRATION_MEDIA,
+                        help="The video/audio file to calibrate on. (Default: the example recording)")
+    parser.add_argument("--transcript-file", default=CALIBRATION_TRANSCRIPT,
+                        help="The transcript of the file to calibrate on.")
+    parser.add_argument("--duration", type=float, default=CALIBRATION_DURATION,
+                        help="Minimum number of seconds of audio in each calibration job. The file is repeated until "
+                             "it is this long.")
+    parser.add_argument("--profile-file", default=PROFILE_PATH,
+                        help=f"Path to save the profile to. Only the default path ({PROFILE_PATH}) is used by the "
+                             f"other commands.")
+
+
+def run(args):
+    """
+    Runs the command.
+
+    Args:
+        args (argparse.Namespace):
+            The parsed arguments.
+    """
+
+    # Run validation on the provided inputs
+    worker_counts = parse_counts(args.workers)
+    workload_kwargs = {"media_file": args.media_file, "transcript_path": args.transcript_file,
+                       "min_duration": args.duration}
+
+    # Sweep the settings
+    print(f"Tuning the '{args.backend}' backend...")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        if args.backend == "gentle":
+            settings, _ = tune_gentle(work_dir, worker_counts=worker_counts, thread_counts=parse_counts(args.threads),
+                                      **workload_kwargs)
+        else:
+            settings, _ = tune_dtw(work_dir, worker_counts=worker_counts,
+                                   window_durations=parse_counts(args.window_durations, cast=float),
+                                   **workload_kwargs)
+
+    # Save the fastest settings
+    save_backend_settings(args.backend, settings, profile_path=args.profile_file)
+
+    print("Fastest settings: " + ", ".join(f"{key} = {value}" for key, value in settings.items()))
+    print(f"Saved to '{args.profile_file}'.")
+
+
+# HELPER FUNCTIONS
+def parse_counts(values, cast=int):
+    """
+    Parses a comma-separated list of positive numbers.
+
+    Args:
+        values (str):
+            The comma-separated list.
+
+        cast (type):
+            The type of the numbers.
+            (Default = int)
+
+    Returns:
+        tuple
+
+    Raises:
+        AssertionError:
+            If any of the numbers is not positive.
+    """
+
+    counts = tuple(cast(value) for value in values.split(",") if value.strip())
+    assert counts and all(count > 0 for count in counts), f"'{values}' is not a list of positive numbers."
+
+    return counts
@@ -1,4 +1,11 @@
+from .audio_format import AudioFormat, negotiate_audio_format
+from .audio_info import get_audio_duration, probe_media_duration
+from .audio_slicing import slice_audio
 from .audio_to_wav import audio_to_wav, SUPPORTED_AUDIO_EXTENSIONS
-from .timetable_to_subrip import timetable_to_subrip
-from .timetable_to_webvtt import timetable_to_webvtt
+from .extract_audio import extract_audio
+from .speech_excision import excise_non_speech, OffsetTable
+from .timetable_to_subrip import iterate_subrip, timetable_to_subrip
+from .timetable_to_webvtt import iterate_webvtt, timetable_to_webvtt
+from .transcript_normalisation import DEFAULT_MARKUP, MARKUP_KINDS, normalise_transcript, normalise_transcript_file, \
+    TranscriptOffsetMap
 from .video_to_wav import video_to_wav, SUPPORTED_VIDEO_EXTENSIONS
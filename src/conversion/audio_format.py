@@ -0,0 +1,149 @@
+"""
+audio_format.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Describes the audio formats that alignment backends accept and negotiates the smallest one that all of them
+             accept.
+"""
+
+# CONSTANTS
+LOSSLESS_CONTAINERS = ("wav", "flac")
+
+
+# CLASS
+class AudioFormat:
+    """
+    An audio format that the extracted audio can be converted into.
+    """
+
+    # Dunder methods
+    def __init__(self, sample_rate=None, channels=None, sample_width=None, containers=("wav",)):
+        """
+        Initialisation method.
+
+        Args:
+            sample_rate (int):
+                Sample rate in hertz. Use `None` to keep the source's sample rate.
+                (Default = None)
+
+            channels (int):
+                Number of channels. Use `None` to keep the source's number of channels.
+                (Default = None)
+
+            sample_width (int):
+                Number of bytes per sample. Use `None` to keep the source's sample width.
+                (Default = None)
+
+            containers (tuple[str]):
+                The containers that are accepted, in order of preference. Each must be in `LOSSLESS_CONTAINERS`.
+                (Default = ("wav",))
+
+        Raises:
+            AssertionError:
+                If any of the containers is not in `LOSSLESS_CONTAINERS`.
+        """
+
+        for container in containers:
+            assert container in LOSSLESS_CONTAINERS, f"The container '{container}' is currently unsupported by the " \
+                                                     "program."
+
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.containers = tuple(containers)
+
+    def __repr__(self):
+        return f"AudioFormat(sample_rate={self.sample_rate}, channels={self.channels}, " \
+               f"sample_width={self.sample_width}, containers={self.containers})"
+
+    # Properties
+    @property
+    def container(self):
+        """
+        The preferred container.
+
+        Returns:
+            str
+        """
+
+        return self.containers[0]
+
+
+# FUNCTIONS
+def apply_audio_format(audio, audio_format):
+    """
+    Downmixes, resamples and requantises audio to an audio format.
+
+    Args:
+        audio (pydub.AudioSegment):
+            The audio.
+
+        audio_format (AudioFormat):
+            The audio format. Properties that are `None` are left as they are.
+
+    Returns:
+        pydub.AudioSegment:
+            The converted audio.
+    """
+
+    if audio_format.channels is not None and audio.channels != audio_format.channels:
+        audio = audio.set_channels(audio_format.channels)
+
+    if audio_format.sample_rate is not None and audio.frame_rate != audio_format.sample_rate:
+        audio = audio.set_frame_rate(audio_format.sample_rate)
+
+    if audio_format.sample_width is not None and audio.sample_width != audio_format.sample_width:
+        audio = audio.set_sample_width(audio_format.sample_width)
+
+    return audio
+
+
+def negotiate_audio_format(accepted_formats, container="wav"):
+    """
+    Finds the smallest audio format that every consumer of the extracted audio accepts.
+
+    The highest of the requested sample rates and sample widths and the lowest of the requested numbers of channels are
+    used, so that no consumer gets less than it asked for.
+
+    Args:
+        accepted_formats (list[AudioFormat]):
+            The audio formats accepted by each consumer, e.g. by each alignment backend.
+
+        container (str):
+            The preferred container. If not every consumer accepts it, the first container that they all accept is used
+            instead.
+            (Default = "wav")
+
+    Returns:
+        AudioFormat:
+            The negotiated audio format, with exactly one container.
+
+    Raises:
+        AssertionError:
+            If there is no container that every consumer accepts.
+    """
+
+    def __pick(values, choose):
+        """Helper function that picks one of the values that are not `None`, or `None` if there are none."""
+        values = [value for value in values if value is not None]
+        return choose(values) if values else None
+
+    # Find the containers that every consumer accepts, keeping the order of preference of the first consumer
+    common_containers = list(accepted_formats[0].containers) if accepted_formats else list(LOSSLESS_CONTAINERS)
+    for accepted_format in accepted_formats[1:]:
+        common_containers = [name for name in common_containers if name in accepted_format.containers]
+
+    assert common_containers, "There is no audio container that every alignment backend accepts."
+
+    if container not in common_containers:
+        print(f"Not every alignment backend accepts '{container}' audio; using '{common_containers[0]}' instead.")
+        container = common_containers[0]
+
+    return AudioFormat(sample_rate=__pick([f.sample_rate for f in accepted_formats], max),
+                       channels=__pick([f.channels for f in accepted_formats], min),
+                       sample_width=__pick([f.sample_width for f in accepted_formats], max),
+                       containers=(container,))
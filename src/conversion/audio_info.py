@@ -0,0 +1,97 @@
+"""
+audio_info.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Probes the duration of audio and video files without decoding them.
+
+References:
+    - https://xiph.org/flac/format.html#metadata_block_streaminfo
+"""
+
+# IMPORTS
+import os
+import wave
+
+from pydub.utils import mediainfo
+
+# CONSTANTS
+FLAC_MARKER = b"fLaC"
+FLAC_HEADER_LENGTH = 42  # The marker, the metadata block header and the STREAMINFO block
+
+
+# FUNCTIONS
+def get_audio_duration(audio_file_path):
+    """
+    Gets the duration of a WAV or FLAC file from its header.
+
+    Args:
+        audio_file_path (str):
+            Path to the WAV or FLAC file.
+
+    Returns:
+        float:
+            Duration of the audio file in seconds.
+
+    Raises:
+        AssertionError:
+            If the file is neither a WAV file nor a FLAC file.
+
+        FileNotFoundError:
+            If the audio file does not exist or is not found.
+    """
+
+    # Check if the audio file exists
+    if not os.path.isfile(audio_file_path):
+        raise FileNotFoundError(f"An audio file does not exist at the path '{audio_file_path}'.")
+
+    extension = os.path.splitext(audio_file_path)[-1]
+    assert extension in (".wav", ".flac"), f"The extension {extension} is currently unsupported by the program."
+
+    if extension == ".wav":
+        with wave.open(audio_file_path, "rb") as wav_obj:
+            return wav_obj.getnframes() / float(wav_obj.getframerate())
+
+    # Read the STREAMINFO block, which is always the first metadata block of a FLAC file
+    with open(audio_file_path, "rb") as f:
+        header = f.read(FLAC_HEADER_LENGTH)
+
+    assert header[:4] == FLAC_MARKER, f"The file at '{audio_file_path}' is not a FLAC file."
+    stream_info = header[8:]
+
+    sample_rate = (stream_info[10] << 12) | (stream_info[11] << 4) | (stream_info[12] >> 4)
+    total_samples = ((stream_info[13] & 0x0F) << 32) | int.from_bytes(stream_info[14:18], "big")
+
+    return total_samples / float(sample_rate)
+
+
+def probe_media_duration(video_or_audio_file):
+    """
+    Gets the duration of a video or audio file without decoding it.
+
+    WAV and FLAC files are read from their headers; other formats are probed with `ffprobe`.
+
+    Args:
+        video_or_audio_file (str):
+            Path to the video or audio file.
+
+    Returns:
+        float:
+            Duration of the file in seconds.
+
+    Raises:
+        FileNotFoundError:
+            If the file does not exist or is not found.
+    """
+
+    if os.path.splitext(video_or_audio_file)[-1] in (".wav", ".flac"):
+        return get_audio_duration(video_or_audio_file)
+
+    # Check if the file exists
+    if not os.path.isfile(video_or_audio_file):
+        raise FileNotFoundError(f"A file does not exist at the path '{video_or_audio_file}'.")
+
+    return float(mediainfo(video_or_audio_file)["duration"])
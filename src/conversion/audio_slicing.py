@@ -0,0 +1,76 @@
+"""
+audio_slicing.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Cuts a window out of an extracted audio file.
+"""
+
+# IMPORTS
+import io
+import os
+import wave
+
+from pydub import AudioSegment
+
+
+# FUNCTIONS
+def slice_audio(audio_file_path, start_time, end_time):
+    """
+    Cuts a window out of a WAV or FLAC file and returns it as a WAV file in memory.
+
+    WAV files are sliced by seeking to the window, so only the window is read from disk.
+
+    Args:
+        audio_file_path (str):
+            Path to the WAV or FLAC file.
+
+        start_time (float):
+            Start of the window in seconds. Clipped to the start of the audio.
+
+        end_time (float):
+            End of the window in seconds. Clipped to the end of the audio.
+
+    Returns:
+        bytes:
+            The contents of a WAV file that holds only the window.
+
+    Raises:
+        FileNotFoundError:
+            If the audio file does not exist or is not found.
+    """
+
+    # Check if the audio file exists
+    if not os.path.isfile(audio_file_path):
+        raise FileNotFoundError(f"An audio file does not exist at the path '{audio_file_path}'.")
+
+    start_time = max(0.0, start_time)
+
+    if os.path.splitext(audio_file_path)[-1] != ".wav":
+        # Decode the whole file, since compressed audio cannot be seeked by time
+        audio = AudioSegment.from_file(audio_file_path)
+        buffer = io.BytesIO()
+        audio[int(start_time * 1000):int(end_time * 1000)].export(buffer, "wav")
+        return buffer.getvalue()
+
+    # Copy only the frames inside the window
+    buffer = io.BytesIO()
+
+    with wave.open(audio_file_path, "rb") as source:
+        frame_rate = source.getframerate()
+        first_frame = min(int(start_time * frame_rate), source.getnframes())
+        last_frame = min(int(end_time * frame_rate), source.getnframes())
+
+        source.setpos(first_frame)
+        frames = source.readframes(max(0, last_frame - first_frame))
+
+        with wave.open(buffer, "wb") as window:
+            window.setnchannels(source.getnchannels())
+            window.setsampwidth(source.getsampwidth())
+            window.setframerate(frame_rate)
+            window.writeframes(frames)
+
+    return buffer.getvalue()
@@ -0,0 +1,76 @@
+"""
+extract_audio.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Extracts the audio of a video or audio file into a WAV (or FLAC) file.
+"""
+
+# IMPORTS
+import os
+
+from src.conversion.audio_to_wav import audio_to_wav, SUPPORTED_AUDIO_EXTENSIONS
+from src.conversion.video_to_wav import video_to_wav, SUPPORTED_VIDEO_EXTENSIONS
+
+
+# FUNCTIONS
+def extract_audio(video_or_audio_file, wav_file_name="transcript", audio_format=None, workspace=None):
+    """
+    Extracts the audio of a video or audio file, depending on the file's extension.
+
+    Args:
+        video_or_audio_file (str):
+            Path to the video or audio file.
+
+        wav_file_name (str):
+            Name of the exported WAV file, without the extension ".wav".
+            (Default = "transcript")
+
+        audio_format (AudioFormat):
+            The audio format to convert the audio into. Use `None` to keep the source's format and export a WAV file.
+            (Default = None)
+
+        workspace (Workspace):
+            The workspace to export the audio file into, in which case `wav_file_name` is relative to the workspace and
+            the workspace's quota is checked once the file is exported. Use `None` to export it relative to the current
+            working directory.
+            (Default = None)
+
+    Returns:
+        str:
+            Path to the exported audio file.
+
+    Raises:
+        AssertionError:
+            If the extension of the file is in neither `SUPPORTED_VIDEO_EXTENSIONS` nor `SUPPORTED_AUDIO_EXTENSIONS`.
+
+        FileNotFoundError:
+            If the file does not exist or is not found.
+
+        OSError:
+            If the exported audio file does not fit in the workspace's quota.
+    """
+
+    extension = os.path.splitext(video_or_audio_file)[-1]
+
+    if extension not in SUPPORTED_VIDEO_EXTENSIONS:
+        assert extension in SUPPORTED_AUDIO_EXTENSIONS, \
+            "The format of the video or audio file is not currently supported. " \
+            f"(Supported: {list(SUPPORTED_VIDEO_EXTENSIONS.keys()) + list(SUPPORTED_AUDIO_EXTENSIONS.keys())})"
+
+    if workspace is not None:
+        wav_file_name = workspace.path(wav_file_name)
+
+    # Export the audio file
+    if extension in SUPPORTED_VIDEO_EXTENSIONS:
+        exported_file_path = video_to_wav(video_or_audio_file, wav_file_name=wav_file_name, audio_format=audio_format)
+    else:
+        exported_file_path = audio_to_wav(video_or_audio_file, wav_file_name=wav_file_name, audio_format=audio_format)
+
+    if workspace is not None:
+        workspace.check_quota()
+
+    return exported_file_path
@@ -0,0 +1,191 @@
+"""
+speech_excision.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Cuts the stretches of audio that contain no speech out of a WAV file, and maps times in the shortened audio
+             back to times in the original audio.
+"""
+
+# IMPORTS
+import os
+import wave
+
+import numpy as np
+from pydub import AudioSegment
+
+from src.audio_analysis.samples import read_wav_samples
+from src.audio_analysis.voice_activity import find_non_speech_spans
+from src.metrics import REGISTRY, track_stage
+
+# CONSTANTS
+EXCISED_AUDIO_SECONDS = REGISTRY.counter("video_to_captions_excised_audio_seconds_total",
+                                         "Number of seconds of non-speech audio that were cut before alignment.")
+
+COPY_CHUNK_FRAMES = 2 ** 16  # Number of frames copied from the original audio at a time
+
+
+# CLASS
+class OffsetTable:
+    """
+    Maps times in audio that has had spans cut out of it back to times in the original audio.
+
+    The table holds one entry per kept segment: where the segment starts in the shortened audio, and where it starts in
+    the original audio.
+    """
+
+    # Dunder methods
+    def __init__(self, kept_segments):
+        """
+        Initialisation method.
+
+        Args:
+            kept_segments (list[tuple[float, float]]):
+                The start and end times in seconds of each segment of the original audio that was kept, in order.
+        """
+
+        durations = np.array([end - start for start, end in kept_segments], dtype=np.float64)
+
+        self.original_starts = np.array([start for start, _ in kept_segments], dtype=np.float64)
+        self.cut_starts = np.concatenate(([0], np.cumsum(durations)[:-1])) if len(durations) else durations
+
+    def __len__(self):
+        return len(self.cut_starts)
+
+    def __repr__(self):
+        return f"OffsetTable({list(zip(self.cut_starts.tolist(), self.original_starts.tolist()))})"
+
+    # Methods
+    def to_original(self, times, side="right"):
+        """
+        Method that maps times in the shortened audio to times in the original audio.
+
+        Args:
+            times (union[float, np.ndarray]):
+                Times in seconds in the shortened audio.
+
+            side (str):
+                Which segment a time that falls exactly on a cut belongs to: "right" for the later segment (e.g. for the
+                start of a word) or "left" for the earlier one (e.g. for the end of a word).
+                (Default = "right")
+
+        Returns:
+            union[float, np.ndarray]:
+                The times in seconds in the original audio.
+        """
+
+        if len(self) == 0:
+            return times
+
+        segment_indices = np.clip(np.searchsorted(self.cut_starts, times, side=side) - 1, 0, len(self) - 1)
+        return self.original_starts[segment_indices] + (times - self.cut_starts[segment_indices])
+
+    def remap_timetable(self, timetable):
+        """
+        Method that maps the times of a timetable that was aligned against the shortened audio back to the original
+        audio. The timetable is updated in place.
+
+        Args:
+            timetable (list[dict]):
+                The timetable of spoken words.
+
+        Returns:
+            list[dict]:
+                The updated timetable.
+        """
+
+        timed_words = [word for word in timetable if "start" in word and "end" in word]
+        if not timed_words:
+            return timetable
+
+        start_times = self.to_original(np.array([word["start"] for word in timed_words]), side="right")
+        end_times = self.to_original(np.array([word["end"] for word in timed_words]), side="left")
+
+        for word, start_time, end_time in zip(timed_words, start_times, end_times):
+            word["start"] = round(float(start_time), 2)
+            word["end"] = round(float(max(start_time, end_time)), 2)
+
+        return timetable
+
+
+# FUNCTIONS
+def excise_non_speech(audio_file_path, output_file_name, container="wav"):
+    """
+    Writes a copy of a WAV file without the long stretches that contain no speech.
+
+    Args:
+        audio_file_path (str):
+            Path to the WAV file.
+
+        output_file_name (str):
+            Name of the shortened audio file, without the extension.
+
+        container (str):
+            Container of the shortened audio file. Either "wav" or "flac".
+            (Default = "wav")
+
+    Returns:
+        tuple[str, OffsetTable]:
+            Path to the shortened audio file, and the table that maps its times back to the original audio.
+
+    Raises:
+        FileNotFoundError:
+            If the WAV file does not exist or is not found.
+    """
+
+    with track_stage("excision") as stage:
+        # Find the spans to cut
+        samples, sample_rate = read_wav_samples(audio_file_path)
+        num_frames = len(samples)
+        non_speech_spans = find_non_speech_spans(samples, sample_rate)
+        del samples
+
+        stage.audio_duration = num_frames / sample_rate
+
+        # Get the frames to keep, so that the offset table matches the shortened file exactly
+        kept_frames = []
+        previous_end = 0
+
+        for start, end in non_speech_spans + [(stage.audio_duration, stage.audio_duration)]:
+            start_frame, end_frame = int(round(start * sample_rate)), min(int(round(end * sample_rate)), num_frames)
+            if start_frame > previous_end:
+                kept_frames.append((previous_end, start_frame))
+            previous_end = end_frame
+
+        if not kept_frames:
+            kept_frames = [(0, num_frames)]  # Nothing sounds like speech, so let the aligner search all of it
+
+        if kept_frames == [(0, num_frames)] and container == "wav":
+            return audio_file_path, OffsetTable([(0.0, stage.audio_duration)])  # Nothing to cut
+
+        # Copy the kept frames into the shortened file
+        exported_file_path = f"{output_file_name}.wav"
+
+        with wave.open(audio_file_path, "rb") as source, wave.open(exported_file_path, "wb") as destination:
+            destination.setparams(source.getparams())
+            frame_size = source.getsampwidth() * source.getnchannels()
+
+            for start_frame, end_frame in kept_frames:
+                source.setpos(start_frame)
+                frames_left = end_frame - start_frame
+
+                while frames_left > 0:
+                    frames = source.readframes(min(frames_left, COPY_CHUNK_FRAMES))
+                    if not frames:
+                        break
+
+                    destination.writeframes(frames)
+                    frames_left -= len(frames) // frame_size
+
+        # Compress the shortened file, if needed
+        if container != "wav":
+            AudioSegment.from_wav(exported_file_path).export(f"{output_file_name}.{container}", container)
+            os.remove(exported_file_path)
+            exported_file_path = f"{output_file_name}.{container}"
+
+    EXCISED_AUDIO_SECONDS.inc((num_frames - sum(end - start for start, end in kept_frames)) / sample_rate)
+
+    return exported_file_path, OffsetTable([(start / sample_rate, end / sample_rate) for start, end in kept_frames])
@@ -2,7 +2,7 @@
 timetable_to_subrip.py
 
 Created on 2021-05-15
-Updated on 2021-05-15
+Updated on 2026-10-19
 
 Copyright © Ryan Kan
 
@@ -15,6 +15,12 @@ References:
 # IMPORTS
 from datetime import timedelta
 
+from src.metrics import REGISTRY, track_stage
+
+# CONSTANTS
+CUES_RENDERED = REGISTRY.counter("video_to_captions_cues_rendered_total", "Number of caption cues rendered.",
+                                 label_names=("format",))
+
 
 # FUNCTIONS
 def timedelta_to_subrip_time(timedelta_object):
@@ -54,29 +60,49 @@ def timetable_to_subrip(aligned_timetable):
             Text representing a SubRip file.
     """
 
-    # Define a variable to contain the file's contents
-    file_contents = ""
+    return "".join(iterate_subrip(aligned_timetable))
+
+
+def iterate_subrip(aligned_blocks):
+    """
+    Converts caption blocks into the SubRip format one block at a time, so that the captions can be written as they
+    are made instead of being held in memory.
+
+    Args:
+        aligned_blocks (iterable[dict]):
+            The caption blocks that are output by the `Aligner` class, e.g. by `Aligner.iterate_sentences`.
+
+    Yields:
+        str:
+            The successive pieces of a SubRip file.
+    """
+
+    # Render the blocks, recording the time taken relative to the captioned duration
+    num_blocks = 0
+
+    with track_stage("rendering") as stage:
+        # Process each block
+        for i, block in enumerate(aligned_blocks):
+            # Define a temporary variable to store this caption block
+            block_text = f"{i + 1}\n"  # Every SubRip caption block starts with a number
 
-    # Process each block
-    for i, block in enumerate(aligned_timetable):
-        # Define a temporary variable to store this caption block
-        block_text = f"{i + 1}\n"  # Every SubRip caption block starts with a number
+            # Get the start and end time of the block
+            start_time = timedelta_to_subrip_time(timedelta(seconds=block["start_time"]))
+            end_time = timedelta_to_subrip_time(timedelta(seconds=block["end_time"]))
 
-        # Get the start and end time of the block
-        start_time = timedelta_to_subrip_time(timedelta(seconds=block["start_time"]))
-        end_time = timedelta_to_subrip_time(timedelta(seconds=block["end_time"]))
+            # Add the timing line to the block of text
+            block_text += f"{start_time} --> {end_time}\n"
 
-        # Add the timing line to the block of text
-        block_text += f"{start_time} --> {end_time}\n"
+            # Add the line of text from the `block` to the block of text
+            block_text += block["text"] + "\n\n"
 
-        # Add the line of text from the `block` to the block of text
-        block_text += block["text"] + "\n\n"
+            # Yield the `block_text`
+            yield block_text
 
-        # Add the `block_text` to the `file_contents`
-        file_contents += block_text
+            num_blocks += 1
+            stage.audio_duration = block["end_time"]
 
-    # Return the final file's contents
-    return file_contents
+    CUES_RENDERED.inc(num_blocks, format="subrip")
 
 
 # TESTING CODE
@@ -2,7 +2,7 @@
 timetable_to_webvtt.py
 
 Created on 2021-05-02
-Updated on 2021-05-15
+Updated on 2026-10-19
 
 Copyright © Ryan Kan
 
@@ -15,6 +15,12 @@ References:
 # IMPORTS
 from datetime import timedelta
 
+from src.metrics import REGISTRY, track_stage
+
+# CONSTANTS
+CUES_RENDERED = REGISTRY.counter("video_to_captions_cues_rendered_total", "Number of caption cues rendered.",
+                                 label_names=("format",))
+
 
 # FUNCTIONS
 def timedelta_to_webvtt_time(timedelta_object):
@@ -54,29 +60,51 @@ def timetable_to_webvtt(aligned_timetable):
             Text representing a WebVTT file.
     """
 
-    # Every WebVTT file starts with this
-    file_contents = "WEBVTT\n\n"
+    return "".join(iterate_webvtt(aligned_timetable))
+
+
+def iterate_webvtt(aligned_blocks):
+    """
+    Converts caption blocks into the WebVTT format one block at a time, so that the captions can be written as they
+    are made instead of being held in memory.
+
+    Args:
+        aligned_blocks (iterable[dict]):
+            The caption blocks that are output by the `Aligner` class, e.g. by `Aligner.iterate_sentences`.
+
+    Yields:
+        str:
+            The successive pieces of a WebVTT file.
+    """
+
+    # Render the blocks, recording the time taken relative to the captioned duration
+    num_blocks = 0
+
+    with track_stage("rendering") as stage:
+        yield "WEBVTT\n\n"  # Every WebVTT file starts with this
+
+        # Process each block
+        for block in aligned_blocks:
+            # Define a temporary variable to store this caption block
+            block_text = ""
 
-    # Process each block
-    for block in aligned_timetable:
-        # Define a temporary variable to store this caption block
-        block_text = ""
+            # Get the start and end time of the block
+            start_time = timedelta_to_webvtt_time(timedelta(seconds=block["start_time"]))
+            end_time = timedelta_to_webvtt_time(timedelta(seconds=block["end_time"]))
 
-        # Get the start and end time of the block
-        start_time = timedelta_to_webvtt_time(timedelta(seconds=block["start_time"]))
-        end_time = timedelta_to_webvtt_time(timedelta(seconds=block["end_time"]))
+            # Add the timing line to the block of text
+            block_text += f"{start_time} --> {end_time}\n"
 
-        # Add the timing line to the block of text
-        block_text += f"{start_time} --> {end_time}\n"
+            # Add the line of text from the `block` to the block of text
+            block_text += block["text"] + "\n\n"
 
-        # Add the line of text from the `block` to the block of text
-        block_text += block["text"] + "\n\n"
+            # Yield the `block_text`
+            yield block_text
 
-        # Add the `block_text` to the `file_contents`
-        file_contents += block_text
+            num_blocks += 1
+            stage.audio_duration = block["end_time"]
 
-    # Return the final file's contents
-    return file_contents
+    CUES_RENDERED.inc(num_blocks, format="webvtt")
 
 
 # TESTING CODE
@@ -0,0 +1,274 @@
+"""
+transcript_normalisation.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Strips the markup that is not spoken (e.g. speaker labels, bracketed stage directions and timecodes) out of
+             a transcript, and maps positions in the stripped transcript back to positions in the original one.
+
+Notes:
+    - Speaker labels and timecodes are only stripped at the start of a line (after any other markup there), since a
+      capitalised word followed by a colon or a time like "10:30" in the middle of a line is usually spoken.
+    - Each stretch of markup is replaced by a single space, so that the words on either side of it stay apart. The
+      offset map holds one entry per kept stretch of the original transcript, so it stays small however long the
+      transcript is.
+"""
+
+# IMPORTS
+import os
+import re
+
+import numpy as np
+
+# CONSTANTS
+TIMECODE_PATTERN = r"\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d{1,3})?"
+
+LINE_START_MARKUP = {  # Markup that is only stripped at the start of a line
+    "speakers": r"(?:>>[ \t]*)?[A-Z][\w.'\-]*(?:[ \t]+[A-Z0-9][\w.'\-]*){0,2}[ \t]*:(?=\s|$)",  # "JOHN:", "Speaker 1:"
+    "timecodes": TIMECODE_PATTERN + r"(?:[ \t]*-->[ \t]*" + TIMECODE_PATTERN + r")?(?=\s|$)"  # "01:02 --> 01:04"
+}
+INLINE_MARKUP = {  # Markup that is stripped anywhere
+    "brackets": r"\[[^\[\]\n]*\]|\{[^{}\n]*\}",  # "[laughs]", "{music}"
+    "parentheses": r"\([^()\n]*\)"  # "(applause)"; not stripped by default, since asides are often spoken
+}
+
+MARKUP_KINDS = tuple(LINE_START_MARKUP) + tuple(INLINE_MARKUP)
+DEFAULT_MARKUP = ("speakers", "timecodes", "brackets")
+
+
+# CLASS
+class TranscriptOffsetMap:
+    """
+    Maps character positions in a transcript that has had markup stripped out of it back to positions in the original
+    transcript.
+
+    The map holds one entry per kept stretch of the original transcript: where the stretch starts in the stripped
+    transcript, and where it starts in the original transcript.
+    """
+
+    # Dunder methods
+    def __init__(self, normalised_starts, original_starts):
+        """
+        Initialisation method.
+
+        Args:
+            normalised_starts (list[int]):
+                Position of the start of each kept stretch in the stripped transcript, in order.
+
+            original_starts (list[int]):
+                Position of the start of each kept stretch in the original transcript, in order.
+        """
+
+        self.normalised_starts = np.array(normalised_starts, dtype=np.int64)
+        self.original_starts = np.array(original_starts, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.normalised_starts)
+
+    def __repr__(self):
+        return f"TranscriptOffsetMap({list(zip(self.normalised_starts.tolist(), self.original_starts.tolist()))})"
+
+    # Methods
+    def to_original(self, positions, side="right"):
+        """
+        Method that maps positions in the stripped transcript to positions in the original transcript.
+
+        Args:
+            positions (union[int, np.ndarray]):
+                Positions in the stripped transcript.
+
+            side (str):
+                Which stretch a position on the boundary between two stretches belongs to: "right" for the later one
+                (e.g. for the start of a word) or "left" for the earlier one (e.g. for the position one after the end
+                of a word).
+                (Default = "right")
+
+        Returns:
+            union[int, np.ndarray]:
+                The positions in the original transcript.
+        """
+
+        if len(self) == 0:
+            return positions
+
+        stretch_indices = np.clip(np.searchsorted(self.normalised_starts, positions, side=side) - 1, 0, len(self) - 1)
+        return self.original_starts[stretch_indices] + (positions - self.normalised_starts[stretch_indices])
+
+    def remap_timetable(self, timetable):
+        """
+        Method that maps the offsets of a timetable that was aligned against the stripped transcript back to the
+        original transcript. The timetable is updated in place.
+
+        Args:
+            timetable (list[dict]):
+                The timetable of spoken words.
+
+        Returns:
+            list[dict]:
+                The updated timetable.
+        """
+
+        if not timetable:
+            return timetable
+
+        start_offsets = self.to_original(np.array([word["startOffset"] for word in timetable]), side="right")
+        end_offsets = self.to_original(np.array([word["endOffset"] for word in timetable]), side="left")
+
+        for word, start_offset, end_offset in zip(timetable, start_offsets.tolist(), end_offsets.tolist()):
+            word["startOffset"] = start_offset
+            word["endOffset"] = end_offset
+
+        return timetable
+
+
+# FUNCTIONS
+def normalise_transcript(transcript, markup=DEFAULT_MARKUP, extra_patterns=()):
+    """
+    Strips the markup that is not spoken out of a transcript, in time linear in the length of the transcript.
+
+    Args:
+        transcript (str):
+            The transcript.
+
+        markup (tuple[str]):
+            The kinds of markup to strip, from `MARKUP_KINDS`.
+            (Default = DEFAULT_MARKUP)
+
+        extra_patterns (tuple[str]):
+            Regular expressions of other markup to strip anywhere in the transcript. They should not match across
+            lines.
+            (Default = ())
+
+    Returns:
+        tuple[str, TranscriptOffsetMap]:
+            The stripped transcript, and the map of its positions back to the original transcript.
+
+    Raises:
+        AssertionError:
+            If a kind of markup is not in `MARKUP_KINDS`.
+    """
+
+    for kind in markup:
+        assert kind in MARKUP_KINDS, f"The markup '{kind}' is not supported. (Supported: {list(MARKUP_KINDS)})"
+
+    # Compile the patterns of the markup to strip
+    inline_patterns = [INLINE_MARKUP[kind] for kind in markup if kind in INLINE_MARKUP] + list(extra_patterns)
+    line_start_patterns = [LINE_START_MARKUP[kind] for kind in markup if kind in LINE_START_MARKUP]
+
+    inline_regex = re.compile("|".join(f"(?:{pattern})" for pattern in inline_patterns)) if inline_patterns else None
+    line_start_regex = re.compile("|".join(f"(?:{pattern})" for pattern in line_start_patterns + inline_patterns)) \
+        if line_start_patterns else None
+    whitespace_regex = re.compile(r"[ \t]*")
+
+    # Find the stretches of markup, one line at a time
+    cuts = []  # Start and end positions of each stretch of markup
+    line_start = 0
+
+    for line in transcript.split("\n"):
+        line_end = line_start + len(line)
+        position = line_start
+
+        # Strip the markup at the start of the line, e.g. "[00:01:02] JOHN:"
+        while line_start_regex is not None:
+            markup_start = whitespace_regex.match(transcript, position, line_end).end()
+            match = line_start_regex.match(transcript, markup_start, line_end)
+
+            if match is None or match.end() == markup_start:
+                break
+
+            cuts.append((position, match.end()))  # Also cut the indentation, so that the markup is cut in one stretch
+            position = match.end()
+
+        # Strip the markup in the rest of the line
+        if inline_regex is not None:
+            cuts += [match.span() for match in inline_regex.finditer(transcript, position, line_end) if match.group()]
+
+        line_start = line_end + 1
+
+    # Join the stretches between the markup, separating them with single spaces
+    pieces, normalised_starts, original_starts = [], [], []
+    normalised_length = 0
+    previous_end = 0
+
+    for start, end in cuts + [(len(transcript), len(transcript))]:
+        if start > previous_end:
+            normalised_starts.append(normalised_length)
+            original_starts.append(previous_end)
+            pieces.append(transcript[previous_end:start])
+            normalised_length += start - previous_end + 1
+
+        previous_end = max(previous_end, end)
+
+    return " ".join(pieces), TranscriptOffsetMap(normalised_starts, original_starts)
+
+
+def normalise_transcript_file(transcript_path, output_path, markup=DEFAULT_MARKUP, extra_patterns=()):
+    """
+    Writes a copy of a transcript without the markup that is not spoken.
+
+    Args:
+        transcript_path (str):
+            Path to the transcript.
+
+        output_path (str):
+            Path to write the stripped transcript to.
+
+        markup (tuple[str]):
+            The kinds of markup to strip, from `MARKUP_KINDS`.
+            (Default = DEFAULT_MARKUP)
+
+        extra_patterns (tuple[str]):
+            Regular expressions of other markup to strip anywhere in the transcript.
+            (Default = ())
+
+    Returns:
+        TranscriptOffsetMap:
+            The map of the positions in the stripped transcript back to the original transcript.
+
+    Raises:
+        FileNotFoundError:
+            If the transcript does not exist or is not found.
+    """
+
+    # Check if the transcript exists
+    if not os.path.isfile(transcript_path):
+        raise FileNotFoundError(f"A transcript does not exist at the path '{transcript_path}'.")
+
+    with open(transcript_path, "r") as f:
+        normalised_transcript, offset_map = normalise_transcript(f.read(), markup=markup,
+                                                                 extra_patterns=extra_patterns)
+
+    with open(output_path, "w") as f:
+        f.write(normalised_transcript)
+
+    return offset_map
+
+
+# TESTING CODE
+if __name__ == "__main__":
+    # Imports
+    import time
+
+    # Strip a short transcript
+    sampleTranscript = "[00:00:01] JOHN: Hello there [laughs], how are you?\n" \
+                       "Speaker 2: I am fine. (applause)\n" \
+                       "00:00:05 --> 00:00:07\n" \
+                       "JOHN SMITH: It is 10:30 now: time to go.\n"
+    normalisedTranscript, offsetMap = normalise_transcript(sampleTranscript)
+    print(repr(normalisedTranscript))
+    print(offsetMap)
+
+    # Check that every word maps back to the same word in the original transcript
+    for wordMatch in re.finditer(r"\w+", normalisedTranscript):
+        originalStart = offsetMap.to_original(wordMatch.start(), side="right")
+        originalEnd = offsetMap.to_original(wordMatch.end(), side="left")
+        assert sampleTranscript[originalStart:originalEnd] == wordMatch.group(), wordMatch.group()
+
+    # Check that the time taken grows linearly with the length of the transcript
+    for numRepeats in [1000, 10000, 100000]:
+        startTime = time.time()
+        normalise_transcript(sampleTranscript * numRepeats, markup=MARKUP_KINDS)
+        print(f"{len(sampleTranscript) * numRepeats} characters: {time.time() - startTime:.3f}s")
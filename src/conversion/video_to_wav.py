@@ -2,7 +2,7 @@
 video_to_wav.py
 
 Created on 2021-04-26
-Updated on 2021-05-13
+Updated on 2026-10-19
 
 Copyright © Ryan Kan
 
@@ -14,6 +14,9 @@ import os
 
 from pydub import AudioSegment
 
+from src.conversion.audio_format import AudioFormat, apply_audio_format
+from src.metrics import track_stage
+
 # CONSTANTS
 SUPPORTED_VIDEO_EXTENSIONS = {
     ".mp4": "mp4",
@@ -23,7 +26,7 @@ SUPPORTED_VIDEO_EXTENSIONS = {
 
 
 # FUNCTIONS
-def video_to_wav(video_file, wav_file_name="transcript"):
+def video_to_wav(video_file, wav_file_name="transcript", audio_format=None):
     """
     Converts a video file into a WAV file for further processing.
 
@@ -35,9 +38,15 @@ def video_to_wav(video_file, wav_file_name="transcript"):
             Name of the exported WAV file, without the extension ".wav".
             (Default = "transcript")
 
+        audio_format (AudioFormat):
+            The audio format to convert the audio into, such as the one negotiated with the alignment backends. The
+            file is exported with the extension of the audio format's container. Use `None` to keep the source's
+            sample rate, number of channels and sample width, and export a WAV file.
+            (Default = None)
+
     Returns:
         str:
-            Path to the WAV file.
+            Path to the exported audio file.
 
     Raises:
         AssertionError:
@@ -56,11 +65,20 @@ def video_to_wav(video_file, wav_file_name="transcript"):
     assert extension in SUPPORTED_VIDEO_EXTENSIONS, f"The extension {extension} is currently unsupported by the " \
                                                     "program."
 
-    # Convert the video file into a WAV file
-    AudioSegment.from_file(video_file, SUPPORTED_VIDEO_EXTENSIONS[extension]).export(f"{wav_file_name}.wav", "wav")
+    # Get the audio format to export in
+    if audio_format is None:
+        audio_format = AudioFormat()
+
+    exported_file_path = f"{wav_file_name}.{audio_format.container}"
+
+    # Convert the video file into the audio format
+    with track_stage("extraction") as stage:
+        audio = AudioSegment.from_file(video_file, SUPPORTED_VIDEO_EXTENSIONS[extension])
+        stage.audio_duration = audio.duration_seconds
+        apply_audio_format(audio, audio_format).export(exported_file_path, audio_format.container)
 
-    # Return the path to the WAV file
-    return f"{wav_file_name}.wav"
+    # Return the path to the exported audio file
+    return exported_file_path
 
 
 # DEBUG CODE
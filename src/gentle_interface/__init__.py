@@ -1 +1,2 @@
-from .get_timetable import get_timetable
+from .client import AsyncGentleClient, run_sync
+from .get_timetable import align_transcripts, create_backend, get_timetable, get_timetables
@@ -0,0 +1,405 @@
+"""
+client.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: An asynchronous client for the gentle server that can be used from inside an existing event loop.
+"""
+
+# IMPORTS
+import asyncio
+import concurrent.futures
+import io
+import os
+import wave
+
+from aiohttp import ClientResponseError, ClientSession, ClientTimeout, FormData, ServerDisconnectedError, \
+    TCPConnector
+
+from src.conversion.audio_info import get_audio_duration
+from src.metrics import REGISTRY, track_stage
+
+# CONSTANTS
+UPLOADED_BYTES = REGISTRY.counter("video_to_captions_gentle_uploaded_bytes_total",
+                                  "Number of bytes of audio and transcripts uploaded to the gentle server.")
+REQUESTS = REGISTRY.counter("video_to_captions_gentle_requests_total",
+                            "Number of requests sent to the gentle server, by outcome.", label_names=("outcome",))
+REQUESTS_IN_FLIGHT = REGISTRY.gauge("video_to_captions_gentle_requests_in_flight",
+                                    "Number of requests that are waiting on the gentle server.")
+
+GENTLE_SAMPLE_RATE = 8000  # Gentle resamples all uploads to 8 kHz mono before aligning them
+
+DEFAULT_CONNECTION_LIMIT = 8  # Maximum number of simultaneous connections to the gentle server
+KEEPALIVE_TIMEOUT = 60  # Number of seconds to keep an idle connection open for the next request
+TIMEOUT_PER_AUDIO_SECOND = 2.5  # Number of seconds to wait for a response per second of audio
+MIN_REQUEST_TIMEOUT = 30  # Minimum number of seconds to wait for a response, since short requests have fixed overheads
+
+
+# CLASS
+class AsyncGentleClient:
+    """
+    Asynchronous client for the gentle server.
+
+    The client keeps one pooled session open while it is in use, so successive requests reuse the same keep-alive
+    connections. Use it as an asynchronous context manager:
+
+        async with AsyncGentleClient(port=8765) as client:
+            timetable = await client.align("audio.wav", "transcript.txt")
+    """
+
+    # Dunder methods
+    def __init__(self, host="localhost", port=8765, connection_limit=DEFAULT_CONNECTION_LIMIT,
+                 keepalive_timeout=KEEPALIVE_TIMEOUT):
+        """
+        Initialisation method.
+
+        Args:
+            host (str):
+                Host name of the gentle server.
+                (Default = "localhost")
+
+            port (int):
+                Port of the gentle server.
+                (Default = 8765)
+
+            connection_limit (int):
+                Maximum number of simultaneous connections to the gentle server. Further requests wait for a free
+                connection.
+                (Default = 8)
+
+            keepalive_timeout (float):
+                Number of seconds to keep an idle connection open for the next request.
+                (Default = 60)
+        """
+
+        self.url = f"http://{host}:{port}"
+        self.connection_limit = connection_limit
+        self.keepalive_timeout = keepalive_timeout
+
+        self._session = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    # Methods
+    async def open(self):
+        """
+        Method that opens the pooled session. Called automatically when the client is used as a context manager.
+        """
+
+        if self._session is None:
+            connector = TCPConnector(limit=self.connection_limit, keepalive_timeout=self.keepalive_timeout)
+            self._session = ClientSession(connector=connector)
+
+    async def close(self):
+        """
+        Method that closes the pooled session and its connections.
+        """
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def align(self, audio, transcript, audio_duration=None, audio_file_name=None):
+        """
+        Method that aligns a transcript against audio.
+
+        Args:
+            audio (union[str, bytes]):
+                Path to the audio file, or the contents of an audio file.
+
+            transcript (union[str, bytes]):
+                Path to the transcript, or the contents of the transcript.
+
+            audio_duration (float):
+                Duration of the audio in seconds. Use `None` to probe it, which is only possible for WAV and FLAC
+                audio.
+                (Default = None)
+
+            audio_file_name (str):
+                File name to upload the audio as. Its extension tells gentle how the audio is encoded. Use `None` to
+                use the name of the audio file, or "audio.wav" if the audio is given as bytes.
+                (Default = None)
+
+        Returns:
+            list[dict]:
+                The timetable which only contains the words and the times when those words were said.
+
+        Raises:
+            FileNotFoundError:
+                If either the audio file or the transcript cannot be found.
+
+            Exception:
+                If something went wrong in the gentle server.
+        """
+
+        return (await self.align_many(audio, [transcript], audio_duration=audio_duration,
+                                      audio_file_name=audio_file_name))[0]
+
+    async def align_many(self, audio, transcripts, audio_duration=None, audio_file_name=None, on_aligned=None):
+        """
+        Method that aligns several transcripts against the same audio concurrently.
+
+        The audio is read and probed once, and the same buffer is uploaded alongside every transcript.
+
+        Args:
+            audio (union[str, bytes]):
+                Path to the audio file, or the contents of an audio file.
+
+            transcripts (list[union[str, bytes]]):
+                Paths to the transcripts, or the contents of the transcripts.
+
+            audio_duration (float):
+                Duration of the audio in seconds. Use `None` to probe it.
+                (Default = None)
+
+            audio_file_name (str):
+                File name to upload the audio as. Use `None` to use the name of the audio file.
+                (Default = None)
+
+            on_aligned (callable):
+                Function that is called with no arguments every time a transcript has been aligned, e.g. to update a
+                progress bar.
+                (Default = None)
+
+        Returns:
+            list[list[dict]]:
+                The timetables, in the same order as `transcripts`.
+
+        Raises:
+            FileNotFoundError:
+                If either the audio file or any of the transcripts cannot be found.
+
+            Exception:
+                If something went wrong in the gentle server.
+        """
+
+        # Read the audio and transcripts
+        audio_data, audio_duration, audio_file_name = read_audio(audio, audio_duration, audio_file_name)
+        transcripts_data = [read_transcript(transcript) for transcript in transcripts]
+
+        # Gentle shares its CPU between concurrent requests, so scale the timeout by the number of transcripts
+        timeout = ClientTimeout(total=max(audio_duration * TIMEOUT_PER_AUDIO_SECOND, MIN_REQUEST_TIMEOUT) *
+                                len(transcripts_data))
+
+        async def __align_helper(transcript_data):
+            """Helper method to assist with the alignment of one transcript."""
+            raw_timetable = await self._post(audio_data, transcript_data, audio_duration, audio_file_name, timeout)
+
+            if on_aligned is not None:
+                on_aligned()
+
+            return self._process_raw_timetable(raw_timetable)
+
+        # Submit all the transcripts concurrently
+        return list(await asyncio.gather(*[__align_helper(transcript_data) for transcript_data in transcripts_data]))
+
+    async def warm_up(self):
+        """
+        Method that sends a tiny alignment to the gentle server so that it loads its models.
+        """
+
+        # Generate a short silent WAV file in memory
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav_obj:
+            wav_obj.setnchannels(1)
+            wav_obj.setsampwidth(2)
+            wav_obj.setframerate(GENTLE_SAMPLE_RATE)
+            wav_obj.writeframes(b"\x00\x00" * GENTLE_SAMPLE_RATE)
+
+        # Align it against a one-word transcript
+        await self.align(buffer.getvalue(), b"warm", audio_duration=1)
+
+    # Helper Methods
+    @staticmethod
+    def _process_raw_timetable(raw_timetable):
+        """
+        Helper method that processes the raw timetable returned by the gentle server.
+
+        Args:
+            raw_timetable (dict):
+                The raw timetable.
+
+        Returns:
+            list[dict]:
+                The timetable which only contains the words and the times when those words were said.
+        """
+
+        # Get all the words and their related data points
+        words = raw_timetable["words"]  # This is a list of dictionaries
+
+        # Remove the "phones" (phonemes) key from all the words' dictionaries
+        for word in words:
+            word.pop("phones", None)
+
+        return words
+
+    async def _post(self, audio_data, transcript_data, audio_duration, audio_file_name, timeout):
+        """
+        Helper method that sends one audio buffer and one transcript to the gentle server.
+
+        Args:
+            audio_data (bytes):
+                Contents of the audio file.
+
+            transcript_data (bytes):
+                Contents of the transcript.
+
+            audio_duration (float):
+                Duration of the audio in seconds, used to record the alignment throughput.
+
+            audio_file_name (str):
+                File name to upload the audio as.
+
+            timeout (aiohttp.ClientTimeout):
+                Timeout of the request.
+
+        Returns:
+            dict:
+                The raw timetable.
+
+        Raises:
+            AssertionError:
+                If the client is not open.
+
+            ConnectionError:
+                If the server disconnected from the program.
+
+            Exception:
+                If something went wrong in the gentle server.
+        """
+
+        assert self._session is not None, "The client must be opened (e.g. with `async with`) before it is used."
+
+        # Generate the form data; the audio buffer is shared, not copied, between requests
+        form = FormData()
+        form.add_field("audio", audio_data, filename=audio_file_name)
+        form.add_field("transcript", transcript_data, filename="transcript.txt")
+
+        UPLOADED_BYTES.inc(len(audio_data) + len(transcript_data))
+        REQUESTS_IN_FLIGHT.inc()
+
+        # Try to make a post request to the gentle server
+        try:
+            with track_stage("alignment", audio_duration=audio_duration):
+                async with self._session.post(url=f"{self.url}/transcriptions?async=false", data=form,
+                                              timeout=timeout) as response:
+                    timetable_json = await response.json()  # Whatever is sent back by the server
+        except ServerDisconnectedError:
+            # Something went wrong; report as an error message
+            REQUESTS.inc(outcome="failure")
+            raise ConnectionError("The server disconnected from the program. Please try again.")
+        except ClientResponseError:
+            REQUESTS.inc(outcome="failure")
+            raise Exception("Something went wrong on the gentle server.")
+        except BaseException:
+            REQUESTS.inc(outcome="failure")
+            raise
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+
+        REQUESTS.inc(outcome="success")
+        return timetable_json
+
+
+# FUNCTIONS
+def run_sync(coroutine):
+    """
+    Runs a coroutine to completion from synchronous code.
+
+    If the calling thread is already running an event loop (e.g. a synchronous function called from an asynchronous
+    service), the coroutine is run on a new event loop in another thread instead of failing.
+
+    Args:
+        coroutine (coroutine):
+            The coroutine to run.
+
+    Returns:
+        The result of the coroutine.
+    """
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)  # No loop is running in this thread
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+def read_audio(audio, audio_duration=None, audio_file_name=None):
+    """
+    Reads audio that is given either as a path or as the contents of an audio file.
+
+    Args:
+        audio (union[str, bytes]):
+            Path to the audio file, or the contents of an audio file.
+
+        audio_duration (float):
+            Duration of the audio in seconds. Use `None` to probe it.
+            (Default = None)
+
+        audio_file_name (str):
+            File name to upload the audio as. Use `None` to use the name of the audio file.
+            (Default = None)
+
+    Returns:
+        tuple[bytes, float, str]:
+            The contents, duration and file name of the audio.
+
+    Raises:
+        FileNotFoundError:
+            If the audio file cannot be found.
+    """
+
+    if isinstance(audio, bytes):
+        if audio_duration is None:
+            # Only WAV audio can be probed in memory
+            with wave.open(io.BytesIO(audio), "rb") as wav_obj:
+                audio_duration = wav_obj.getnframes() / float(wav_obj.getframerate())
+
+        return audio, audio_duration, audio_file_name or "audio.wav"
+
+    if not os.path.isfile(audio):
+        raise FileNotFoundError(f"The audio file cannot be found at the path '{audio}'.")
+
+    with open(audio, "rb") as f:
+        audio_data = f.read()
+
+    if audio_duration is None:
+        audio_duration = get_audio_duration(audio)
+
+    return audio_data, audio_duration, audio_file_name or os.path.basename(audio)
+
+
+def read_transcript(transcript):
+    """
+    Reads a transcript that is given either as a path or as its contents.
+
+    Args:
+        transcript (union[str, bytes]):
+            Path to the transcript, or the contents of the transcript.
+
+    Returns:
+        bytes
+
+    Raises:
+        FileNotFoundError:
+            If the transcript cannot be found.
+    """
+
+    if isinstance(transcript, bytes):
+        return transcript
+
+    if not os.path.isfile(transcript):
+        raise FileNotFoundError(f"The transcript cannot be found at the path '{transcript}'.")
+
+    with open(transcript, "rb") as f:
+        return f.read()
@@ -2,7 +2,7 @@
 gentle.py
 
 Created on 2021-04-28
-Updated on 2021-05-11
+Updated on 2026-10-19
 
 Copyright © Ryan Kan
 
@@ -14,35 +14,135 @@ import asyncio
 import math
 import os
 import re
+import socket
 import subprocess
+import threading
 import time
-import wave
+import urllib.error
+import urllib.request
 
-from aiohttp import ClientResponseError, ClientSession, ClientTimeout, ServerDisconnectedError
 from tqdm import tqdm
 
+from src.conversion.audio_info import get_audio_duration
+from src.gentle_interface.client import AsyncGentleClient, DEFAULT_CONNECTION_LIMIT, run_sync
+from src.tuning.profile import load_backend_settings
+
+# CONSTANTS
+READINESS_INITIAL_DELAY = 0.05  # Seconds to wait before the first retry of the readiness probe
+READINESS_MAX_DELAY = 2  # Maximum number of seconds to wait between retries of the readiness probe
+READINESS_TIMEOUT = 60  # Number of seconds to wait for the gentle server to be ready
+
 
 # CLASS
 class Gentle:
     """
     The gentle interface.
 
-    This class will directly interface with the gentle server to generate the timetable.
+    This class will directly interface with the gentle server to generate the timetable. Its methods are synchronous
+    wrappers around `AsyncGentleClient`; asynchronous code should use `client()` instead.
     """
 
+    # Dunder methods
+    def __init__(self, host="localhost", port=8765, container_name="gentle-container",
+                 connection_limit=DEFAULT_CONNECTION_LIMIT):
+        """
+        Initialisation method.
+
+        Args:
+            host (str):
+                Host name of the gentle server.
+                (Default = "localhost")
+
+            port (int):
+                Port of the gentle server.
+                (Default = 8765)
+
+            container_name (str):
+                Name of the gentle docker container.
+                (Default = "gentle-container")
+
+            connection_limit (int):
+                Maximum number of simultaneous connections to the gentle server.
+                (Default = 8)
+        """
+
+        self.host = host
+        self.port = port
+        self.url = f"http://{host}:{port}"
+        self.container_name = container_name
+        self.connection_limit = connection_limit
+
+        self._client = None  # The pooled client that is kept open between requests, and the event loop that it runs on
+        self._client_loop = None
+        self._client_thread = None
+
     # Methods
-    def start_gentle_container(self):
+    def client(self):
+        """
+        Method that creates an asynchronous client for the gentle server.
+
+        Returns:
+            AsyncGentleClient:
+                The client, which must be used as an asynchronous context manager.
+        """
+
+        return AsyncGentleClient(host=self.host, port=self.port, connection_limit=self.connection_limit)
+
+    def open_client(self):
+        """
+        Method that opens a pooled client that is kept open until `close_client()` is called, so that successive calls
+        to `get_timetable_from_data()` (e.g. one per region) reuse the same keep-alive connections.
+
+        The client runs on an event loop in a thread of its own, so that it can be used from any thread.
+        """
+
+        if self._client is not None:
+            return
+
+        self._client_loop = asyncio.new_event_loop()
+        self._client_thread = threading.Thread(target=self._client_loop.run_forever, daemon=True)
+        self._client_thread.start()
+
+        self._client = self.client()
+        asyncio.run_coroutine_threadsafe(self._client.open(), self._client_loop).result()
+
+    def close_client(self):
+        """
+        Method that closes the pooled client opened by `open_client()`, if it is open.
+        """
+
+        if self._client is None:
+            return
+
+        try:
+            asyncio.run_coroutine_threadsafe(self._client.close(), self._client_loop).result()
+        finally:
+            self._client_loop.call_soon_threadsafe(self._client_loop.stop)
+            self._client_thread.join()
+            self._client_loop.close()
+
+            self._client, self._client_loop, self._client_thread = None, None, None
+
+    def start_gentle_container(self, warm_up=False):
         """
         Helper method that helps to set up the gentle container.
 
+        Args:
+            warm_up (bool):
+                Whether a tiny alignment should be sent once the server is up, so that the first real alignment does not
+                have to wait for gentle to load its models.
+                (Default = False)
+
         Raises:
             ModuleNotFoundError:
                 If the gentle docker container was not installed.
+
+            TimeoutError:
+                If the gentle server did not become ready in time.
         """
 
         # Attempt to start the gentle container
-        output = self._run_cmd("docker start gentle-container", return_output=False)
-        time.sleep(1)  # Wait for 1 second for everything to set up correctly
+        output = self._run_cmd(f"docker start {self.container_name}", return_output=False)
 
         # Check the exit code of the program
         if output != 0:  # Non-zero exit code
@@ -50,6 +150,43 @@ class Gentle:
             raise ModuleNotFoundError(f"Starting of gentle container returned non-zero error code {output}: "
                                       f"did you install the gentle docker container?")
 
+        # Wait for the server inside the container to be ready
+        self.wait_until_ready(warm_up=warm_up)
+
+    def wait_until_ready(self, timeout=READINESS_TIMEOUT, warm_up=False):
+        """
+        Method that waits until the gentle server responds to HTTP requests.
+
+        The server is polled with an exponential backoff, starting at `READINESS_INITIAL_DELAY` seconds between polls
+        and capped at `READINESS_MAX_DELAY` seconds.
+
+        Args:
+            timeout (float):
+                Number of seconds to wait for the server to be ready.
+                (Default = READINESS_TIMEOUT)
+
+            warm_up (bool):
+                Whether a tiny alignment should be sent once the server is up.
+                (Default = False)
+
+        Raises:
+            TimeoutError:
+                If the gentle server did not become ready in time.
+        """
+
+        deadline = time.monotonic() + timeout
+        delay = READINESS_INITIAL_DELAY
+
+        while not self._is_server_up(timeout=READINESS_MAX_DELAY):
+            if time.monotonic() + delay > deadline:
+                raise TimeoutError(f"The gentle server at {self.url} was not ready after {timeout} seconds.")
+
+            time.sleep(delay)
+            delay = min(delay * 2, READINESS_MAX_DELAY)
+
+        if warm_up:
+            run_sync(self._warm_up_async())
+
     def stop_gentle_container(self):
         """
         Method to stop the gentle container.
@@ -60,7 +197,7 @@ class Gentle:
 
         """
 
-        self._run_cmd("docker stop gentle-container", return_output=False)
+        self._run_cmd(f"docker stop {self.container_name}", return_output=False)
 
     def get_timetable(self, audio_file_path, transcript_path, refresh_interval=0.5):
         """
@@ -86,20 +223,108 @@ class Gentle:
                 If either the audio file or the transcript cannot be found.
         """
 
-        # Get the raw timetable
-        raw_timetable = self._get_raw_timetable(audio_file_path, transcript_path, refresh_interval=refresh_interval)
+        return run_sync(self._get_timetable_async(audio_file_path, transcript_path, refresh_interval=refresh_interval))
+
+    def get_timetables(self, audio_file_path, transcript_paths):
+        """
+        Method that gets the timetables of several transcripts against the same audio file from the gentle server.
+
+        The audio file is read and probed once, and the same buffer is uploaded alongside every transcript. All the
+        transcripts are submitted to the gentle server concurrently.
+
+        Args:
+            audio_file_path (str):
+                Path to the audio file.
+
+            transcript_paths (list[str]):
+                Paths to the transcripts.
+
+        Returns:
+            list[list[dict]]:
+                The timetables, in the same order as `transcript_paths`.
+
+        Raises:
+            FileNotFoundError:
+                If either the audio file or any of the transcripts cannot be found.
+        """
+
+        # A single transcript can use the more detailed progress bar
+        if len(transcript_paths) == 1:
+            return [self.get_timetable(audio_file_path, transcript_paths[0])]
+
+        return run_sync(self._get_timetables_async(audio_file_path, transcript_paths))
+
+    def get_timetable_from_data(self, audio_data, transcript_data, audio_duration, audio_file_name="audio.wav"):
+        """
+        Method that gets the timetable of audio and a transcript that are already in memory, e.g. a window of a longer
+        audio file and a slice of its transcript. The pooled client is used if it is open (see `open_client()`).
+
+        Args:
+            audio_data (bytes):
+                Contents of the audio file.
+
+            transcript_data (bytes):
+                Contents of the transcript.
+
+            audio_duration (float):
+                Duration of the audio in seconds.
+
+            audio_file_name (str):
+                File name to upload the audio as.
+                (Default = "audio.wav")
+
+        Returns:
+            list[dict]:
+                The timetable which only contains the words and the times when those words were said.
+        """
 
-        # Get all the words and their related data points
-        words = raw_timetable["words"]  # This is a list of dictionaries
+        client = self._client
+        if client is not None:
+            return asyncio.run_coroutine_threadsafe(
+                client.align(audio_data, transcript_data, audio_duration=audio_duration,
+                             audio_file_name=audio_file_name),
+                self._client_loop
+            ).result()
 
-        # Remove the "phones" (phonemes) key from all the words' dictionaries
-        for word in words:
-            word.pop("phones", None)
+        async def __align_helper():
+            """Helper method to assist with the retrieval of the timetable."""
+            async with self.client() as client:
+                return await client.align(audio_data, transcript_data, audio_duration=audio_duration,
+                                          audio_file_name=audio_file_name)
 
-        # Return the processed timetable
-        return words
+        return run_sync(__align_helper())
 
     # Helper Methods
+    def _is_server_up(self, timeout=READINESS_MAX_DELAY):
+        """
+        Helper method that checks whether the gentle server responds to HTTP requests.
+
+        Args:
+            timeout (float):
+                Number of seconds to wait for a response.
+                (Default = READINESS_MAX_DELAY)
+
+        Returns:
+            bool
+        """
+
+        try:
+            with urllib.request.urlopen(self.url, timeout=timeout):
+                return True
+        except urllib.error.HTTPError:
+            return True  # The server responded, even if with an error
+        except (urllib.error.URLError, ConnectionError, socket.timeout):
+            return False
+
+    async def _warm_up_async(self):
+        """
+        Helper method that sends a tiny alignment to the gentle server so that it loads its models.
+        This is an asynchronous method.
+        """
+
+        async with self.client() as client:
+            await client.warm_up()
+
     @staticmethod
     def _run_cmd(cmd, mute_output=True, return_output=True):
         """
@@ -143,9 +368,9 @@ class Gentle:
                 The last line of the console output.
         """
 
-        return self._run_cmd("docker logs gentle-container --tail 1")
+        return self._run_cmd(f"docker logs {self.container_name} --tail 1")
 
-    async def _update_progress_bar(self, audio_duration, refresh_interval=0.5, chunk_len=20, overlap_t=2):
+    async def _update_progress_bar(self, audio_duration, refresh_interval=0.5, chunk_len=None, overlap_t=None):
         """
         Helper method to update the progress bar on the progress of the timetable creation.
 
@@ -159,15 +384,20 @@ class Gentle:
 
             chunk_len (int):
                 The length of each chunk.
-                Match this with Gentle's value.
-                (Default = 20)
+                Match this with Gentle's value. Use `None` to use the value from the tuning profile (20 by default).
+                (Default = None)
 
             overlap_t (int):
                 Overlap time.
-                Match this with Gentle's value.
-                (Default = 2)
+                Match this with Gentle's value. Use `None` to use the value from the tuning profile (2 by default).
+                (Default = None)
         """
 
+        # Get the chunking of the gentle server from the tuning profile, if needed
+        settings = load_backend_settings("gentle")
+        chunk_len = chunk_len or settings["chunk_duration"]
+        overlap_t = overlap_t if overlap_t is not None else settings["chunk_overlap"]
+
         # Calculate the number of chunks, which is the value of `total`
         # Note: this is based off of https://github.com/lowerquality/gentle/blob/master/gentle/transcriber.py#L20
         total = int(math.ceil(audio_duration / float(chunk_len - overlap_t)))
@@ -202,9 +432,9 @@ class Gentle:
         progress_bar.n = total
         progress_bar.refresh()
 
-    async def _get_raw_timetable_async(self, audio_file_path, transcript_path, refresh_interval=0.5):
+    async def _get_timetable_async(self, audio_file_path, transcript_path, refresh_interval=0.5):
         """
-        Helper method that gets the raw timetable from the gentle server.
+        Helper method that gets the timetable from the gentle server while updating the progress bar.
         This is an asynchronous method.
 
         Args:
@@ -219,7 +449,7 @@ class Gentle:
                 (Default = 0.5)
 
         Returns:
-            dict:
+            list[dict]:
                 The timetable.
 
         Raises:
@@ -237,75 +467,58 @@ class Gentle:
             raise FileNotFoundError(f"The transcript cannot be found at the path '{transcript_path}'.")
 
         # Get the duration of the audio file
-        wav_obj = wave.open(audio_file_path, "rb")
-        duration = wav_obj.getnframes() / float(wav_obj.getframerate())
-
-        # Generate the `files` dictionary
-        files = {
-            "audio": open(audio_file_path, "rb"),
-            "transcript": open(transcript_path, "rb"),
-        }
+        duration = get_audio_duration(audio_file_path)
 
         # Create the progress bar task
         progress_bar_task = asyncio.create_task(self._update_progress_bar(duration, refresh_interval=refresh_interval))
 
-        # Create the file passing task
-        async def __request_post_helper():
-            """Helper method to assist with the retrieval of the timetable."""
-            # Define the timeout duration
-            timeout = ClientTimeout(total=duration * 2.5)  # Make the timeout twice as long as the video file
-
-            # Define an asynchronous client session object
-            async with ClientSession(timeout=timeout) as session:
-                # Try to make a post request to the gentle server
-                try:
-                    async with session.post(url="http://localhost:8765/transcriptions?async=false",
-                                            data=files) as response:
-                        return await response.json()  # Return whatever is sent back by the server
-                except ServerDisconnectedError:
-                    # Something went wrong; report as an error message
-                    raise ConnectionError("The server disconnected from the program. Please try again.")
-
-        file_passing_task = asyncio.create_task(__request_post_helper())
-
-        # Wait for completion of the file processing task
+        # Get the timetable
         try:
-            timetable_json = await file_passing_task
-        except ClientResponseError:
-            raise Exception("Something went wrong on the gentle server.")
+            async with self.client() as client:
+                timetable = await client.align(audio_file_path, transcript_path, audio_duration=duration)
+        except BaseException:
+            progress_bar_task.cancel()
+            raise
 
         # Await the completion of the progress bar task
         await progress_bar_task
 
         # Return the timetable
-        return timetable_json
+        return timetable
 
-    def _get_raw_timetable(self, audio_file_path, transcript_path, refresh_interval=0.5):
+    async def _get_timetables_async(self, audio_file_path, transcript_paths):
         """
-        Helper method that gets the raw timetable from the gentle server.
+        Helper method that gets the timetables of several transcripts from the gentle server.
+        This is an asynchronous method.
 
         Args:
             audio_file_path (str):
                 Path to the audio file.
 
-            transcript_path (str):
-                Path to the transcript.
-
-            refresh_interval (float):
-                Duration in seconds to wait before refreshing the progress bar.
-                (Default = 0.1)
+            transcript_paths (list[str]):
+                Paths to the transcripts.
 
         Returns:
-            dict:
-                The timetable.
+            list[list[dict]]:
+                The timetables, in the same order as `transcript_paths`.
 
         Raises:
             FileNotFoundError:
-                If either the audio file or the transcript cannot be found.
+                If either the audio file or any of the transcripts cannot be found.
+
+            Exception:
+                If something went wrong in the gentle server.
         """
 
-        return asyncio.run(self._get_raw_timetable_async(audio_file_path, transcript_path,
-                                                         refresh_interval=refresh_interval))
+        # The console output of concurrent jobs is interleaved, so only track the number of completed transcripts
+        progress_bar = tqdm(desc="Creating Timetables From Audio and Transcripts", total=len(transcript_paths))
+
+        try:
+            async with self.client() as client:
+                return await client.align_many(audio_file_path, transcript_paths,
+                                               on_aligned=lambda: progress_bar.update(1))
+        finally:
+            progress_bar.close()
 
 
 # TESTING CODE
@@ -2,7 +2,7 @@
 get_timetable.py
 
 Created on 2021-05-02
-Updated on 2021-05-03
+Updated on 2026-10-19
 
 Copyright © Ryan Kan
 
@@ -12,11 +12,11 @@ Description: Gets the timetable of spoken words from the audio file.
 # IMPORTS
 import os
 
-from src.gentle_interface.gentle import Gentle
+from src import alignment_backends  # Not importing names, since the gentle backend imports this package
 
 
 # FUNCTIONS
-def get_timetable(audio_file_path, transcript_path, refresh_interval=0.5):
+def get_timetable(audio_file_path, transcript_path, refresh_interval=0.5, backend="gentle", fallback_backend=None):
     """
     Gets the timetable of spoken words from the audio file and transcript file.
 
@@ -28,8 +28,17 @@ def get_timetable(audio_file_path, transcript_path, refresh_interval=0.5):
             Path to the transcript.
 
         refresh_interval (float):
-            Duration in seconds to wait before refreshing the progress bar.
-            (Default = 0.1)
+            Duration in seconds to wait before refreshing the progress bar. Only used by the gentle backend.
+            (Default = 0.5)
+
+        backend (str):
+            Name of the alignment backend to use.
+            (Default = "gentle")
+
+        fallback_backend (str):
+            Name of the alignment backend to align the words that `backend` failed to align with. If `backend` fails
+            entirely, the whole transcript is aligned with this backend instead. Use `None` to not have a fallback.
+            (Default = None)
 
     Returns:
         list[dict]:
@@ -40,26 +49,151 @@ def get_timetable(audio_file_path, transcript_path, refresh_interval=0.5):
             If either the audio file or the transcript cannot be found.
     """
 
+    return get_timetables(audio_file_path, [transcript_path], refresh_interval=refresh_interval, backend=backend,
+                          fallback_backend=fallback_backend)[0]
+
+
+def get_timetables(audio_file_path, transcript_paths, refresh_interval=0.5, backend="gentle", fallback_backend=None):
+    """
+    Gets the timetables of spoken words from one audio file and several transcript files.
+
+    The audio file is decoded and probed once, and all the transcripts are aligned against it concurrently.
+
+    Args:
+        audio_file_path (str):
+            Path to the audio file.
+
+        transcript_paths (list[str]):
+            Paths to the transcripts.
+
+        refresh_interval (float):
+            Duration in seconds to wait before refreshing the progress bar. Only used by the gentle backend.
+            (Default = 0.5)
+
+        backend (str):
+            Name of the alignment backend to use.
+            (Default = "gentle")
+
+        fallback_backend (str):
+            Name of the alignment backend to align the words that `backend` failed to align with. If `backend` fails
+            entirely, the whole transcripts are aligned with this backend instead. Use `None` to not have a fallback.
+            (Default = None)
+
+    Returns:
+        list[list[dict]]:
+            The timetables of spoken words, in the same order as `transcript_paths`.
+
+    Raises:
+        FileNotFoundError:
+            If either the audio file or any of the transcripts cannot be found.
+    """
+
     # Check if the files exist
     if not os.path.isfile(audio_file_path):
         raise FileNotFoundError(f"The audio file cannot be found at the path '{audio_file_path}'.")
-    if not os.path.isfile(transcript_path):
-        raise FileNotFoundError(f"The transcript cannot be found at the path '{transcript_path}'.")
 
-    # Create a `Gentle` object
-    gentle = Gentle()
+    for transcript_path in transcript_paths:
+        if not os.path.isfile(transcript_path):
+            raise FileNotFoundError(f"The transcript cannot be found at the path '{transcript_path}'.")
+
+    # Create the backends
+    primary = create_backend(backend, refresh_interval=refresh_interval)
+    fallback = create_backend(fallback_backend) if fallback_backend is not None else None
+
+    # Start the primary backend and get the timetables
+    try:
+        with primary:
+            return align_transcripts(primary, audio_file_path, transcript_paths, fallback=fallback)
+    except Exception as e:
+        if fallback is None:
+            raise
+
+        # The primary backend failed entirely, so align everything with the fallback backend
+        print(f"The '{backend}' backend failed ({e}); aligning with the '{fallback_backend}' backend instead.")
+        with fallback:
+            return fallback.get_timetables(audio_file_path, transcript_paths)
+
+
+def create_backend(backend, refresh_interval=0.5, warm_up=False, **gentle_kwargs):
+    """
+    Creates an alignment backend given its name, passing the gentle-specific options only to the gentle backend.
+
+    Args:
+        backend (str):
+            Name of the alignment backend.
+
+        refresh_interval (float):
+            Duration in seconds to wait before refreshing the progress bar.
+            (Default = 0.5)
+
+        warm_up (bool):
+            Whether the gentle server should be sent a tiny alignment once it is up.
+            (Default = False)
+
+        **gentle_kwargs:
+            Keyword arguments that are passed to the `Gentle` object, such as the port and container of the server.
+
+    Returns:
+        AlignmentBackend
+    """
+
+    if backend == "gentle":
+        return alignment_backends.get_backend(backend, refresh_interval=refresh_interval, warm_up=warm_up,
+                                              **gentle_kwargs)
+
+    return alignment_backends.get_backend(backend)
+
+
+def align_transcripts(backend, audio_file_path, transcript_paths, fallback=None, refine=False):
+    """
+    Aligns the transcripts against the audio file using a backend that has already been started.
+
+    Args:
+        backend (AlignmentBackend):
+            The started alignment backend.
+
+        audio_file_path (str):
+            Path to the audio file.
+
+        transcript_paths (list[str]):
+            Paths to the transcripts.
+
+        fallback (AlignmentBackend):
+            The backend to align the words that `backend` failed to align with. It is started and stopped by this
+            function. Use `None` to not have a fallback.
+            (Default = None)
+
+        refine (bool):
+            Whether the regions that are dense with unaligned words should be re-aligned with `backend` before
+            falling back on `fallback`.
+            (Default = False)
+
+    Returns:
+        list[list[dict]]:
+            The timetables of spoken words, in the same order as `transcript_paths`.
+    """
+
+    # Get the timetables
+    timetables = backend.get_timetables(audio_file_path, transcript_paths)
 
-    # Start the gentle container
-    gentle.start_gentle_container()
+    # Re-align the regions that the backend lost track of, using only the audio and transcript around them
+    if refine:
+        for transcript_path, timetable in zip(transcript_paths, timetables):
+            with open(transcript_path, "r") as f:
+                statistics = alignment_backends.refine_timetable(timetable, audio_file_path, f.read(), backend)
 
-    # Get the timetable
-    timetable = gentle.get_timetable(audio_file_path, transcript_path, refresh_interval=refresh_interval)
+            print(f"Re-aligned {statistics['regions']} region(s) of '{transcript_path}' using "
+                  f"{statistics['audio_seconds']:.1f}s of audio; {statistics['words']} more word(s) were aligned.")
 
-    # Stop the gentle container
-    gentle.stop_gentle_container()
+    # Align the words that the backend failed to align
+    if fallback is not None:
+        with fallback:
+            for transcript_path, timetable in zip(transcript_paths, timetables):
+                with open(transcript_path, "r") as f:
+                    alignment_backends.fill_unaligned_words(timetable, audio_file_path, f.read(), fallback)
 
-    # Return the timetable
-    return timetable
+    # Return the timetables
+    return timetables
 
 
 # TESTING CODE
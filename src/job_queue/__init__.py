@@ -0,0 +1,2 @@
+from .sqlite_queue import DEFAULT_LEASE_DURATION, generate_worker_id, JobQueue
+from .worker import process_job, run_worker
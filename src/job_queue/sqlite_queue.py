@@ -0,0 +1,401 @@
+"""
+sqlite_queue.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: A queue of captioning jobs stored in an SQLite database, which workers on several machines claim jobs from
+             using leases.
+
+Notes:
+    - The database uses SQLite's default rollback journal rather than WAL, because WAL needs shared memory and so does
+      not work on network file systems.
+    - Every state change happens inside a `BEGIN IMMEDIATE` transaction, which takes the database's write lock, so two
+      workers can never claim the same job.
+"""
+
+# IMPORTS
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+# CONSTANTS
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    media_file TEXT NOT NULL,
+    transcript_files TEXT NOT NULL,
+    output_file_name TEXT NOT NULL,
+    options TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    worker TEXT,
+    lease_expires REAL,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, id);
+"""
+
+JOB_STATUSES = ("pending", "leased", "done", "failed")
+DEFAULT_LEASE_DURATION = 300  # Seconds that a claimed job stays leased without a heartbeat
+BUSY_TIMEOUT = 60  # Seconds to wait for another worker to release the database's write lock
+
+
+# FUNCTIONS
+def generate_worker_id():
+    """
+    Generates an ID that is unique to this worker process.
+
+    Returns:
+        str
+    """
+
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+# CLASS
+class JobQueue:
+    """
+    A lease-based queue of captioning jobs, stored in an SQLite database.
+    """
+
+    # Dunder methods
+    def __init__(self, path, lease_duration=DEFAULT_LEASE_DURATION):
+        """
+        Initialisation method.
+
+        Args:
+            path (str):
+                Path to the SQLite database. It is created if it does not exist.
+
+            lease_duration (float):
+                Number of seconds that a claimed job stays leased without a heartbeat. After that, the job is reclaimed
+                for another worker.
+                (Default = DEFAULT_LEASE_DURATION)
+        """
+
+        self.path = path
+        self.lease_duration = lease_duration
+
+        # Autocommit mode, so that transactions are only opened explicitly
+        self._connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None,
+                                           check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.executescript(SCHEMA)
+
+        # The connection is shared with the heartbeat thread, so only one transaction may be open at a time
+        self._lock = threading.RLock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # Methods
+    def close(self):
+        """
+        Method that closes the connection to the database.
+        """
+
+        self._connection.close()
+
+    def enqueue(self, media_file, transcript_files, output_file_name, options=None, max_attempts=3):
+        """
+        Method that adds a job to the queue.
+
+        Args:
+            media_file (str):
+                Path to the video or audio file. Must be reachable from every worker.
+
+            transcript_files (list[str]):
+                Paths to the transcripts. Must be reachable from every worker.
+
+            output_file_name (str):
+                Name of the output file(s), without the extension.
+
+            options (dict):
+                Options of the captioning process, such as the backend and the caption type.
+                (Default = None)
+
+            max_attempts (int):
+                Number of times the job is tried before it is marked as failed.
+                (Default = 3)
+
+        Returns:
+            int:
+                The ID of the job.
+        """
+
+        with self._transaction():
+            cursor = self._connection.execute(
+                "INSERT INTO jobs (media_file, transcript_files, output_file_name, options, max_attempts, created) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (media_file, json.dumps(list(transcript_files)), output_file_name, json.dumps(options or {}),
+                 max_attempts, time.time())
+            )
+            return cursor.lastrowid
+
+    def claim(self, worker_id):
+        """
+        Method that atomically leases the oldest pending job to a worker.
+
+        Jobs whose leases have expired (e.g. because their worker crashed) are reclaimed first.
+
+        Args:
+            worker_id (str):
+                ID of the worker.
+
+        Returns:
+            union[dict, None]:
+                The job, or `None` if there are no pending jobs.
+        """
+
+        now = time.time()
+
+        with self._transaction():
+            self._reclaim_expired_leases(now)
+
+            row = self._connection.execute(
+                "SELECT id FROM jobs WHERE status = 'pending' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._connection.execute(
+                "UPDATE jobs SET status = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1, "
+                "started = ?, error = NULL WHERE id = ?",
+                (worker_id, now + self.lease_duration, now, row["id"])
+            )
+
+            return self.get_job(row["id"])
+
+    def heartbeat(self, job_id, worker_id):
+        """
+        Method that extends the lease of a job.
+
+        Args:
+            job_id (int):
+                ID of the job.
+
+            worker_id (str):
+                ID of the worker that holds the lease.
+
+        Returns:
+            bool:
+                Whether the worker still holds the lease. If not, the job was reclaimed and should be abandoned.
+        """
+
+        with self._transaction():
+            cursor = self._connection.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND worker = ? AND status = 'leased'",
+                (time.time() + self.lease_duration, job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id, worker_id, result):
+        """
+        Method that records the result of a job and marks it as done.
+
+        Args:
+            job_id (int):
+                ID of the job.
+
+            worker_id (str):
+                ID of the worker that holds the lease.
+
+            result:
+                The result of the job. Must be serialisable as JSON.
+
+        Returns:
+            bool:
+                Whether the worker still held the lease, i.e. whether the result was recorded.
+        """
+
+        with self._transaction():
+            cursor = self._connection.execute(
+                "UPDATE jobs SET status = 'done', finished = ?, result = ?, lease_expires = NULL "
+                "WHERE id = ? AND worker = ? AND status = 'leased'",
+                (time.time(), json.dumps(result), job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id, worker_id, error):
+        """
+        Method that records the error of a job. The job is retried unless it has used up its attempts.
+
+        Args:
+            job_id (int):
+                ID of the job.
+
+            worker_id (str):
+                ID of the worker that holds the lease.
+
+            error (str):
+                Description of the error.
+
+        Returns:
+            bool:
+                Whether the worker still held the lease, i.e. whether the error was recorded.
+        """
+
+        with self._transaction():
+            cursor = self._connection.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END, "
+                "worker = NULL, lease_expires = NULL, finished = ?, error = ? "
+                "WHERE id = ? AND worker = ? AND status = 'leased'",
+                (time.time(), error, job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def get_job(self, job_id):
+        """
+        Method that gets a job by its ID.
+
+        Args:
+            job_id (int):
+                ID of the job.
+
+        Returns:
+            union[dict, None]:
+                The job, or `None` if it does not exist.
+        """
+
+        with self._lock:
+            row = self._connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row is not None else None
+
+    def get_jobs(self, status=None):
+        """
+        Method that gets all the jobs, optionally only those with a given status.
+
+        Args:
+            status (str):
+                The status of the jobs to get. Use `None` to get all the jobs.
+                (Default = None)
+
+        Returns:
+            list[dict]
+        """
+
+        with self._lock:
+            if status is None:
+                rows = self._connection.execute("SELECT * FROM jobs ORDER BY id").fetchall()
+            else:
+                rows = self._connection.execute("SELECT * FROM jobs WHERE status = ? ORDER BY id",
+                                                (status,)).fetchall()
+
+        return [self._row_to_job(row) for row in rows]
+
+    def count_jobs(self):
+        """
+        Method that counts the jobs with each status.
+
+        Returns:
+            dict[str, int]
+        """
+
+        counts = {status: 0 for status in JOB_STATUSES}
+
+        with self._lock:
+            rows = self._connection.execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status").fetchall()
+
+        for row in rows:
+            counts[row["status"]] = row["count"]
+
+        return counts
+
+    # Helper methods
+    def _transaction(self):
+        """
+        Helper method that opens a transaction which holds the database's write lock until it ends.
+
+        Returns:
+            _ImmediateTransaction
+        """
+
+        return _ImmediateTransaction(self._connection, self._lock)
+
+    def _reclaim_expired_leases(self, now):
+        """
+        Helper method that returns the jobs whose leases have expired to the queue, or marks them as failed if they have
+        used up their attempts. Must be called inside a transaction.
+
+        Args:
+            now (float):
+                The current time.
+        """
+
+        self._connection.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END, "
+            "error = 'The lease of worker ' || worker || ' expired.', worker = NULL, lease_expires = NULL "
+            "WHERE status = 'leased' AND lease_expires < ?",
+            (now,)
+        )
+
+    @staticmethod
+    def _row_to_job(row):
+        """
+        Helper method that converts a row of the jobs table into a job dictionary.
+
+        Args:
+            row (sqlite3.Row)
+
+        Returns:
+            dict
+        """
+
+        job = dict(row)
+        job["transcript_files"] = json.loads(job["transcript_files"])
+        job["options"] = json.loads(job["options"])
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+
+        return job
+
+
+class _ImmediateTransaction:
+    """
+    Context manager for a transaction that takes the database's write lock as soon as it begins.
+    """
+
+    # Dunder methods
+    def __init__(self, connection, lock):
+        """
+        Initialisation method.
+
+        Args:
+            connection (sqlite3.Connection):
+                The connection to open the transaction on.
+
+            lock (threading.RLock):
+                The lock that guards the connection within this process.
+        """
+
+        self.connection = connection
+        self.lock = lock
+
+    def __enter__(self):
+        self.lock.acquire()
+
+        try:
+            self.connection.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self.lock.release()
+            raise
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            self.connection.execute("COMMIT" if exc_type is None else "ROLLBACK")
+        finally:
+            self.lock.release()
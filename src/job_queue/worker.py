@@ -0,0 +1,174 @@
+"""
+worker.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: The loop that a worker node runs to claim captioning jobs from a job queue and process them.
+"""
+
+# IMPORTS
+import threading
+import time
+import traceback
+
+from src.job_queue.sqlite_queue import generate_worker_id
+from src.metrics import REGISTRY
+from src.pipeline import caption_media
+
+# CONSTANTS
+JOBS_PROCESSED = REGISTRY.counter("video_to_captions_queue_jobs_processed_total",
+                                  "Number of queued jobs processed by this worker, by outcome.",
+                                  label_names=("outcome",))
+JOBS_IN_QUEUE = REGISTRY.gauge("video_to_captions_queue_jobs", "Number of jobs in the queue, by status.",
+                               label_names=("status",))
+
+
+# CLASS
+class Heartbeat(threading.Thread):
+    """
+    Background thread that keeps extending the lease of a job while it is being processed.
+    """
+
+    # Dunder methods
+    def __init__(self, queue, job_id, worker_id, interval):
+        """
+        Initialisation method.
+
+        Args:
+            queue (JobQueue):
+                The job queue.
+
+            job_id (int):
+                ID of the job.
+
+            worker_id (str):
+                ID of the worker that holds the lease.
+
+            interval (float):
+                Number of seconds between heartbeats.
+        """
+
+        super().__init__(daemon=True)
+
+        self.queue = queue
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.interval = interval
+
+        self._stop_event = threading.Event()
+
+    # Methods
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            if not self.queue.heartbeat(self.job_id, self.worker_id):
+                break  # The job was reclaimed; its result will be discarded when it finishes
+
+    def stop(self):
+        """
+        Method that stops the heartbeats and waits for the thread to finish.
+        """
+
+        self._stop_event.set()
+        self.join()
+
+
+# FUNCTIONS
+def process_job(job):
+    """
+    Captions the video or audio file of a job.
+
+    Args:
+        job (dict):
+            The job, as returned by `JobQueue.claim`.
+
+    Returns:
+        dict:
+            The result of the job.
+    """
+
+    start_time = time.time()
+    output_paths = caption_media(job["media_file"], job["transcript_files"], output_file_name=job["output_file_name"],
+                                 wav_file_name=f"audio_job_{job['id']}", **job["options"])
+
+    return {"output_files": output_paths, "duration": time.time() - start_time}
+
+
+def run_worker(queue, worker_id=None, poll_interval=5, exit_when_empty=False):
+    """
+    Claims and processes jobs from the queue until interrupted.
+
+    Args:
+        queue (JobQueue):
+            The job queue.
+
+        worker_id (str):
+            ID of this worker. Use `None` to generate one.
+            (Default = None)
+
+        poll_interval (float):
+            Number of seconds to wait before checking again when the queue has no pending jobs.
+            (Default = 5)
+
+        exit_when_empty (bool):
+            Whether to return once the queue has no pending jobs, rather than waiting for more.
+            (Default = False)
+
+    Returns:
+        int:
+            Number of jobs that were processed.
+    """
+
+    worker_id = worker_id or generate_worker_id()
+    num_processed = 0
+
+    print(f"Worker '{worker_id}' is processing jobs from '{queue.path}'...")
+    while True:
+        # Record the depth of the queue
+        for status, count in queue.count_jobs().items():
+            JOBS_IN_QUEUE.set(count, status=status)
+
+        # Claim the next job
+        job = queue.claim(worker_id)
+
+        if job is None:
+            if exit_when_empty:
+                break
+
+            time.sleep(poll_interval)
+            continue
+
+        print(f"Processing job {job['id']} ('{job['media_file']}', attempt {job['attempts']})...")
+
+        # Process the job, keeping its lease alive in the background
+        heartbeat = Heartbeat(queue, job["id"], worker_id, queue.lease_duration / 3)
+        heartbeat.start()
+
+        try:
+            result = process_job(job)
+        except Exception as e:
+            heartbeat.stop()
+            queue.fail(job["id"], worker_id, f"{type(e).__name__}: {e}\n{traceback.format_exc()}")
+
+            JOBS_PROCESSED.inc(outcome="failure")
+            print(f"Job {job['id']} failed: {e}")
+        except BaseException:
+            # Interrupted; give the job back straight away rather than waiting for its lease to expire
+            heartbeat.stop()
+            queue.fail(job["id"], worker_id, "The worker was interrupted.")
+            raise
+        else:
+            heartbeat.stop()
+
+            if queue.complete(job["id"], worker_id, result):
+                JOBS_PROCESSED.inc(outcome="success")
+                print(f"Job {job['id']} done.")
+            else:
+                JOBS_PROCESSED.inc(outcome="lease_lost")
+                print(f"Job {job['id']} was reclaimed by another worker before it finished; its result was discarded.")
+
+        num_processed += 1
+
+    return num_processed
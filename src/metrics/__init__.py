@@ -0,0 +1,3 @@
+from .exporter import start_http_server, write_textfile
+from .registry import Counter, Gauge, Histogram, MetricsRegistry, REGISTRY
+from .stages import track_stage
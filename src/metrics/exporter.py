@@ -0,0 +1,86 @@
+"""
+exporter.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Exposes the metrics in the Prometheus text format, either as a text file or over HTTP.
+"""
+
+# IMPORTS
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.metrics.registry import REGISTRY
+
+# CONSTANTS
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# FUNCTIONS
+def write_textfile(path, registry=REGISTRY):
+    """
+    Writes the metrics to a text file, e.g. for the node exporter's textfile collector.
+
+    The file is replaced atomically so that it is never read half-written.
+
+    Args:
+        path (str):
+            Path to the text file.
+
+        registry (MetricsRegistry):
+            The registry to export.
+            (Default = REGISTRY)
+    """
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+
+    with open(temp_path, "w") as f:
+        f.write(registry.to_prometheus_text())
+
+    os.replace(temp_path, path)
+
+
+def start_http_server(port, host="", registry=REGISTRY):
+    """
+    Starts an HTTP server in a background thread that serves the metrics at every path.
+
+    Args:
+        port (int):
+            Port to listen on.
+
+        host (str):
+            Address to listen on. An empty string listens on all interfaces.
+            (Default = "")
+
+        registry (MetricsRegistry):
+            The registry to export.
+            (Default = REGISTRY)
+
+    Returns:
+        ThreadingHTTPServer:
+            The server. Call its `shutdown` method to stop it.
+    """
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        """Handler that responds to every GET request with the metrics."""
+
+        def do_GET(self):
+            body = registry.to_prometheus_text().encode("utf-8")
+
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Do not clutter the console with the scrapes
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server
@@ -0,0 +1,507 @@
+"""
+registry.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: A thread-safe registry of counters, gauges and histograms that can be exported in the Prometheus text
+             format.
+
+References:
+    - https://prometheus.io/docs/instrumenting/exposition_formats/#text-based-format
+"""
+
+# IMPORTS
+import math
+import threading
+
+# CONSTANTS
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+# HELPER FUNCTIONS
+def format_labels(label_names, label_values, extra=None):
+    """
+    Formats the labels of a sample in the Prometheus text format.
+
+    Args:
+        label_names (tuple[str]):
+            Names of the labels.
+
+        label_values (tuple[str]):
+            Values of the labels.
+
+        extra (tuple[str, str]):
+            An extra label name and value to append, such as the "le" label of histogram buckets.
+            (Default = None)
+
+    Returns:
+        str:
+            The formatted labels, e.g. '{stage="extraction"}', or an empty string if there are no labels.
+    """
+
+    pairs = list(zip(label_names, label_values))
+    if extra is not None:
+        pairs.append(extra)
+
+    if not pairs:
+        return ""
+
+    escaped = [(name, str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n"))
+               for name, value in pairs]
+    return "{" + ",".join(f"{name}=\"{value}\"" for name, value in escaped) + "}"
+
+
+def format_value(value):
+    """
+    Formats a sample's value in the Prometheus text format.
+
+    Args:
+        value (float)
+
+    Returns:
+        str
+    """
+
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+
+    return repr(float(value))
+
+
+# CLASSES
+class Metric:
+    """
+    Base class of all the metrics.
+    """
+
+    # Attributes
+    type_name = None
+
+    # Dunder methods
+    def __init__(self, name, documentation, label_names=()):
+        """
+        Initialisation method.
+
+        Args:
+            name (str):
+                Name of the metric.
+
+            documentation (str):
+                Description of the metric.
+
+            label_names (tuple[str]):
+                Names of the labels of the metric.
+                (Default = ())
+        """
+
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+
+        self._lock = threading.Lock()
+        self._values = {}  # Maps the label values to the value(s) of the metric
+
+    # Methods
+    def to_prometheus_text(self):
+        """
+        Method that formats the metric in the Prometheus text format.
+
+        Returns:
+            str
+        """
+
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines += self._format_samples(label_values, value)
+
+        return "\n".join(lines) + "\n"
+
+    # Helper methods
+    def _get_label_values(self, labels):
+        """
+        Helper method that converts the labels into a key of `self._values`.
+
+        Args:
+            labels (dict[str, str]):
+                The labels.
+
+        Returns:
+            tuple[str]
+
+        Raises:
+            AssertionError:
+                If the labels do not match the metric's label names.
+        """
+
+        assert set(labels) == set(self.label_names), f"The metric '{self.name}' requires the labels " \
+                                                     f"{list(self.label_names)}, but got {list(labels)}."
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _format_samples(self, label_values, value):
+        """
+        Helper method that formats the samples of one set of label values.
+
+        Args:
+            label_values (tuple[str]):
+                Values of the labels.
+
+            value:
+                The value(s) stored for those labels.
+
+        Returns:
+            list[str]
+        """
+
+        return [f"{self.name}{format_labels(self.label_names, label_values)} {format_value(value)}"]
+
+
+class Counter(Metric):
+    """
+    A metric whose value only goes up.
+    """
+
+    # Attributes
+    type_name = "counter"
+
+    # Methods
+    def inc(self, amount=1, **labels):
+        """
+        Method that increases the counter.
+
+        Args:
+            amount (float):
+                Amount to increase the counter by. Must not be negative.
+                (Default = 1)
+
+            **labels:
+                Labels of the counter.
+
+        Raises:
+            AssertionError:
+                If `amount` is negative.
+        """
+
+        assert amount >= 0, "A counter can only be increased."
+        label_values = self._get_label_values(labels)
+
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def get(self, **labels):
+        """
+        Method that gets the value of the counter.
+
+        Args:
+            **labels:
+                Labels of the counter.
+
+        Returns:
+            float
+        """
+
+        with self._lock:
+            return self._values.get(self._get_label_values(labels), 0)
+
+
+class Gauge(Metric):
+    """
+    A metric whose value can go up and down.
+    """
+
+    # Attributes
+    type_name = "gauge"
+
+    # Methods
+    def set(self, value, **labels):
+        """
+        Method that sets the value of the gauge.
+
+        Args:
+            value (float):
+                The new value.
+
+            **labels:
+                Labels of the gauge.
+        """
+
+        label_values = self._get_label_values(labels)
+
+        with self._lock:
+            self._values[label_values] = value
+
+    def inc(self, amount=1, **labels):
+        """
+        Method that increases the gauge.
+
+        Args:
+            amount (float):
+                Amount to increase the gauge by.
+                (Default = 1)
+
+            **labels:
+                Labels of the gauge.
+        """
+
+        label_values = self._get_label_values(labels)
+
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        """
+        Method that decreases the gauge.
+
+        Args:
+            amount (float):
+                Amount to decrease the gauge by.
+                (Default = 1)
+
+            **labels:
+                Labels of the gauge.
+        """
+
+        self.inc(-amount, **labels)
+
+    def get(self, **labels):
+        """
+        Method that gets the value of the gauge.
+
+        Args:
+            **labels:
+                Labels of the gauge.
+
+        Returns:
+            float
+        """
+
+        with self._lock:
+            return self._values.get(self._get_label_values(labels), 0)
+
+
+class Histogram(Metric):
+    """
+    A metric that counts observations into cumulative buckets.
+    """
+
+    # Attributes
+    type_name = "histogram"
+
+    # Dunder methods
+    def __init__(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        """
+        Initialisation method.
+
+        Args:
+            name (str):
+                Name of the metric.
+
+            documentation (str):
+                Description of the metric.
+
+            label_names (tuple[str]):
+                Names of the labels of the metric.
+                (Default = ())
+
+            buckets (tuple[float]):
+                Upper bounds of the buckets, in increasing order. The "+Inf" bucket is added automatically.
+                (Default = DEFAULT_BUCKETS)
+        """
+
+        super().__init__(name, documentation, label_names=label_names)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    # Methods
+    def observe(self, value, **labels):
+        """
+        Method that records an observation.
+
+        Args:
+            value (float):
+                The observed value.
+
+            **labels:
+                Labels of the histogram.
+        """
+
+        label_values = self._get_label_values(labels)
+
+        with self._lock:
+            bucket_counts, total = self._values.get(label_values, ([0] * len(self.buckets), 0))
+
+            for i, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    bucket_counts[i] += 1
+
+            self._values[label_values] = (bucket_counts, total + value)
+
+    def get_count(self, **labels):
+        """
+        Method that gets the number of observations.
+
+        Args:
+            **labels:
+                Labels of the histogram.
+
+        Returns:
+            int
+        """
+
+        with self._lock:
+            bucket_counts, _ = self._values.get(self._get_label_values(labels), ([0] * len(self.buckets), 0))
+            return bucket_counts[-1]
+
+    # Helper methods
+    def _format_samples(self, label_values, value):
+        bucket_counts, total = value
+
+        lines = []
+        for upper_bound, count in zip(self.buckets, bucket_counts):
+            labels = format_labels(self.label_names, label_values, extra=("le", format_value(upper_bound)))
+            lines.append(f"{self.name}_bucket{labels} {format_value(count)}")
+
+        labels = format_labels(self.label_names, label_values)
+        lines.append(f"{self.name}_sum{labels} {format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {format_value(bucket_counts[-1])}")
+
+        return lines
+
+
+class MetricsRegistry:
+    """
+    A collection of metrics, identified by their names.
+    """
+
+    # Dunder methods
+    def __init__(self):
+        """
+        Initialisation method.
+        """
+
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    # Methods
+    def counter(self, name, documentation, label_names=()):
+        """
+        Method that gets the counter with the given name, creating it if it does not exist.
+
+        Args:
+            name (str):
+                Name of the counter.
+
+            documentation (str):
+                Description of the counter.
+
+            label_names (tuple[str]):
+                Names of the labels of the counter.
+                (Default = ())
+
+        Returns:
+            Counter
+        """
+
+        return self._get_or_create(Counter, name, documentation, label_names=label_names)
+
+    def gauge(self, name, documentation, label_names=()):
+        """
+        Method that gets the gauge with the given name, creating it if it does not exist.
+
+        Args:
+            name (str):
+                Name of the gauge.
+
+            documentation (str):
+                Description of the gauge.
+
+            label_names (tuple[str]):
+                Names of the labels of the gauge.
+                (Default = ())
+
+        Returns:
+            Gauge
+        """
+
+        return self._get_or_create(Gauge, name, documentation, label_names=label_names)
+
+    def histogram(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        """
+        Method that gets the histogram with the given name, creating it if it does not exist.
+
+        Args:
+            name (str):
+                Name of the histogram.
+
+            documentation (str):
+                Description of the histogram.
+
+            label_names (tuple[str]):
+                Names of the labels of the histogram.
+                (Default = ())
+
+            buckets (tuple[float]):
+                Upper bounds of the buckets.
+                (Default = DEFAULT_BUCKETS)
+
+        Returns:
+            Histogram
+        """
+
+        return self._get_or_create(Histogram, name, documentation, label_names=label_names, buckets=buckets)
+
+    def to_prometheus_text(self):
+        """
+        Method that formats all the metrics in the Prometheus text format.
+
+        Returns:
+            str
+        """
+
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+
+        return "".join(metric.to_prometheus_text() for metric in metrics)
+
+    # Helper methods
+    def _get_or_create(self, metric_class, name, documentation, **kwargs):
+        """
+        Helper method that gets a metric by its name, creating it if it does not exist.
+
+        Args:
+            metric_class (type):
+                Class of the metric.
+
+            name (str):
+                Name of the metric.
+
+            documentation (str):
+                Description of the metric.
+
+            **kwargs:
+                Keyword arguments that are passed to the metric's initialisation method.
+
+        Returns:
+            Metric
+
+        Raises:
+            AssertionError:
+                If a metric of a different type already has the same name.
+        """
+
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = metric_class(name, documentation, **kwargs)
+
+            metric = self._metrics[name]
+
+        assert isinstance(metric, metric_class), f"The metric '{name}' is already registered as a " \
+                                                 f"{metric.type_name}."
+        return metric
+
+
+# The registry that the whole program records its metrics in
+REGISTRY = MetricsRegistry()
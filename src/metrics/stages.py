@@ -0,0 +1,108 @@
+"""
+stages.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Records the throughput, latency and failures of the stages of the captioning pipeline.
+"""
+
+# IMPORTS
+import time
+from contextlib import contextmanager
+
+from src.metrics.registry import REGISTRY
+
+# CONSTANTS
+STAGE_RUNS = REGISTRY.counter("video_to_captions_stage_runs_total",
+                              "Number of times each pipeline stage was run, by outcome.",
+                              label_names=("stage", "outcome"))
+STAGES_IN_PROGRESS = REGISTRY.gauge("video_to_captions_stages_in_progress",
+                                    "Number of pipeline stages that are currently running.", label_names=("stage",))
+STAGE_WALL_SECONDS = REGISTRY.counter("video_to_captions_stage_wall_seconds_total",
+                                      "Wall-clock seconds spent in each pipeline stage.", label_names=("stage",))
+STAGE_AUDIO_SECONDS = REGISTRY.counter("video_to_captions_stage_audio_seconds_total",
+                                       "Seconds of audio processed by each pipeline stage.", label_names=("stage",))
+STAGE_SECONDS_PER_AUDIO_SECOND = REGISTRY.histogram("video_to_captions_stage_seconds_per_audio_second",
+                                                    "Latency of each pipeline stage divided by the duration of the "
+                                                    "audio it processed.", label_names=("stage",))
+
+
+# CLASSES
+class StageTimer:
+    """
+    Records the audio duration of a running stage, which is often only known part way through the stage.
+    """
+
+    # Dunder methods
+    def __init__(self, stage, audio_duration=None):
+        """
+        Initialisation method.
+
+        Args:
+            stage (str):
+                Name of the stage.
+
+            audio_duration (float):
+                Duration of the audio that the stage processes, in seconds.
+                (Default = None)
+        """
+
+        self.stage = stage
+        self.audio_duration = audio_duration
+        self.start_time = time.perf_counter()
+
+    # Methods
+    def elapsed(self):
+        """
+        Method that gets the number of seconds since the stage started.
+
+        Returns:
+            float
+        """
+
+        return time.perf_counter() - self.start_time
+
+
+# FUNCTIONS
+@contextmanager
+def track_stage(stage, audio_duration=None):
+    """
+    Context manager that records the latency, throughput and outcome of a pipeline stage.
+
+    Set the `audio_duration` attribute of the yielded `StageTimer` if the duration of the audio is not known upfront.
+    The throughput and normalised latency are only recorded if the audio duration is known by the end of the stage.
+
+    Args:
+        stage (str):
+            Name of the stage.
+
+        audio_duration (float):
+            Duration of the audio that the stage processes, in seconds.
+            (Default = None)
+
+    Yields:
+        StageTimer
+    """
+
+    timer = StageTimer(stage, audio_duration=audio_duration)
+    STAGES_IN_PROGRESS.inc(stage=stage)
+
+    try:
+        yield timer
+    except BaseException:
+        STAGE_RUNS.inc(stage=stage, outcome="failure")
+        raise
+    else:
+        STAGE_RUNS.inc(stage=stage, outcome="success")
+    finally:
+        STAGES_IN_PROGRESS.dec(stage=stage)
+
+        elapsed = timer.elapsed()
+        STAGE_WALL_SECONDS.inc(elapsed, stage=stage)
+
+        if timer.audio_duration:
+            STAGE_AUDIO_SECONDS.inc(timer.audio_duration, stage=stage)
+            STAGE_SECONDS_PER_AUDIO_SECOND.observe(elapsed / timer.audio_duration, stage=stage)
@@ -0,0 +1,5 @@
+from .bounded import caption_media_bounded, plan_memory_budget
+from .captioning import caption_media, get_output_file_name
+from .drafting import caption_media_in_background, draft_captions, DRAFT_MODES, find_draft_speech
+from .orchestration import extract_and_align, extract_and_align_async
+from .rendering import CAPTION_TYPE_TO_EXTENSION, iterate_captions, render_captions, write_captions
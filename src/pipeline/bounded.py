@@ -0,0 +1,359 @@
+"""
+bounded.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Runs the whole captioning process on one video or audio file within a memory budget, however long the file
+             is.
+
+Notes:
+    - The usual pipeline holds each stage's whole output in memory: the extracted audio, the backend's response, the
+      timetable, the caption blocks and the captions string. Here the data flows between the stages in bounded pieces
+      instead:
+        1. the audio is streamed out of the file a window at a time (see `open_media_stream`);
+        2. each window is aligned by a `LiveAligner`, so the backend only ever sees (and responds about) one window;
+        3. the committed words are appended to a timetable file on disk by a `TimetableWriter`; and
+        4. the timetable file is memory-mapped, grouped into caption blocks a chunk of words at a time and written to
+           the captions file block by block (see `iterate_captions`).
+    - Only the transcripts are held in memory whole, so the memory used grows with the length of the transcripts but not
+      with the length of the audio.
+"""
+
+# IMPORTS
+import os
+
+from src.conversion import negotiate_audio_format, normalise_transcript
+from src.gentle_interface import create_backend
+from src.pipeline.captioning import get_output_file_name
+from src.pipeline.rendering import iterate_captions, write_captions
+from src.streaming.live_aligner import LiveAligner
+from src.streaming.media_stream import open_media_stream
+from src.timetable_storage import load_timetable, TimetableWriter, WORDS_PER_CHUNK
+from src.workspace import Workspace
+
+# CONSTANTS
+BASE_MEMORY_USAGE = 96 * 2 ** 20  # Rough number of bytes taken by the interpreter and the libraries
+BYTES_PER_TRANSCRIPT_CHARACTER = 48  # Rough number of bytes that each character of a transcript takes up when aligning
+WINDOW_COPIES = 4  # Rough number of copies of a window of audio held at once (buffer, file, request and new frames)
+BYTES_PER_DECODED_WORD = 1024  # Rough number of bytes taken by a timetable word decoded into a dictionary
+
+MIN_WINDOW_DURATION = 60
+MAX_WINDOW_DURATION = 600  # Longer windows barely save any work, since each overlaps the next by only `MAX_LAG`
+MAX_LAG = 10  # Number of seconds before the end of a window after which its words are committed
+MIN_WORDS_PER_CHUNK = 1024
+
+
+# HELPER FUNCTIONS
+def plan_memory_budget(memory_budget, transcript_length, bytes_per_second, max_window_duration=MAX_WINDOW_DURATION):
+    """
+    Splits a memory budget between the stages of the bounded pipeline.
+
+    Args:
+        memory_budget (int):
+            Maximum number of bytes that the process should use.
+
+        transcript_length (int):
+            Total number of characters in the transcripts.
+
+        bytes_per_second (int):
+            Number of bytes per second of the streamed audio.
+
+        max_window_duration (float):
+            The longest window to use, e.g. because the backend's memory grows faster than the window's length. It is
+            never shorter than `MIN_WINDOW_DURATION`.
+            (Default = MAX_WINDOW_DURATION)
+
+    Returns:
+        tuple[float, int]:
+            The number of seconds of audio in each window, and the number of timetable words to decode at a time.
+
+    Raises:
+        AssertionError:
+            If the memory budget is too small to fit the shortest window.
+    """
+
+    # The alignment and the rendering run one after the other, so each may use everything that is left over
+    available = memory_budget - BASE_MEMORY_USAGE - transcript_length * BYTES_PER_TRANSCRIPT_CHARACTER
+    needed = BASE_MEMORY_USAGE + transcript_length * BYTES_PER_TRANSCRIPT_CHARACTER + \
+        MIN_WINDOW_DURATION * WINDOW_COPIES * bytes_per_second
+
+    assert available >= MIN_WINDOW_DURATION * WINDOW_COPIES * bytes_per_second, \
+        f"The memory budget of {memory_budget / 2 ** 20:.0f} MB is too small for these transcripts; at least " \
+        f"{needed / 2 ** 20:.0f} MB is needed."
+
+    window_duration = max(MIN_WINDOW_DURATION, min(max_window_duration, MAX_WINDOW_DURATION,
+                                                   available / (WINDOW_COPIES * bytes_per_second)))
+    words_per_chunk = int(max(MIN_WORDS_PER_CHUNK, min(WORDS_PER_CHUNK, available // BYTES_PER_DECODED_WORD)))
+
+    return window_duration, words_per_chunk
+
+
+# FUNCTIONS
+def caption_media_bounded(video_or_audio_file, transcript_paths, memory_budget, output_file_name="transcript",
+                          backend="gentle", warm_up=False, block_type="sentence", block_duration=5, max_block_length=15,
+                          caption_type="webvtt", save_timetables=False, gentle_options=None, stop_backend=True,
+                          strip_markup=(), markup_patterns=()):
+    """
+    Captions a video or audio file within a memory budget, writing one captions file per transcript.
+
+    The captions are the same as `caption_media`'s, except that the audio is aligned window by window, as by the `live`
+    command. The words at the very end of a transcript that are not found in the audio are spread between the last
+    aligned word and the end of the audio.
+
+    Args:
+        video_or_audio_file (str):
+            Path to the video or audio file.
+
+        transcript_paths (list[str]):
+            Paths to the transcripts.
+
+        memory_budget (int):
+            Maximum number of bytes that the process should use. This is a target for sizing the windows of audio and
+            the chunks of words, not a hard limit.
+
+        output_file_name (str):
+            Name of the output file, without the extension. If there is more than one transcript, the name of each
+            transcript is appended to this name.
+            (Default = "transcript")
+
+        backend (str):
+            Name of the alignment backend to use.
+            (Default = "gentle")
+
+        warm_up (bool):
+            Whether the gentle server should be sent a tiny alignment once it is up.
+            (Default = False)
+
+        block_type (str):
+            How the captions should be grouped. Either "time" or "sentence".
+            (Default = "sentence")
+
+        block_duration (int):
+            The length of time that makes up each block.
+            (Default = 5)
+
+        max_block_length (int):
+            The maximum number of timetabled words that can be in each caption block.
+            (Default = 15)
+
+        caption_type (str):
+            Format of the captions.
+            (Default = "webvtt")
+
+        save_timetables (bool):
+            Whether each timetable should also be saved next to its captions file.
+            (Default = False)
+
+        gentle_options (dict):
+            Keyword arguments for the `Gentle` object, e.g. the port and container of the server to use.
+            (Default = None)
+
+        stop_backend (bool):
+            Whether the backend should be stopped once done.
+            (Default = True)
+
+        strip_markup (tuple[str]):
+            The kinds of markup that is not spoken (e.g. speaker labels) to strip out of the transcripts before
+            alignment. The captions still show the original transcripts.
+            (Default = ())
+
+        markup_patterns (tuple[str]):
+            Regular expressions of other markup to strip out of the transcripts before alignment.
+            (Default = ())
+
+    Returns:
+        list[str]:
+            Paths to the captions files, in the same order as `transcript_paths`.
+
+    Raises:
+        AssertionError:
+            If the memory budget is too small to fit the shortest window.
+
+        FileNotFoundError:
+            If a transcript does not exist or is not found.
+    """
+
+    # Read the transcripts, stripping the markup that is not spoken out of the ones that are aligned
+    transcripts, aligned_transcripts, offset_maps = [], [], []
+
+    for transcript_path in transcript_paths:
+        if not os.path.isfile(transcript_path):
+            raise FileNotFoundError(f"A transcript does not exist at the path '{transcript_path}'.")
+
+        with open(transcript_path, "r") as f:
+            transcripts.append(f.read())
+
+        if strip_markup or markup_patterns:
+            aligned_transcript, offset_map = normalise_transcript(transcripts[-1], markup=strip_markup,
+                                                                  extra_patterns=markup_patterns)
+        else:
+            aligned_transcript, offset_map = transcripts[-1], None
+
+        aligned_transcripts.append(aligned_transcript)
+        offset_maps.append(offset_map)
+
+    output_file_names = [get_output_file_name(output_file_name, transcript_path, len(transcript_paths))
+                         for transcript_path in transcript_paths]
+
+    primary = create_backend(backend, warm_up=warm_up, **(gentle_options or {}))
+    audio_format = negotiate_audio_format([primary.audio_format])
+
+    # The workspace only holds small files (the current windows and the spooled timetables), so keep it on disk
+    with Workspace(prefix="bounded_", prefer_memory=False) as workspace:
+        timetable_paths = [name + ".timetable" if save_timetables else workspace.path(f"timetable_{i}.timetable")
+                           for i, name in enumerate(output_file_names)]
+
+        # Align the audio a window at a time, appending the committed words to the timetable files
+        primary.start()
+
+        try:
+            with open_media_stream(video_or_audio_file, audio_format) as stream:
+                window_duration, words_per_chunk = plan_memory_budget(
+                    memory_budget, sum(len(transcript) for transcript in transcripts),
+                    stream.sample_rate * stream.frame_width,
+                    max_window_duration=getattr(primary, "window_duration", None) or MAX_WINDOW_DURATION
+                )
+
+                aligners = []
+                for i, aligned_transcript in enumerate(aligned_transcripts):
+                    os.makedirs(workspace.path(f"windows_{i}"))  # Separate directories, since backends cache by path
+                    aligners.append(LiveAligner(primary, aligned_transcript, stream.sample_rate, stream.channels,
+                                                stream.sample_width, workspace.path(f"windows_{i}"),
+                                                step_duration=window_duration - 2 * MAX_LAG, max_lag=MAX_LAG,
+                                                max_window_duration=window_duration))
+
+                writers = [TimetableWriter(timetable_path) for timetable_path in timetable_paths]
+
+                try:
+                    while not stream.ended and not all(aligner.finished for aligner in aligners):
+                        frames = stream.read(window_duration - 2 * MAX_LAG)
+
+                        for aligner, writer, offset_map in zip(aligners, writers, offset_maps):
+                            words = aligner.feed(frames)
+                            writer.add_words(offset_map.remap_timetable(words) if offset_map is not None else words)
+
+                    for aligner, writer, offset_map in zip(aligners, writers, offset_maps):
+                        words = aligner.finish()
+                        writer.add_words(offset_map.remap_timetable(words) if offset_map is not None else words)
+                except BaseException:
+                    for writer in writers:
+                        writer.close(discard=True)
+                    raise
+
+                for writer in writers:
+                    writer.close()
+        finally:
+            if stop_backend:
+                primary.stop()
+
+        # Write the captions block by block from the memory-mapped timetables
+        output_paths = []
+
+        for transcript, timetable_path, name in zip(transcripts, timetable_paths, output_file_names):
+            caption_pieces = iterate_captions(transcript, load_timetable(timetable_path), block_type=block_type,
+                                              block_duration=block_duration, max_block_length=max_block_length,
+                                              caption_type=caption_type, words_per_chunk=words_per_chunk)
+            output_paths.append(write_captions(caption_pieces, name, caption_type=caption_type))
+
+    return output_paths
+
+
+# TESTING CODE
+if __name__ == "__main__":
+    # Imports
+    import re
+    import resource
+    import tempfile
+    import time
+    import wave
+
+    import numpy as np
+
+    from src.alignment_backends import AlignmentBackend, BACKENDS
+
+    # Constants
+    SAMPLE_RATE = 8000
+    SECONDS_PER_WORD = 0.4
+    WORD_STRIDE = 9  # Every word of the synthetic transcript takes up 9 characters, e.g. "w000123, "
+    AUDIO_DURATION = 10 * 60 * 60
+    MEMORY_BUDGET = 192 * 2 ** 20
+    RSS_CEILING = MEMORY_BUDGET
+
+    # A stand-in for gentle that knows when each word of the synthetic transcript is said. Every sample of the synthetic
+    # audio holds the second that it is in, so the stand-in can tell where each window starts.
+    class StandInBackend(AlignmentBackend):
+        name = "stand-in"
+
+        def align_region(self, audio_file_path, transcript, start_offset, end_offset, start_time, end_time,
+                         open_end=False):
+            with wave.open(audio_file_path, "rb") as wav_obj:
+                window_duration = wav_obj.getnframes() / SAMPLE_RATE
+                seconds = np.frombuffer(wav_obj.readframes(SAMPLE_RATE + 1), dtype="<i2").astype(np.int64) + 2 ** 15
+
+            first_change = int(np.flatnonzero(np.diff(seconds))[0]) + 1 if len(np.unique(seconds)) > 1 else 0
+            window_start = seconds[first_change] - first_change / SAMPLE_RATE
+
+            words = []
+            for match in re.finditer(r"\w+", transcript[start_offset:end_offset]):
+                word_start = (start_offset + match.start()) // WORD_STRIDE * SECONDS_PER_WORD - window_start
+                word = {"case": "not-found-in-audio", "word": match.group(),
+                        "startOffset": start_offset + match.start(), "endOffset": start_offset + match.end()}
+
+                if 0 <= word_start and word_start + 0.3 <= window_duration:
+                    word.update(case="success", alignedWord=match.group(), start=word_start, end=word_start + 0.3)
+
+                words.append(word)
+
+            return words
+
+    BACKENDS[StandInBackend.name] = StandInBackend
+
+    with tempfile.TemporaryDirectory() as testDir:
+        # Write a synthetic 10-hour input a minute at a time
+        audioPath = os.path.join(testDir, "long.wav")
+        with wave.open(audioPath, "wb") as wavObj:
+            wavObj.setnchannels(1)
+            wavObj.setsampwidth(2)
+            wavObj.setframerate(SAMPLE_RATE)
+
+            for minuteStart in range(0, AUDIO_DURATION, 60):
+                wavObj.writeframes((np.repeat(np.arange(minuteStart, minuteStart + 60), SAMPLE_RATE) -
+                                    2 ** 15).astype("<i2").tobytes())
+
+        # A whole number of sentences, the last two of which run past the end of the audio and so cannot be aligned
+        numAlignedWords = int(AUDIO_DURATION / SECONDS_PER_WORD)
+        numWords = numAlignedWords + 24
+        transcriptPath = os.path.join(testDir, "long.txt")
+        with open(transcriptPath, "w") as f:
+            f.write("".join(f"w{wordNum:06d}" + ("." if wordNum % 12 == 11 else ",") + " "
+                            for wordNum in range(numWords)))
+
+        # Caption it within the memory budget
+        startTime = time.time()
+        outputPaths = caption_media_bounded(audioPath, [transcriptPath], MEMORY_BUDGET,
+                                            output_file_name=os.path.join(testDir, "long"), backend="stand-in",
+                                            save_timetables=True)
+        peakRSS = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # In kilobytes on Linux
+
+        print(f"Captioned {AUDIO_DURATION / 3600:.0f} hours in {time.time() - startTime:.1f}s with a peak RSS of "
+              f"{peakRSS / 2 ** 20:.0f} MB (ceiling: {RSS_CEILING / 2 ** 20:.0f} MB)")
+
+        # Check that every word was committed, that the words that were said were aligned where they are said, and that
+        # the memory stayed within the ceiling
+        longTimetable = load_timetable(os.path.join(testDir, "long.timetable"))
+        assert len(longTimetable) == numWords, f"Only {len(longTimetable)} of {numWords} words were committed."
+        assert np.allclose(longTimetable.columns["start"][:numAlignedWords],
+                           np.arange(numAlignedWords) * SECONDS_PER_WORD, rtol=0, atol=0.01), \
+            "Some words were committed with the wrong timings."
+        assert np.all(np.diff(longTimetable.columns["start"]) >= 0) and \
+            longTimetable.columns["end"][-1] <= AUDIO_DURATION, "The words that were not said are out of place."
+
+        with open(outputPaths[0], "r") as f:
+            sentenceEnds = [word for line in f for word in line.split() if word.endswith(".")]
+        assert sentenceEnds == [f"w{wordNum:06d}." for wordNum in range(11, numWords, 12)], \
+            "Some sentences are missing from the captions."
+
+        assert peakRSS < RSS_CEILING, "The peak RSS went over the ceiling."
@@ -0,0 +1,169 @@
+"""
+captioning.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Runs the whole captioning process on one video or audio file.
+"""
+
+# IMPORTS
+import os
+
+from src.pipeline.orchestration import extract_and_align
+from src.pipeline.rendering import render_captions, write_captions
+from src.timetable_storage import save_timetable
+
+
+# FUNCTIONS
+def get_output_file_name(output_file_name, transcript_path, num_transcripts):
+    """
+    Gets the name of the output file of a transcript.
+
+    Args:
+        output_file_name (str):
+            Name of the output file, without the extension.
+
+        transcript_path (str):
+            Path to the transcript.
+
+        num_transcripts (int):
+            Number of transcripts that are captioned together. If there is more than one, the name of the transcript is
+            appended to the output file's name.
+
+    Returns:
+        str
+    """
+
+    if num_transcripts > 1:
+        return output_file_name + "_" + os.path.splitext(os.path.basename(transcript_path))[0]
+
+    return output_file_name
+
+
+def caption_media(video_or_audio_file, transcript_paths, output_file_name="transcript", wav_file_name="audio",
+                  backend="gentle", fallback_backend=None, warm_up=False, transport_format="wav",
+                  block_type="sentence", block_duration=5, max_block_length=15, caption_type="webvtt",
+                  save_timetables=False, refine=False, gentle_options=None, stop_backend=True, workspace_quota=None,
+                  cut_non_speech=False, deadline=None, strip_markup=(), markup_patterns=()):
+    """
+    Captions a video or audio file, writing one captions file per transcript.
+
+    Args:
+        video_or_audio_file (str):
+            Path to the video or audio file.
+
+        transcript_paths (list[str]):
+            Paths to the transcripts.
+
+        output_file_name (str):
+            Name of the output file, without the extension. If there is more than one transcript, the name of each
+            transcript is appended to this name.
+            (Default = "transcript")
+
+        wav_file_name (str):
+            Name of the temporary extracted audio file in the job's workspace, without the extension. It is removed
+            once done.
+            (Default = "audio")
+
+        backend (str):
+            Name of the alignment backend to use.
+            (Default = "gentle")
+
+        fallback_backend (str):
+            Name of the alignment backend to fall back on. Use `None` to not have a fallback.
+            (Default = None)
+
+        warm_up (bool):
+            Whether the gentle server should be sent a tiny alignment once it is up.
+            (Default = False)
+
+        transport_format (str):
+            The preferred container of the extracted audio.
+            (Default = "wav")
+
+        block_type (str):
+            How the captions should be grouped. Either "time" or "sentence".
+            (Default = "sentence")
+
+        block_duration (int):
+            The length of time that makes up each block.
+            (Default = 5)
+
+        max_block_length (int):
+            The maximum number of timetabled words that can be in each caption block.
+            (Default = 15)
+
+        caption_type (str):
+            Format of the captions.
+            (Default = "webvtt")
+
+        save_timetables (bool):
+            Whether each timetable should also be saved next to its captions file.
+            (Default = False)
+
+        refine (bool):
+            Whether the regions that are dense with unaligned words should be re-aligned by the primary backend.
+            (Default = False)
+
+        gentle_options (dict):
+            Keyword arguments for the `Gentle` object, e.g. the port and container of the server to use.
+            (Default = None)
+
+        stop_backend (bool):
+            Whether the primary backend should be stopped once done.
+            (Default = True)
+
+        workspace_quota (int):
+            Maximum number of bytes that the extracted audio may take up. Use `None` for no quota.
+            (Default = None)
+
+        cut_non_speech (bool):
+            Whether the long stretches of the audio that contain no speech (e.g. music) should be cut out before
+            alignment.
+            (Default = False)
+
+        deadline (float):
+            Number of seconds from now by which the captions must be written. The regions of the transcripts that
+            cannot be aligned in time get interpolated timings instead. Use `None` for no deadline.
+            (Default = None)
+
+        strip_markup (tuple[str]):
+            The kinds of markup that is not spoken (e.g. speaker labels) to strip out of the transcripts before
+            alignment. The captions still show the original transcripts.
+            (Default = ())
+
+        markup_patterns (tuple[str]):
+            Regular expressions of other markup to strip out of the transcripts before alignment.
+            (Default = ())
+
+    Returns:
+        list[str]:
+            Paths to the captions files, in the same order as `transcript_paths`.
+    """
+
+    # Extract the audio and get the timetables
+    timetables = extract_and_align(video_or_audio_file, transcript_paths, wav_file_name=wav_file_name, backend=backend,
+                                   fallback_backend=fallback_backend, warm_up=warm_up, container=transport_format,
+                                   refine=refine, gentle_options=gentle_options, stop_backend=stop_backend,
+                                   workspace_quota=workspace_quota, cut_non_speech=cut_non_speech,
+                                   deadline=deadline, strip_markup=strip_markup, markup_patterns=markup_patterns)
+
+    output_paths = []
+
+    for transcript_path, timetable in zip(transcript_paths, timetables):
+        # Convert the timetable into captions
+        with open(transcript_path, "r") as f:
+            caption_content = render_captions(f.read(), timetable, block_type=block_type, block_duration=block_duration,
+                                              max_block_length=max_block_length, caption_type=caption_type)
+
+        # Write the captions (and the timetable, if needed)
+        transcript_output_file_name = get_output_file_name(output_file_name, transcript_path, len(transcript_paths))
+        output_paths.append(write_captions(caption_content, transcript_output_file_name, caption_type=caption_type))
+
+        if save_timetables:
+            save_timetable(timetable, transcript_output_file_name + ".timetable")
+
+    return output_paths
@@ -0,0 +1,184 @@
+"""
+drafting.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Writes approximate draft captions within seconds, and replaces them with the aligned captions once the
+             alignment is done.
+"""
+
+# IMPORTS
+import concurrent.futures
+
+from src.alignment_backends import spread_transcript
+from src.audio_analysis import find_speech_segments, read_media_samples
+from src.conversion import probe_media_duration
+from src.pipeline.captioning import caption_media, get_output_file_name
+from src.pipeline.rendering import render_captions, write_captions
+
+# CONSTANTS
+DRAFT_MODES = ("spread", "energy")
+DRAFT_SAMPLE_RATE = 8000  # Sample rate to decode the audio at for the energy scan; speech energy is well below 4 kHz
+
+
+# FUNCTIONS
+def find_draft_speech(video_or_audio_file, mode="energy"):
+    """
+    Finds the parts of a video or audio file that the words of a draft should be spread over.
+
+    Args:
+        video_or_audio_file (str):
+            Path to the video or audio file.
+
+        mode (str):
+            Either "spread", which spreads the words evenly over the probed duration of the file without decoding it,
+            or "energy", which decodes the audio and only spreads them over the parts that contain speech.
+            (Default = "energy")
+
+    Returns:
+        list[tuple[float, float]]:
+            The start and end times in seconds of each segment of speech.
+
+    Raises:
+        AssertionError:
+            If the mode is not in `DRAFT_MODES`.
+    """
+
+    assert mode in DRAFT_MODES, f"The draft mode '{mode}' is not supported. (Supported: {list(DRAFT_MODES)})"
+
+    if mode == "energy":
+        samples, sample_rate = read_media_samples(video_or_audio_file, sample_rate=DRAFT_SAMPLE_RATE)
+        speech_segments = find_speech_segments(samples, sample_rate)
+
+        if speech_segments:
+            return speech_segments
+
+    return [(0.0, probe_media_duration(video_or_audio_file))]
+
+
+def draft_captions(video_or_audio_file, transcript_paths, output_file_name="transcript", mode="energy",
+                   block_type="sentence", block_duration=5, max_block_length=15, caption_type="webvtt"):
+    """
+    Writes approximate captions for a video or audio file without aligning the transcripts, one captions file per
+    transcript.
+
+    Args:
+        video_or_audio_file (str):
+            Path to the video or audio file.
+
+        transcript_paths (list[str]):
+            Paths to the transcripts.
+
+        output_file_name (str):
+            Name of the output file, without the extension. If there is more than one transcript, the name of each
+            transcript is appended to this name.
+            (Default = "transcript")
+
+        mode (str):
+            How the words are spread over the audio. See `find_draft_speech`.
+            (Default = "energy")
+
+        block_type (str):
+            How the captions should be grouped. Either "time" or "sentence".
+            (Default = "sentence")
+
+        block_duration (int):
+            The length of time that makes up each block.
+            (Default = 5)
+
+        max_block_length (int):
+            The maximum number of timetabled words that can be in each caption block.
+            (Default = 15)
+
+        caption_type (str):
+            Format of the captions.
+            (Default = "webvtt")
+
+    Returns:
+        list[str]:
+            Paths to the captions files, in the same order as `transcript_paths`.
+    """
+
+    speech_segments = find_draft_speech(video_or_audio_file, mode=mode)
+    output_paths = []
+
+    for transcript_path in transcript_paths:
+        # Spread the words over the speech and convert the timetable into captions
+        with open(transcript_path, "r") as f:
+            transcript = f.read()
+
+        caption_content = render_captions(transcript, spread_transcript(transcript, speech_segments),
+                                          block_type=block_type, block_duration=block_duration,
+                                          max_block_length=max_block_length, caption_type=caption_type)
+
+        # Write the captions
+        transcript_output_file_name = get_output_file_name(output_file_name, transcript_path, len(transcript_paths))
+        output_paths.append(write_captions(caption_content, transcript_output_file_name, caption_type=caption_type))
+
+    return output_paths
+
+
+def caption_media_in_background(video_or_audio_file, transcript_paths, output_file_name="transcript",
+                                draft_mode="energy", block_type="sentence", block_duration=5, max_block_length=15,
+                                caption_type="webvtt", **caption_options):
+    """
+    Writes draft captions straight away, then aligns the transcripts in a background thread and overwrites the drafts
+    with the aligned captions.
+
+    Args:
+        video_or_audio_file (str):
+            Path to the video or audio file.
+
+        transcript_paths (list[str]):
+            Paths to the transcripts.
+
+        output_file_name (str):
+            Name of the output file, without the extension.
+            (Default = "transcript")
+
+        draft_mode (str):
+            How the words of the drafts are spread over the audio. See `find_draft_speech`.
+            (Default = "energy")
+
+        block_type (str):
+            How the captions should be grouped. Either "time" or "sentence".
+            (Default = "sentence")
+
+        block_duration (int):
+            The length of time that makes up each block.
+            (Default = 5)
+
+        max_block_length (int):
+            The maximum number of timetabled words that can be in each caption block.
+            (Default = 15)
+
+        caption_type (str):
+            Format of the captions.
+            (Default = "webvtt")
+
+        **caption_options:
+            Other keyword arguments for `caption_media()`, such as the alignment backend.
+
+    Returns:
+        tuple[list[str], concurrent.futures.Future]:
+            Paths to the draft captions files, and a future that resolves to the same paths once they have been
+            overwritten with the aligned captions.
+    """
+
+    formatting_options = {"block_type": block_type, "block_duration": block_duration,
+                          "max_block_length": max_block_length, "caption_type": caption_type}
+
+    # Write the drafts
+    draft_paths = draft_captions(video_or_audio_file, transcript_paths, output_file_name=output_file_name,
+                                 mode=draft_mode, **formatting_options)
+
+    # Align in the background; the executor's thread finishes the alignment even if nothing waits on the future
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(caption_media, video_or_audio_file, transcript_paths, output_file_name=output_file_name,
+                             **formatting_options, **caption_options)
+    executor.shutdown(wait=False)
+
+    return draft_paths, future
@@ -0,0 +1,286 @@
+"""
+orchestration.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Runs the stages of the captioning pipeline, overlapping the ones that do not depend on each other.
+"""
+
+# IMPORTS
+import asyncio
+import concurrent.futures
+import time
+
+from src.alignment_backends import align_within_deadline, ApproximateBackend
+from src.conversion import AudioFormat, excise_non_speech, extract_audio, negotiate_audio_format, \
+    normalise_transcript_file
+from src.gentle_interface import align_transcripts, create_backend, run_sync
+from src.workspace import estimate_audio_size, Workspace
+
+# CONSTANTS
+FINISHING_TIME = 2  # Number of seconds kept back from a deadline for writing the captions
+
+
+# FUNCTIONS
+async def extract_and_align_async(video_or_audio_file, transcript_paths, wav_file_name="audio", backend="gentle",
+                                  fallback_backend=None, warm_up=False, container="wav", refine=False,
+                                  gentle_options=None, stop_backend=True, workspace_quota=None, cut_non_speech=False,
+                                  deadline=None, strip_markup=(), markup_patterns=()):
+    """
+    Extracts the audio of a video or audio file and aligns the transcripts against it.
+    This is an asynchronous function.
+
+    The audio is extracted while the alignment backend is being started (e.g. while the gentle container boots and its
+    server becomes ready), and alignment begins as soon as both are finished. The audio is downmixed and resampled to
+    the smallest format that all the backends accept.
+
+    The audio is extracted into a workspace of its own, on a RAM-backed filesystem if there is room for it, so that
+    several jobs can run side by side. The workspace is removed once done, even if the alignment failed.
+
+    If `cut_non_speech` is set, the long stretches of the audio without speech (e.g. music) are cut out before it is
+    sent to the backend, and the word times are mapped back to the original audio afterwards.
+
+    If `strip_markup` or `markup_patterns` are given, the markup that is not spoken (e.g. speaker labels) is stripped
+    out of the transcripts before they are sent to the backend, and the offsets of the words are mapped back to the
+    original transcripts afterwards.
+
+    If there is a `deadline`, the transcripts are aligned region by region, and the regions that are not aligned in time
+    get timings interpolated from the aligned words around them (see `align_within_deadline`). Which regions were
+    aligned and which were approximated is printed once done. The time taken to extract the audio and to start the
+    backend counts against the deadline; if the backend has not started by the deadline, every region is approximated.
+
+    Args:
+        video_or_audio_file (str):
+            Path to the video or audio file.
+
+        transcript_paths (list[str]):
+            Paths to the transcripts.
+
+        wav_file_name (str):
+            Name of the extracted WAV file in the workspace, without the extension ".wav".
+            (Default = "audio")
+
+        backend (str):
+            Name of the alignment backend to use.
+            (Default = "gentle")
+
+        fallback_backend (str):
+            Name of the alignment backend to fall back on. Use `None` to not have a fallback.
+            (Default = None)
+
+        warm_up (bool):
+            Whether the gentle server should be sent a tiny alignment once it is up.
+            (Default = False)
+
+        container (str):
+            The preferred container of the extracted audio, e.g. "flac" to upload losslessly compressed audio.
+            (Default = "wav")
+
+        refine (bool):
+            Whether the regions that are dense with unaligned words should be re-aligned by the primary backend.
+            (Default = False)
+
+        gentle_options (dict):
+            Keyword arguments for the `Gentle` object, e.g. the port and container of the server to use. Only used by
+            the gentle backend.
+            (Default = None)
+
+        stop_backend (bool):
+            Whether the primary backend should be stopped once done. Leave it running when it will be used again soon.
+            (Default = True)
+
+        workspace_quota (int):
+            Maximum number of bytes that the extracted audio may take up. Use `None` for no quota.
+            (Default = None)
+
+        cut_non_speech (bool):
+            Whether the long stretches of the audio that contain no speech should be cut out before alignment.
+            (Default = False)
+
+        deadline (float):
+            Number of seconds from now by which the timetables must be ready. Cannot be used with `fallback_backend`
+            or `refine`. Use `None` for no deadline.
+            (Default = None)
+
+        strip_markup (tuple[str]):
+            The kinds of markup to strip out of the transcripts before alignment, from `MARKUP_KINDS`.
+            (Default = ())
+
+        markup_patterns (tuple[str]):
+            Regular expressions of other markup to strip out of the transcripts before alignment.
+            (Default = ())
+
+    Returns:
+        list[list[dict]]:
+            The timetables, in the same order as `transcript_paths`.
+
+    Raises:
+        AssertionError:
+            If there is a deadline and a fallback backend or refinement is also requested.
+
+        OSError:
+            If the extracted audio does not fit in the workspace's quota.
+    """
+
+    assert deadline is None or (fallback_backend is None and not refine), \
+        "The words that are not aligned by a deadline are interpolated, so a fallback backend and refinement cannot " \
+        "be used with a deadline."
+
+    loop = asyncio.get_running_loop()
+    deadline_time = time.monotonic() + deadline - FINISHING_TIME if deadline is not None else None
+
+    # Create the backends
+    primary = create_backend(backend, warm_up=warm_up, **(gentle_options or {}))
+    fallback = create_backend(fallback_backend) if fallback_backend is not None else None
+
+    # Negotiate the audio format that every backend accepts, including the one that interpolates up to a deadline
+    accepted_formats = [b.audio_format for b in (primary, fallback) if b is not None]
+    if deadline is not None:
+        accepted_formats.append(ApproximateBackend.audio_format)
+
+    audio_format = negotiate_audio_format(accepted_formats, container=container)
+
+    # Non-speech can only be cut out of WAV files, so extract a WAV file and compress it after cutting
+    extraction_format = audio_format
+    if cut_non_speech:
+        extraction_format = AudioFormat(sample_rate=audio_format.sample_rate, channels=audio_format.channels,
+                                        sample_width=audio_format.sample_width, containers=("wav",))
+
+    # Create the job's workspace
+    workspace = Workspace(prefix="extraction_", expected_size=estimate_audio_size(video_or_audio_file,
+                                                                                  extraction_format),
+                          quota=workspace_quota)
+    workspace.create()
+
+    def __extraction_helper():
+        """Helper function that extracts the audio and cuts out the stretches that contain no speech, if needed."""
+        extracted_file_path = extract_audio(video_or_audio_file, wav_file_name, extraction_format, workspace)
+
+        if not cut_non_speech:
+            return extracted_file_path, None
+
+        excision_result = excise_non_speech(extracted_file_path, workspace.path(wav_file_name + "_speech"),
+                                            container=audio_format.container)
+        workspace.check_quota()
+
+        return excision_result
+
+    # The primary backend is started in an executor of its own, so that a start that was given up on is not waited for,
+    # and so that stopping the backend can be queued up behind it
+    start_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    start_future = None
+
+    try:
+        # Strip the markup out of the transcripts, so that the backends only try to align the spoken words
+        aligned_transcript_paths, offset_maps = transcript_paths, None
+
+        if strip_markup or markup_patterns:
+            aligned_transcript_paths = [workspace.path(f"transcript_{i}.txt") for i in range(len(transcript_paths))]
+            offset_maps = [normalise_transcript_file(transcript_path, aligned_transcript_path, markup=strip_markup,
+                                                     extra_patterns=markup_patterns)
+                           for transcript_path, aligned_transcript_path in zip(transcript_paths,
+                                                                               aligned_transcript_paths)]
+
+        # Extract the audio and start the primary backend at the same time. Starting gentle can take over a minute, so
+        # with a deadline, give up on the backend (and approximate every region) rather than wait past it
+        start_future = loop.run_in_executor(start_executor, primary.start)
+
+        start_awaitable = start_future
+        if deadline_time is not None:
+            start_awaitable = asyncio.wait_for(start_future, max(0.0, deadline_time - time.monotonic()))
+
+        extraction_result, start_result = await asyncio.gather(
+            loop.run_in_executor(None, __extraction_helper),
+            start_awaitable,
+            return_exceptions=True
+        )
+
+        if isinstance(extraction_result, BaseException):
+            raise extraction_result
+
+        audio_file_path, offset_table = extraction_result
+
+        # Align the transcripts
+        if deadline_time is not None:
+            if start_future.cancelled():  # Timed out
+                print(f"The '{backend}' backend did not start before the deadline; approximating every region instead.")
+            elif isinstance(start_result, BaseException):
+                print(f"The '{backend}' backend failed to start ({start_result}); approximating every region instead.")
+
+            timetables, reports = await loop.run_in_executor(
+                None, align_within_deadline, None if isinstance(start_result, BaseException) else primary,
+                audio_file_path, aligned_transcript_paths, deadline_time
+            )
+
+            for transcript_path, report in zip(transcript_paths, reports):
+                if offset_table is not None:
+                    report = {outcome: [(float(offset_table.to_original(start, side="right")),
+                                         float(offset_table.to_original(end, side="left"))) for start, end in regions]
+                              for outcome, regions in report.items()}
+
+                aligned, approximated = [", ".join(f"{start:.1f}s-{end:.1f}s" for start, end in report[outcome])
+                                         for outcome in ("aligned", "approximated")]
+                print(f"By the deadline, '{transcript_path}' was aligned over {aligned or 'none of the audio'} and "
+                      f"approximated over {approximated or 'none of the audio'}.")
+        else:
+            try:
+                if isinstance(start_result, BaseException):
+                    raise start_result
+
+                timetables = await loop.run_in_executor(None, align_transcripts, primary, audio_file_path,
+                                                        aligned_transcript_paths, fallback, refine)
+            except Exception as e:
+                if fallback is None:
+                    raise
+
+                # The primary backend failed entirely, so align everything with the fallback backend
+                print(f"The '{backend}' backend failed ({e}); aligning with the '{fallback_backend}' backend instead.")
+                with fallback:
+                    timetables = await loop.run_in_executor(None, fallback.get_timetables, audio_file_path,
+                                                            aligned_transcript_paths)
+
+        # Map the times back to the original audio, and the offsets back to the original transcripts
+        if offset_table is not None:
+            for timetable in timetables:
+                offset_table.remap_timetable(timetable)
+
+        if offset_maps is not None:
+            for offset_map, timetable in zip(offset_maps, timetables):
+                offset_map.remap_timetable(timetable)
+    finally:
+        workspace.remove()
+
+        # Stop the backend once it has finished starting. If its start was given up on, it is still running, so the stop
+        # is left to run after it in the background rather than waited for
+        stop_future = loop.run_in_executor(start_executor, primary.stop) if stop_backend else None
+        start_executor.shutdown(wait=False)
+
+        if stop_future is not None and not (start_future is not None and start_future.cancelled()):
+            await stop_future
+
+    return timetables
+
+
+def extract_and_align(video_or_audio_file, transcript_paths, wav_file_name="audio", backend="gentle",
+                      fallback_backend=None, warm_up=False, container="wav", refine=False, gentle_options=None,
+                      stop_backend=True, workspace_quota=None, cut_non_speech=False, deadline=None, strip_markup=(),
+                      markup_patterns=()):
+    """
+    Extracts the audio of a video or audio file and aligns the transcripts against it.
+
+    See `extract_and_align_async` for details. Safe to call from inside a running event loop.
+
+    Returns:
+        list[list[dict]]:
+            The timetables, in the same order as `transcript_paths`.
+    """
+
+    return run_sync(extract_and_align_async(video_or_audio_file, transcript_paths, wav_file_name=wav_file_name,
+                                               backend=backend, fallback_backend=fallback_backend, warm_up=warm_up,
+                                               container=container, refine=refine, gentle_options=gentle_options,
+                                               stop_backend=stop_backend, workspace_quota=workspace_quota,
+                                               cut_non_speech=cut_non_speech, deadline=deadline,
+                                               strip_markup=strip_markup, markup_patterns=markup_patterns))
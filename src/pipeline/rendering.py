@@ -0,0 +1,185 @@
+"""
+rendering.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Turns a timetable and its transcript into a captions file.
+"""
+
+# IMPORTS
+import os
+
+from src.conversion import iterate_subrip, iterate_webvtt, timetable_to_subrip, timetable_to_webvtt
+from src.timetable_fixing import Aligner, align_sentence_parallel
+from src.timetable_storage import WORDS_PER_CHUNK
+
+# CONSTANTS
+CAPTION_TYPE_TO_EXTENSION = {
+    "webvtt": ".vtt",
+    "subrip": ".srt"
+}
+
+
+# FUNCTIONS
+def render_captions(transcript, timetable, block_type="sentence", block_duration=5, max_block_length=15,
+                    caption_type="webvtt", num_processes=1):
+    """
+    Groups the words of a timetable into caption blocks and converts them into a captions string.
+
+    Args:
+        transcript (str):
+            The transcript that the timetable was aligned against.
+
+        timetable (list[dict]):
+            The timetable of spoken words.
+
+        block_type (str):
+            How the captions should be grouped. Either "time" or "sentence".
+            (Default = "sentence")
+
+        block_duration (int):
+            The length of time that makes up each block. Only used if `block_type` is "time".
+            (Default = 5)
+
+        max_block_length (int):
+            The maximum number of timetabled words that can be in each caption block. Only used if `block_type` is
+            "sentence".
+            (Default = 15)
+
+        caption_type (str):
+            Format of the captions. Must be a key of `CAPTION_TYPE_TO_EXTENSION`.
+            (Default = "webvtt")
+
+        num_processes (int):
+            Number of processes to group the words into sentences with. Only used if `block_type` is "sentence". The
+            captions are the same for any number of processes.
+            (Default = 1)
+
+    Returns:
+        str:
+            The captions.
+
+    Raises:
+        AssertionError:
+            If either `block_type` or `caption_type` is not supported.
+    """
+
+    assert block_type in ("time", "sentence"), f"The block type '{block_type}' is not supported."
+    assert caption_type in CAPTION_TYPE_TO_EXTENSION, f"The caption type '{caption_type}' is not supported."
+
+    # Align the timetable with the transcript
+    aligner = Aligner(transcript, timetable)
+
+    if block_type == "time":
+        aligned_timetable = aligner.align_time(block_duration)
+    elif num_processes > 1:
+        aligned_timetable = align_sentence_parallel(transcript, timetable, max_block_length=max_block_length,
+                                                    num_processes=num_processes)
+    else:
+        aligned_timetable = aligner.align_sentence(max_block_length)
+
+    # Convert the aligned timetable into a captions string
+    if caption_type == "webvtt":
+        return timetable_to_webvtt(aligned_timetable)
+
+    return timetable_to_subrip(aligned_timetable)
+
+
+def iterate_captions(transcript, timetable, block_type="sentence", block_duration=5, max_block_length=15,
+                     caption_type="webvtt", words_per_chunk=WORDS_PER_CHUNK):
+    """
+    Groups the words of a timetable into caption blocks and converts them into captions one block at a time, so that
+    neither the caption blocks nor the captions are ever held in memory all at once.
+
+    Args:
+        transcript (str):
+            The transcript that the timetable was aligned against.
+
+        timetable (union[list[dict], Timetable]):
+            The timetable of spoken words.
+
+        block_type (str):
+            How the captions should be grouped. Either "time" or "sentence".
+            (Default = "sentence")
+
+        block_duration (int):
+            The length of time that makes up each block. Only used if `block_type` is "time".
+            (Default = 5)
+
+        max_block_length (int):
+            The maximum number of timetabled words that can be in each caption block. Only used if `block_type` is
+            "sentence".
+            (Default = 15)
+
+        caption_type (str):
+            Format of the captions. Must be a key of `CAPTION_TYPE_TO_EXTENSION`.
+            (Default = "webvtt")
+
+        words_per_chunk (int):
+            Number of words of a `Timetable` to decode at a time.
+            (Default = WORDS_PER_CHUNK)
+
+    Returns:
+        iterable[str]:
+            The successive pieces of the captions, which join up to what `render_captions` returns.
+
+    Raises:
+        AssertionError:
+            If either `block_type` or `caption_type` is not supported.
+    """
+
+    assert block_type in ("time", "sentence"), f"The block type '{block_type}' is not supported."
+    assert caption_type in CAPTION_TYPE_TO_EXTENSION, f"The caption type '{caption_type}' is not supported."
+
+    # Align the timetable with the transcript as the captions are written
+    aligner = Aligner(transcript, timetable, words_per_chunk=words_per_chunk)
+
+    if block_type == "time":
+        aligned_blocks = aligner.iterate_time_blocks(block_duration)
+    else:
+        aligned_blocks = aligner.iterate_sentences(max_block_length)
+
+    # Convert the caption blocks into captions as they are made
+    if caption_type == "webvtt":
+        return iterate_webvtt(aligned_blocks)
+
+    return iterate_subrip(aligned_blocks)
+
+
+def write_captions(caption_content, output_file_name, caption_type="webvtt"):
+    """
+    Writes captions to a file whose extension matches the caption type.
+
+    The captions are written to a temporary file that then replaces the captions file, so that a reader (e.g. a video
+    player showing the draft captions) never sees a half-written file.
+
+    Args:
+        caption_content (union[str, iterable[str]]):
+            The captions, or the successive pieces of the captions (e.g. from `iterate_captions`).
+
+        output_file_name (str):
+            Name of the output file, without the extension.
+
+        caption_type (str):
+            Format of the captions. Must be a key of `CAPTION_TYPE_TO_EXTENSION`.
+            (Default = "webvtt")
+
+    Returns:
+        str:
+            Path to the captions file.
+    """
+
+    output_path = output_file_name + CAPTION_TYPE_TO_EXTENSION[caption_type]
+
+    with open(output_path + ".part", "w+") as f:
+        if isinstance(caption_content, str):
+            f.write(caption_content)
+        else:
+            f.writelines(caption_content)
+
+    os.replace(output_path + ".part", output_path)
+
+    return output_path
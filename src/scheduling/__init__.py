@@ -0,0 +1,2 @@
+from .batch import format_report, parse_worker, plan_batch, POLICIES, read_manifest, run_batch
+from .policies import order_fifo, order_longest_first, order_shortest_first, simulate_schedule
@@ -0,0 +1,308 @@
+"""
+batch.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Captions a batch of files across several gentle servers, scheduling the jobs by their durations.
+"""
+
+# IMPORTS
+import csv
+import os
+import queue
+import threading
+import time
+import traceback
+
+from src.conversion import probe_media_duration
+from src.gentle_interface import create_backend
+from src.pipeline import caption_media
+from src.scheduling.policies import order_fifo, order_longest_first, order_shortest_first, simulate_schedule
+
+# CONSTANTS
+POLICIES = {
+    "fifo": order_fifo,
+    "sjf": order_shortest_first,
+    "lpt": order_longest_first
+}
+
+DEFAULT_REAL_TIME_FACTOR = 0.5  # Predicted number of seconds to caption each second of audio
+DEFAULT_JOB_OVERHEAD = 5  # Predicted number of seconds that each job takes regardless of its duration
+
+
+# FUNCTIONS
+def parse_worker(worker):
+    """
+    Parses the description of a gentle server.
+
+    Args:
+        worker (str):
+            The description, as "[container_name]:[port]".
+
+    Returns:
+        dict:
+            Keyword arguments for the `Gentle` object.
+
+    Raises:
+        AssertionError:
+            If the description is invalid.
+    """
+
+    container_name, _, port = worker.rpartition(":")
+    assert container_name and port.isdigit(), f"The worker '{worker}' is not of the form '[container_name]:[port]'."
+
+    return {"container_name": container_name, "port": int(port)}
+
+
+def get_output_name(media_file):
+    """
+    Gets the name that the captions of a job's video or audio file are written under in the output directory.
+
+    Args:
+        media_file (str):
+            Path to the video or audio file.
+
+    Returns:
+        str:
+            The name, without the extension.
+    """
+
+    return os.path.splitext(os.path.basename(media_file))[0]
+
+
+def read_manifest(manifest_path):
+    """
+    Reads a batch manifest, which is a CSV file with one job per row: the video or audio file followed by its
+    transcripts. Relative paths are relative to the manifest.
+
+    Args:
+        manifest_path (str):
+            Path to the manifest.
+
+    Returns:
+        list[tuple[str, list[str]]]:
+            The video or audio file and the transcripts of each job.
+
+    Raises:
+        AssertionError:
+            If a row does not have at least one transcript, or if two rows' captions would be written under the same
+            name (e.g. "a/talk.mp4" and "b/talk.mp4").
+
+        FileNotFoundError:
+            If the manifest or any file in it cannot be found.
+    """
+
+    if not os.path.isfile(manifest_path):
+        raise FileNotFoundError(f"A manifest does not exist at the path '{manifest_path}'.")
+
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+    jobs = []
+    output_rows = {}  # Row number of the job that each output name belongs to
+
+    with open(manifest_path, "r", newline="") as f:
+        for row_number, row in enumerate(csv.reader(f), start=1):
+            row = [os.path.join(manifest_dir, cell.strip()) for cell in row if cell.strip()]
+
+            if not row:
+                continue  # Skip blank lines
+
+            assert len(row) >= 2, f"Row {row_number} of the manifest does not have a transcript."
+
+            for path in row:
+                if not os.path.isfile(path):
+                    raise FileNotFoundError(f"Row {row_number} of the manifest refers to '{path}', which does not "
+                                            f"exist.")
+
+            # Every job's captions are written to the same output directory, so they must not share a name
+            output_name = get_output_name(row[0])
+            assert output_name not in output_rows, \
+                f"Rows {output_rows.get(output_name)} and {row_number} of the manifest would both write their " \
+                f"captions as '{output_name}'. Rename one of the files."
+            output_rows[output_name] = row_number
+
+            jobs.append((row[0], row[1:]))
+
+    return jobs
+
+
+def plan_batch(durations, num_workers, policy="lpt", real_time_factor=DEFAULT_REAL_TIME_FACTOR,
+               job_overhead=DEFAULT_JOB_OVERHEAD):
+    """
+    Plans the order of a batch of jobs and predicts when each of them will finish.
+
+    Args:
+        durations (list[float]):
+            The duration of each job's audio in seconds.
+
+        num_workers (int):
+            Number of workers.
+
+        policy (str):
+            The scheduling policy. Must be a key of `POLICIES`.
+            (Default = "lpt")
+
+        real_time_factor (float):
+            Predicted number of seconds to caption each second of audio.
+            (Default = 0.5)
+
+        job_overhead (float):
+            Predicted number of seconds that each job takes regardless of its duration.
+            (Default = 5)
+
+    Returns:
+        dict:
+            The `order` that the jobs should be started in, and the `predicted_times`, `predicted_workers` and
+            `predicted_finish_times` of each job (indexed by job), as well as the `predicted_makespan`.
+
+    Raises:
+        AssertionError:
+            If the policy is not supported.
+    """
+
+    assert policy in POLICIES, f"The scheduling policy '{policy}' is not supported."
+
+    predicted_times = [job_overhead + duration * real_time_factor for duration in durations]
+    order = POLICIES[policy](predicted_times)
+    predicted_workers, predicted_finish_times = simulate_schedule(predicted_times, num_workers, order)
+
+    return {
+        "order": order,
+        "predicted_times": predicted_times,
+        "predicted_workers": predicted_workers,
+        "predicted_finish_times": predicted_finish_times,
+        "predicted_makespan": max(predicted_finish_times, default=0)
+    }
+
+
+def run_batch(jobs, output_dir, workers=({"container_name": "gentle-container", "port": 8765},), policy="lpt",
+              real_time_factor=DEFAULT_REAL_TIME_FACTOR, job_overhead=DEFAULT_JOB_OVERHEAD, backend="gentle",
+              **caption_options):
+    """
+    Captions a batch of jobs, starting them in the order chosen by the policy, each one on the first worker that is
+    free.
+
+    Args:
+        jobs (list[tuple[str, list[str]]]):
+            The video or audio file and the transcripts of each job.
+
+        output_dir (str):
+            Directory to write the captions to. Each captions file is named after its video or audio file.
+
+        workers (list[dict]):
+            Keyword arguments for the `Gentle` object of each worker. With other backends, only the number of workers
+            is used.
+            (Default = ({"container_name": "gentle-container", "port": 8765},))
+
+        policy (str):
+            The scheduling policy. Must be a key of `POLICIES`.
+            (Default = "lpt")
+
+        real_time_factor (float):
+            Predicted number of seconds to caption each second of audio.
+            (Default = 0.5)
+
+        job_overhead (float):
+            Predicted number of seconds that each job takes regardless of its duration.
+            (Default = 5)
+
+        backend (str):
+            Name of the alignment backend to use.
+            (Default = "gentle")
+
+        **caption_options:
+            Other keyword arguments for `caption_media()`, such as the caption type.
+
+    Returns:
+        dict:
+            The plan from `plan_batch()`, as well as the `durations`, `actual_workers`, `actual_finish_times` (relative
+            to the start of the batch), `actual_times` and `errors` of each job (indexed by job), and the
+            `actual_makespan`.
+    """
+
+    # Probe the durations and plan the batch
+    durations = [probe_media_duration(media_file) for media_file, _ in jobs]
+    report = plan_batch(durations, len(workers), policy=policy, real_time_factor=real_time_factor,
+                        job_overhead=job_overhead)
+    report.update(durations=durations, actual_workers=[None] * len(jobs), actual_finish_times=[None] * len(jobs),
+                  actual_times=[None] * len(jobs), errors=[None] * len(jobs))
+
+    pending_jobs = queue.Queue()
+    for job in report["order"]:
+        pending_jobs.put(job)
+
+    batch_start_time = time.time()
+
+    def work(worker):
+        """Helper function that processes jobs on one worker until there are none left."""
+        while True:
+            try:
+                job = pending_jobs.get_nowait()
+            except queue.Empty:
+                return
+
+            media_file, transcript_paths = jobs[job]
+            output_file_name = os.path.join(output_dir, get_output_name(media_file))
+            job_start_time = time.time()
+
+            try:
+                caption_media(media_file, transcript_paths, output_file_name=output_file_name, backend=backend,
+                              gentle_options=workers[worker], stop_backend=False, **caption_options)
+            except Exception:
+                report["errors"][job] = traceback.format_exc()
+
+            report["actual_workers"][job] = worker
+            report["actual_times"][job] = time.time() - job_start_time
+            report["actual_finish_times"][job] = time.time() - batch_start_time
+
+    # Run one thread per worker
+    threads = [threading.Thread(target=work, args=(worker,)) for worker in range(len(workers))]
+
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        # Stop the gentle servers, which were left running between jobs
+        if backend == "gentle":
+            for worker in workers:
+                create_backend(backend, **worker).stop()
+
+    report["actual_makespan"] = max(report["actual_finish_times"], default=0)
+
+    return report
+
+
+def format_report(report):
+    """
+    Formats the report of a batch as a table that compares the predicted and actual finish times.
+
+    Args:
+        report (dict):
+            The report from `run_batch()`.
+
+    Returns:
+        str
+    """
+
+    lines = [f"{'Job':>4} {'Duration':>9} {'Worker':>7} {'Predicted':>10} {'Actual':>10}  Status"]
+
+    for job in report["order"]:
+        status = "failed" if report["errors"][job] else "done"
+        lines.append(f"{job + 1:>4} {report['durations'][job]:>8.1f}s {report['actual_workers'][job] + 1:>7} "
+                     f"{report['predicted_finish_times'][job]:>9.1f}s {report['actual_finish_times'][job]:>9.1f}s  "
+                     f"{status}")
+
+    num_jobs = len(report["order"]) or 1
+    lines.append(f"Makespan: {report['predicted_makespan']:.1f}s predicted, {report['actual_makespan']:.1f}s actual")
+    lines.append(f"Mean finish time: {sum(report['predicted_finish_times']) / num_jobs:.1f}s predicted, "
+                 f"{sum(report['actual_finish_times']) / num_jobs:.1f}s actual")
+
+    if sum(report["durations"]) > 0:
+        lines.append(f"Observed real-time factor: {sum(report['actual_times']) / sum(report['durations']):.3f} "
+                     f"(seconds of work per second of audio, including overheads)")
+
+    return "\n".join(lines)
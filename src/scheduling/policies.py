@@ -0,0 +1,105 @@
+"""
+policies.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Orders a batch of jobs across several workers and predicts when each job will finish.
+"""
+
+# IMPORTS
+import heapq
+
+
+# FUNCTIONS
+def order_fifo(job_times):
+    """
+    Keeps the jobs in the order that they were given.
+
+    Args:
+        job_times (list[float]):
+            The predicted processing time of each job.
+
+    Returns:
+        list[int]:
+            The indices of the jobs, in the order that they should be started.
+    """
+
+    return list(range(len(job_times)))
+
+
+def order_shortest_first(job_times):
+    """
+    Orders the jobs from shortest to longest, which minimises the mean time that a job waits to finish.
+
+    Args:
+        job_times (list[float]):
+            The predicted processing time of each job.
+
+    Returns:
+        list[int]:
+            The indices of the jobs, in the order that they should be started.
+    """
+
+    return sorted(range(len(job_times)), key=lambda i: job_times[i])
+
+
+def order_longest_first(job_times):
+    """
+    Orders the jobs from longest to shortest. Giving each job to the first worker that is free then packs the jobs
+    like the longest processing time (LPT) rule, which keeps the makespan within 4/3 of the best possible one.
+
+    Args:
+        job_times (list[float]):
+            The predicted processing time of each job.
+
+    Returns:
+        list[int]:
+            The indices of the jobs, in the order that they should be started.
+    """
+
+    return sorted(range(len(job_times)), key=lambda i: job_times[i], reverse=True)
+
+
+def simulate_schedule(job_times, num_workers, order):
+    """
+    Predicts when each job will finish if the jobs are started in the given order, each one on the first worker that
+    is free.
+
+    Args:
+        job_times (list[float]):
+            The predicted processing time of each job.
+
+        num_workers (int):
+            Number of workers.
+
+        order (list[int]):
+            The indices of the jobs, in the order that they are started.
+
+    Returns:
+        tuple[list[int], list[float]]:
+            The worker that each job is given to and the time that each job finishes, both indexed by job.
+
+    Raises:
+        AssertionError:
+            If there are no workers.
+    """
+
+    assert num_workers > 0, "There must be at least one worker."
+
+    workers = [(0.0, worker) for worker in range(num_workers)]  # Heap of the time that each worker becomes free
+    job_workers = [0] * len(job_times)
+    finish_times = [0.0] * len(job_times)
+
+    for job in order:
+        free_time, worker = heapq.heappop(workers)
+
+        job_workers[job] = worker
+        finish_times[job] = free_time + job_times[job]
+
+        heapq.heappush(workers, (finish_times[job], worker))
+
+    return job_workers, finish_times
+
@@ -0,0 +1,5 @@
+from .cue_writer import LiveCaptionWriter
+from .live_aligner import LiveAligner
+from .live_captioning import caption_stream
+from .media_stream import open_media_stream
+from .wav_stream import WavStream
@@ -0,0 +1,172 @@
+"""
+cue_writer.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Groups committed words into caption cues and appends them to a WebVTT or SubRip file as they complete.
+"""
+
+# IMPORTS
+import re
+from datetime import timedelta
+
+from src.conversion.timetable_to_subrip import timedelta_to_subrip_time
+from src.conversion.timetable_to_webvtt import timedelta_to_webvtt_time
+from src.metrics import REGISTRY
+
+# CONSTANTS
+TRAILING_PUNCTUATION_REGEX = re.compile(r"[^\w\s]*")
+SENTENCE_ENDING_CHARACTERS = ".!?"
+MIN_CUE_DURATION = 0.01  # Minimum number of seconds that a cue is shown for
+
+CUES_RENDERED = REGISTRY.counter("video_to_captions_cues_rendered_total", "Number of caption cues rendered.",
+                                 label_names=("format",))
+
+
+# CLASS
+class LiveCaptionWriter:
+    """
+    Class that writes caption cues to a file as the words in them are committed.
+
+    The file is only ever appended to, so it can be read (e.g. served to a player) while it is being written. A cue is
+    written once its sentence ends, once it has `max_block_length` words or once it spans `block_duration` seconds.
+    """
+
+    def __init__(self, output_path, transcript, caption_type="webvtt", block_duration=5, max_block_length=15):
+        """
+        Initialization method for a LiveCaptionWriter object.
+
+        Args:
+            output_path (str):
+                Path to the captions file. It is overwritten.
+
+            transcript (str):
+                The transcript that the words were aligned against.
+
+            caption_type (str):
+                Format of the captions. Either "webvtt" or "subrip".
+                (Default = "webvtt")
+
+            block_duration (float):
+                Maximum number of seconds that a cue may span.
+                (Default = 5)
+
+            max_block_length (int):
+                Maximum number of words in each cue.
+                (Default = 15)
+
+        Raises:
+            AssertionError:
+                If `caption_type` is not supported.
+        """
+
+        assert caption_type in ("webvtt", "subrip"), f"The caption type '{caption_type}' is not supported."
+
+        self.transcript = transcript
+        self.caption_type = caption_type
+        self.block_duration = block_duration
+        self.max_block_length = max_block_length
+
+        self._pending_words = []
+        self._num_cues = 0
+        self._last_cue_end = 0
+
+        # Start the file
+        self._file = open(output_path, "w")
+
+        if caption_type == "webvtt":
+            self._file.write("WEBVTT\n\n")
+            self._file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # Public Methods
+    def add_words(self, words):
+        """
+        Method that adds committed words, writing the cues that they complete.
+
+        Args:
+            words (list[dict]):
+                The committed words, in order.
+
+        Returns:
+            int:
+                Number of cues written.
+        """
+
+        num_cues = self._num_cues
+
+        for word in words:
+            # Start a new cue if this word would make the pending one too long
+            if self._pending_words and word["end"] - self._pending_words[0]["start"] > self.block_duration:
+                self._write_cue()
+
+            self._pending_words.append(word)
+
+            if len(self._pending_words) >= self.max_block_length or self._ends_sentence(word):
+                self._write_cue()
+
+        return self._num_cues - num_cues
+
+    def close(self):
+        """
+        Method that writes the pending cue and closes the file.
+        """
+
+        if self._pending_words:
+            self._write_cue()
+
+        self._file.close()
+
+    # Helper Methods
+    def _ends_sentence(self, word):
+        """
+        Helper method that checks whether a word is the last word of a sentence.
+
+        Args:
+            word (dict):
+                The word.
+
+        Returns:
+            bool
+        """
+
+        punctuation = TRAILING_PUNCTUATION_REGEX.match(self.transcript, word["endOffset"]).group()
+        return any(character in SENTENCE_ENDING_CHARACTERS for character in punctuation)
+
+    def _write_cue(self):
+        """
+        Helper method that writes the pending words as a cue.
+        """
+
+        first_word, last_word = self._pending_words[0], self._pending_words[-1]
+        self._pending_words = []
+
+        # Get the text of the cue, including the punctuation after its last word
+        end_offset = TRAILING_PUNCTUATION_REGEX.match(self.transcript, last_word["endOffset"]).end()
+        text = " ".join(self.transcript[first_word["startOffset"]:end_offset].split())
+
+        # Get the times of the cue, which must not go back before the previous cue
+        start_time = max(first_word["start"], self._last_cue_end)
+        end_time = max(last_word["end"], start_time + MIN_CUE_DURATION)
+        self._last_cue_end = end_time
+
+        # Append the cue
+        self._num_cues += 1
+
+        if self.caption_type == "webvtt":
+            self._file.write(f"{timedelta_to_webvtt_time(timedelta(seconds=start_time))} --> "
+                             f"{timedelta_to_webvtt_time(timedelta(seconds=end_time))}\n{text}\n\n")
+        else:
+            self._file.write(f"{self._num_cues}\n{timedelta_to_subrip_time(timedelta(seconds=start_time))} --> "
+                             f"{timedelta_to_subrip_time(timedelta(seconds=end_time))}\n{text}\n\n")
+
+        self._file.flush()
+        CUES_RENDERED.inc(format=self.caption_type)
@@ -0,0 +1,456 @@
+"""
+live_aligner.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Aligns a transcript against audio that is still arriving, committing word timings once they are stable.
+"""
+
+# IMPORTS
+import math
+import os
+import re
+import wave
+
+from src.metrics import REGISTRY
+
+# CONSTANTS
+WORD_REGEX = re.compile(r"(\w|\’\w|\'\w)+", re.UNICODE)  # Same word definition as gentle's
+
+DEFAULT_WORDS_PER_SECOND = 3  # Assumed speaking rate until enough words have been committed to measure it
+LOOKAHEAD_FACTOR = 1.5  # How many more words than the speaking rate predicts to send with each window
+LOOKAHEAD_WORDS = 2  # Number of extra words to send with each window
+
+COMMITTED_WORDS = REGISTRY.counter("video_to_captions_live_committed_words_total",
+                                   "Number of words whose timings were committed by the live aligner, by whether "
+                                   "they were aligned or interpolated.", label_names=("source",))
+LIVE_LAG = REGISTRY.gauge("video_to_captions_live_lag_seconds",
+                          "Number of seconds between the end of the audio received and the last committed word.")
+
+
+# CLASS
+class LiveAligner:
+    """
+    Class that aligns a transcript against a stream of audio.
+
+    Every `step_duration` seconds of new audio, the window from just before the last committed word to the end of the
+    audio received is aligned against the next uncommitted words of the transcript. A word is committed once it ends at
+    least `holdback_duration` seconds before the end of the audio and its timings agree with the previous window's, or
+    once it ends more than `max_lag` seconds before the end of the audio. Words that could not be aligned are committed
+    with interpolated timings once a later word is committed, or once the stream ends.
+    """
+
+    def __init__(self, backend, transcript, sample_rate, channels, sample_width, work_dir, step_duration=2,
+                 overlap_duration=1, holdback_duration=1, max_lag=10, max_window_duration=30,
+                 stability_tolerance=0.1):
+        """
+        Initialization method for a LiveAligner object.
+
+        Args:
+            backend (AlignmentBackend):
+                The started backend to align the windows with.
+
+            transcript (str):
+                The transcript.
+
+            sample_rate (int):
+                Sample rate of the audio.
+
+            channels (int):
+                Number of channels of the audio.
+
+            sample_width (int):
+                Number of bytes per sample of the audio.
+
+            work_dir (str):
+                Directory to write the windows of audio to.
+
+            step_duration (float):
+                Number of seconds of new audio to wait for before aligning again.
+                (Default = 2)
+
+            overlap_duration (float):
+                Number of seconds of audio before the last committed word to include in each window.
+                (Default = 1)
+
+            holdback_duration (float):
+                Number of seconds before the end of the audio that a word must end by to be committed.
+                (Default = 1)
+
+            max_lag (float):
+                Number of seconds before the end of the audio after which an aligned word is committed even if its
+                timings have not settled.
+                (Default = 10)
+
+            max_window_duration (float):
+                Maximum number of seconds of audio in each window. Older audio is dropped.
+                (Default = 30)
+
+            stability_tolerance (float):
+                Maximum number of seconds that the timings of a word may move by between windows for it to be stable.
+                (Default = 0.1)
+
+        Raises:
+            AssertionError:
+                If `max_window_duration` is not longer than `max_lag` plus `step_duration`.
+        """
+
+        assert max_window_duration > max_lag + step_duration, \
+            "The maximum window duration must be longer than the maximum lag plus the step duration."
+
+        self.backend = backend
+        self.transcript = transcript
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.work_dir = work_dir
+
+        self.step_duration = step_duration
+        self.overlap_duration = overlap_duration
+        self.holdback_duration = holdback_duration
+        self.max_lag = max_lag
+        self.max_window_duration = max_window_duration
+        self.stability_tolerance = stability_tolerance
+
+        # Get the words of the transcript
+        self.words = [(word.start(), word.end(), word.group()) for word in WORD_REGEX.finditer(transcript)]
+
+        # Attributes that track the progress of the alignment
+        self._audio = bytearray()  # Frames from `self._audio_start_time` up to the end of the audio received
+        self._audio_start_time = 0
+        self._received_frames = 0  # Counted in frames, so that reads of exactly `step_duration` always start a pass
+        self._last_pass_frames = 0
+        self._num_passes = 0
+
+        self._next_word = 0  # Index of the first word that is not committed
+        self._last_committed_end = 0
+        self._previous_timings = {}  # Timings of the words in the previous window, by their start offset
+
+    # Properties
+    @property
+    def frame_width(self):
+        """Number of bytes per frame of the audio."""
+        return self.channels * self.sample_width
+
+    @property
+    def _received_duration(self):
+        """Number of seconds of audio received so far."""
+        return self._received_frames / self.sample_rate
+
+    @property
+    def finished(self):
+        """Whether every word of the transcript has been committed."""
+        return self._next_word >= len(self.words)
+
+    # Public Methods
+    def feed(self, frames):
+        """
+        Method that adds the next frames of audio, aligning them if enough new audio has arrived.
+
+        Args:
+            frames (bytes):
+                The raw frames.
+
+        Returns:
+            list[dict]:
+                The words that were committed, in the timetable's word format.
+        """
+
+        self._audio += frames
+        self._received_frames += len(frames) // self.frame_width
+
+        if self._received_frames - self._last_pass_frames < int(self.step_duration * self.sample_rate):
+            return []
+
+        return self._align_window(final=False)
+
+    def finish(self):
+        """
+        Method that aligns the rest of the audio once the stream has ended, committing every remaining word of the
+        transcript. The words that were not found in the audio are spread between the last aligned word and the end of
+        the audio received.
+
+        Returns:
+            list[dict]:
+                The words that were committed, in the timetable's word format.
+        """
+
+        committed_words = self._align_window(final=True)
+
+        if not self.finished:  # No audio was left to align the remaining words against
+            committed_words += self._commit_words(self._next_word, len(self.words) - 1, {},
+                                                  end_time=self._received_duration)
+
+        return committed_words
+
+    # Helper Methods
+    def _align_window(self, final):
+        """
+        Helper method that aligns the current window of audio and commits the words that are stable.
+
+        Args:
+            final (bool):
+                Whether the stream has ended, in which case every remaining word is sent and committed.
+
+        Returns:
+            list[dict]:
+                The words that were committed.
+        """
+
+        self._last_pass_frames = self._received_frames
+
+        if self.finished:
+            return []
+
+        # Drop the audio that is before the window
+        self._trim_audio(max(self._last_committed_end - self.overlap_duration,
+                             self._received_duration - self.max_window_duration))
+
+        window_duration = self._received_duration - self._audio_start_time
+        if window_duration <= 0:
+            return []
+
+        # Choose the words to send, based on the speaking rate so far
+        if self._next_word >= 10 and self._last_committed_end > 0:
+            words_per_second = self._next_word / self._last_committed_end
+        else:
+            words_per_second = DEFAULT_WORDS_PER_SECOND
+
+        first_word = self._next_word
+        if final:
+            last_word = len(self.words) - 1  # No more audio is coming, so the rest of the transcript is in this window
+        else:
+            last_word = min(len(self.words) - 1, first_word + LOOKAHEAD_WORDS +
+                            math.ceil(window_duration * words_per_second * LOOKAHEAD_FACTOR))
+
+        # Align the window
+        window_path = self._write_window()
+        region_words = self.backend.align_region(window_path, self.transcript, self.words[first_word][0],
+                                                 self.words[last_word][1], 0, window_duration, open_end=not final)
+        os.remove(window_path)
+
+        timings = {}
+        for word in region_words:
+            if word.get("case") == "success" and "start" in word and "end" in word:
+                timings[word["startOffset"]] = (word["start"] + self._audio_start_time,
+                                                word["end"] + self._audio_start_time)
+
+        # Find the last word that is stable, stopping at the first aligned word that is not
+        last_stable_word = None
+        previous_end = self._last_committed_end
+
+        for i in range(first_word, last_word + 1):
+            timing = timings.get(self.words[i][0])
+
+            if timing is None or timing[0] < previous_end:
+                continue  # Unaligned, or out of order; interpolated if a later word is committed
+
+            if final or self._is_stable(self.words[i][0], timing):
+                last_stable_word = i
+                previous_end = timing[1]
+            else:
+                break
+
+        self._previous_timings = timings
+
+        # Commit the words up to the last stable word, or every remaining word if the stream has ended
+        committed_words = []
+
+        if final:
+            committed_words = self._commit_words(first_word, last_word, timings, end_time=self._received_duration)
+        elif last_stable_word is not None:
+            committed_words = self._commit_words(first_word, last_stable_word, timings)
+
+        LIVE_LAG.set(self._received_duration - self._last_committed_end)
+
+        return committed_words
+
+    def _is_stable(self, start_offset, timing):
+        """
+        Helper method that checks whether the timings of a word can be committed.
+
+        Args:
+            start_offset (int):
+                Start offset of the word.
+
+            timing (tuple[float, float]):
+                The start and end time of the word in the current window.
+
+        Returns:
+            bool
+        """
+
+        lag = self._received_duration - timing[1]
+
+        if lag > self.max_lag:
+            return True  # Waited long enough
+
+        previous_timing = self._previous_timings.get(start_offset)
+
+        return lag >= self.holdback_duration and previous_timing is not None and \
+            abs(previous_timing[0] - timing[0]) <= self.stability_tolerance and \
+            abs(previous_timing[1] - timing[1]) <= self.stability_tolerance
+
+    def _commit_words(self, first_word, last_word, timings, end_time=None):
+        """
+        Helper method that commits a run of words, interpolating the timings of the words that were not aligned.
+
+        Args:
+            first_word (int):
+                Index of the first word of the run.
+
+            last_word (int):
+                Index of the last word of the run, which must be aligned unless `end_time` is given.
+
+            timings (dict[int, tuple[float, float]]):
+                The timings of the aligned words, by their start offset.
+
+            end_time (float):
+                Time to spread the words after the last aligned word of the run up to. If `None`, every word of the run
+                must be followed by an aligned word.
+                (Default = None)
+
+        Returns:
+            list[dict]:
+                The committed words.
+        """
+
+        committed_words = []
+        unaligned_words = []  # Words waiting for the next aligned word, so that their timings can be interpolated
+
+        for i in range(first_word, last_word + 1):
+            start_offset, end_offset, text = self.words[i]
+            timing = timings.get(start_offset)
+            word = {"alignedWord": text.lower(), "endOffset": end_offset, "startOffset": start_offset, "word": text}
+
+            if timing is None or timing[0] < self._last_committed_end:
+                word["case"] = "not-found-in-audio"
+                unaligned_words.append(word)
+                continue
+
+            # Spread the unaligned words evenly between the last committed word and this one
+            self._spread_words(unaligned_words, timing[0])
+
+            word.update(case="success", start=round(timing[0], 2), end=round(timing[1], 2))
+
+            COMMITTED_WORDS.inc(len(unaligned_words), source="interpolated")
+            COMMITTED_WORDS.inc(source="aligned")
+
+            committed_words += unaligned_words + [word]
+            unaligned_words = []
+            self._last_committed_end = timing[1]
+
+        # Spread the words after the last aligned word up to the end time
+        if unaligned_words and end_time is not None:
+            end_time = max(end_time, self._last_committed_end)
+            self._spread_words(unaligned_words, end_time)
+
+            COMMITTED_WORDS.inc(len(unaligned_words), source="interpolated")
+
+            committed_words += unaligned_words
+            self._last_committed_end = end_time
+
+        self._next_word = last_word + 1
+
+        return committed_words
+
+    def _spread_words(self, words, end_time):
+        """
+        Helper method that spreads the timings of unaligned words evenly between the last committed word and a time.
+
+        Args:
+            words (list[dict]):
+                The unaligned words, which are updated in place.
+
+            end_time (float):
+                Time that the last of the words should end at.
+        """
+
+        gap = (end_time - self._last_committed_end) / (len(words) or 1)
+        for i, word in enumerate(words):
+            word["start"] = round(self._last_committed_end + i * gap, 2)
+            word["end"] = round(self._last_committed_end + (i + 1) * gap, 2)
+
+    def _trim_audio(self, start_time):
+        """
+        Helper method that drops the audio before a time.
+
+        Args:
+            start_time (float):
+                Time to keep the audio from.
+        """
+
+        num_frames = int((start_time - self._audio_start_time) * self.sample_rate)
+
+        if num_frames > 0:
+            del self._audio[:num_frames * self.frame_width]
+            self._audio_start_time += num_frames / self.sample_rate
+
+    def _write_window(self):
+        """
+        Helper method that writes the current window of audio to a WAV file.
+
+        Each window gets a new file name, since backends may cache the features of a file by its path.
+
+        Returns:
+            str:
+                Path to the WAV file.
+        """
+
+        self._num_passes += 1
+        window_path = os.path.join(self.work_dir, f"window_{self._num_passes}.wav")
+
+        with wave.open(window_path, "wb") as wav_obj:
+            wav_obj.setnchannels(self.channels)
+            wav_obj.setsampwidth(self.sample_width)
+            wav_obj.setframerate(self.sample_rate)
+            wav_obj.writeframes(self._audio)
+
+        return window_path
+
+
+# TESTING CODE
+if __name__ == "__main__":
+    # Imports
+    import tempfile
+
+    from src.alignment_backends import AlignmentBackend
+
+    # A stand-in backend that only finds the first sentence, with a word every half a second
+    class StandInBackend(AlignmentBackend):
+        name = "stand-in"
+
+        def align_region(self, audio_file_path, transcript, start_offset, end_offset, start_time, end_time,
+                         open_end=False):
+            words = []
+            for i, match in enumerate(WORD_REGEX.finditer(transcript, start_offset, end_offset)):
+                word = {"case": "not-found-in-audio", "word": match.group(), "startOffset": match.start(),
+                        "endOffset": match.end()}
+
+                if match.end() <= transcript.index(".") + 1:
+                    word.update(case="success", alignedWord=match.group().lower(), start=i * 0.5, end=i * 0.5 + 0.4)
+
+                words.append(word)
+
+            return words
+
+    # Feed four seconds of audio, then end the stream
+    testTranscript = "One two three four. Five six seven eight."
+
+    with tempfile.TemporaryDirectory() as testDir:
+        aligner = LiveAligner(StandInBackend(), testTranscript, 16000, 1, 2, testDir)
+
+        testWords = aligner.feed(bytes(4 * 16000 * 2))
+        testWords += aligner.finish()
+
+    print(testWords)
+
+    assert aligner.finished, "Some words were not committed once the stream ended."
+    assert [word["word"] for word in testWords] == testTranscript.replace(".", "").split(), \
+        "The committed words do not match the transcript."
+    assert all(earlier["end"] <= later["start"] for earlier, later in zip(testWords, testWords[1:])), \
+        "The committed words are out of order."
+    assert testWords[-1]["end"] == 4, "The words that were not found do not end with the audio."
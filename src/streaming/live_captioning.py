@@ -0,0 +1,96 @@
+"""
+live_captioning.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Captions a stream of audio as it arrives.
+"""
+
+# IMPORTS
+import tempfile
+
+from src.gentle_interface import create_backend
+from src.pipeline.rendering import CAPTION_TYPE_TO_EXTENSION
+from src.streaming.cue_writer import LiveCaptionWriter
+from src.streaming.live_aligner import LiveAligner
+from src.streaming.wav_stream import WavStream
+
+
+# FUNCTIONS
+def caption_stream(source, transcript_path, output_file_name="transcript", backend="gentle", caption_type="webvtt",
+                   block_duration=5, max_block_length=15, step_duration=2, max_lag=10, max_window_duration=30,
+                   idle_timeout=10):
+    """
+    Captions a WAV stream as it arrives, appending each cue to the captions file once its words are committed.
+
+    Args:
+        source (str):
+            Path to a growing WAV file, or "-" to read a WAV stream from the standard input.
+
+        transcript_path (str):
+            Path to the transcript.
+
+        output_file_name (str):
+            Name of the output file, without the extension.
+            (Default = "transcript")
+
+        backend (str):
+            Name of the alignment backend to use.
+            (Default = "gentle")
+
+        caption_type (str):
+            Format of the captions.
+            (Default = "webvtt")
+
+        block_duration (float):
+            Maximum number of seconds that a cue may span.
+            (Default = 5)
+
+        max_block_length (int):
+            Maximum number of words in each cue.
+            (Default = 15)
+
+        step_duration (float):
+            Number of seconds of new audio to wait for before aligning again.
+            (Default = 2)
+
+        max_lag (float):
+            Number of seconds behind the audio after which a word is committed even if its timings have not settled.
+            (Default = 10)
+
+        max_window_duration (float):
+            Maximum number of seconds of audio to align at a time. Must be longer than `max_lag` plus `step_duration`.
+            (Default = 30)
+
+        idle_timeout (float):
+            Number of seconds that a growing file may go without growing before the stream is considered over.
+            (Default = 10)
+
+    Returns:
+        str:
+            Path to the captions file.
+    """
+
+    with open(transcript_path, "r") as f:
+        transcript = f.read()
+
+    output_path = output_file_name + CAPTION_TYPE_TO_EXTENSION[caption_type]
+
+    with WavStream(source, idle_timeout=idle_timeout) as stream, create_backend(backend) as alignment_backend, \
+            tempfile.TemporaryDirectory() as work_dir, \
+            LiveCaptionWriter(output_path, transcript, caption_type=caption_type, block_duration=block_duration,
+                              max_block_length=max_block_length) as writer:
+        aligner = LiveAligner(alignment_backend, transcript, stream.sample_rate, stream.channels, stream.sample_width,
+                              work_dir, step_duration=step_duration, max_lag=max_lag,
+                              max_window_duration=max_window_duration)
+
+        # Align the audio as it arrives
+        while not stream.ended and not aligner.finished:
+            writer.add_words(aligner.feed(stream.read(step_duration)))
+
+        writer.add_words(aligner.finish())
+
+    return output_path
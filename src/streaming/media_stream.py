@@ -0,0 +1,162 @@
+"""
+media_stream.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Streams the audio of a video or audio file in an audio format, without decoding the whole file into memory.
+
+Notes:
+    - WAV files that are already in the audio format are read directly. Everything else is decoded and converted by an
+      `ffmpeg` process, whose output is read as a WAV stream.
+"""
+
+# IMPORTS
+import os
+import subprocess
+from contextlib import contextmanager
+
+from src.conversion import SUPPORTED_AUDIO_EXTENSIONS, SUPPORTED_VIDEO_EXTENSIONS
+from src.streaming.wav_stream import WavStream
+
+# CONSTANTS
+SAMPLE_WIDTH_TO_CODEC = {
+    1: "pcm_u8",
+    2: "pcm_s16le",
+    3: "pcm_s24le",
+    4: "pcm_s32le"
+}
+
+
+# HELPER FUNCTIONS
+def matches_audio_format(stream, audio_format):
+    """
+    Checks whether a WAV stream is already in an audio format.
+
+    Args:
+        stream (WavStream):
+            The WAV stream.
+
+        audio_format (AudioFormat):
+            The audio format. Properties that are `None` match anything.
+
+    Returns:
+        bool
+    """
+
+    return all(wanted is None or wanted == actual for wanted, actual in (
+        (audio_format.sample_rate, stream.sample_rate),
+        (audio_format.channels, stream.channels),
+        (audio_format.sample_width, stream.sample_width)
+    ))
+
+
+def build_ffmpeg_command(video_or_audio_file, audio_format):
+    """
+    Builds the command that makes `ffmpeg` write the audio of a file to its standard output as a WAV stream.
+
+    Args:
+        video_or_audio_file (str):
+            Path to the video or audio file.
+
+        audio_format (AudioFormat):
+            The audio format to convert the audio into. Properties that are `None` are left as they are, except for the
+            sample width, which defaults to 16-bit.
+
+    Returns:
+        list[str]
+    """
+
+    command = ["ffmpeg", "-nostdin", "-v", "error", "-i", video_or_audio_file, "-vn", "-f", "wav"]
+
+    if audio_format.channels is not None:
+        command += ["-ac", str(audio_format.channels)]
+
+    if audio_format.sample_rate is not None:
+        command += ["-ar", str(audio_format.sample_rate)]
+
+    return command + ["-acodec", SAMPLE_WIDTH_TO_CODEC[audio_format.sample_width or 2], "-"]
+
+
+# FUNCTIONS
+@contextmanager
+def open_media_stream(video_or_audio_file, audio_format):
+    """
+    Opens a stream of the audio of a video or audio file in an audio format. Use it as a context manager:
+
+        with open_media_stream("lecture.mp4", audio_format) as stream:
+            frames = stream.read(60)
+
+    Args:
+        video_or_audio_file (str):
+            Path to the video or audio file.
+
+        audio_format (AudioFormat):
+            The audio format to convert the audio into. Properties that are `None` are left as they are.
+
+    Yields:
+        WavStream:
+            The stream of the audio.
+
+    Raises:
+        AssertionError:
+            If the extension of the file is in neither `SUPPORTED_VIDEO_EXTENSIONS` nor `SUPPORTED_AUDIO_EXTENSIONS`.
+
+        FileNotFoundError:
+            If the file does not exist or is not found.
+
+        OSError:
+            If `ffmpeg` failed to decode the file.
+    """
+
+    # Check that the file can be streamed
+    if not os.path.isfile(video_or_audio_file):
+        raise FileNotFoundError(f"A file does not exist at the path '{video_or_audio_file}'.")
+
+    extension = os.path.splitext(video_or_audio_file)[-1]
+    assert extension in SUPPORTED_VIDEO_EXTENSIONS or extension in SUPPORTED_AUDIO_EXTENSIONS, \
+        "The format of the video or audio file is not currently supported. " \
+        f"(Supported: {list(SUPPORTED_VIDEO_EXTENSIONS.keys()) + list(SUPPORTED_AUDIO_EXTENSIONS.keys())})"
+
+    # Read WAV files that are already in the audio format directly
+    if extension == ".wav":
+        try:
+            stream = WavStream(video_or_audio_file, idle_timeout=0)  # The file is complete, so it ends once read
+        except AssertionError:
+            stream = None  # E.g. a compressed WAV file, which `ffmpeg` may still be able to decode
+
+        if stream is not None and matches_audio_format(stream, audio_format):
+            with stream:
+                yield stream
+            return
+
+        if stream is not None:
+            stream.close()
+
+    # Convert everything else with `ffmpeg`
+    process = subprocess.Popen(build_ffmpeg_command(video_or_audio_file, audio_format), stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE)
+
+    def __check_process(read_to_end):
+        """Helper function that waits for `ffmpeg` to exit, raising its error if it failed to decode the file."""
+        process.stdout.close()  # Stops `ffmpeg` early if the stream was not read to the end
+        error = process.stderr.read().decode("utf-8", errors="replace").strip()
+
+        if process.wait() != 0 and read_to_end:
+            raise OSError(f"`ffmpeg` failed to decode '{video_or_audio_file}': {error}")
+
+    try:
+        stream = WavStream(process.stdout)
+    except AssertionError:
+        __check_process(read_to_end=True)  # No WAV stream usually means that `ffmpeg` failed
+        raise
+
+    try:
+        yield stream
+    except BaseException:
+        __check_process(read_to_end=False)
+        raise
+
+    __check_process(read_to_end=stream.ended)
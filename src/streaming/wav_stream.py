@@ -0,0 +1,173 @@
+"""
+wav_stream.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Reads the frames of a WAV file that is still being written, or of a WAV stream on a pipe.
+"""
+
+# IMPORTS
+import struct
+import sys
+import time
+
+# CONSTANTS
+POLL_INTERVAL = 0.1  # Number of seconds to wait before checking a growing file for more data again
+IDLE_TIMEOUT = 10  # Number of seconds that a growing file may go without growing before the stream is considered over
+
+
+# CLASS
+class WavStream:
+    """
+    Class that reads the frames of a WAV file as they arrive.
+
+    The sizes in the header are ignored, since a file that is still being written (or a WAV stream written to a pipe,
+    e.g. by `ffmpeg -f wav -`) does not know its final size yet.
+    """
+
+    def __init__(self, source, poll_interval=POLL_INTERVAL, idle_timeout=IDLE_TIMEOUT):
+        """
+        Initialization method for a WavStream object.
+
+        Args:
+            source (union[str, io.BufferedIOBase]):
+                Path to a growing WAV file, "-" to read a WAV stream from the standard input, or a binary file object
+                to read a WAV stream from (e.g. the standard output of an `ffmpeg` process). A file object is not
+                closed with the stream.
+
+            poll_interval (float):
+                Number of seconds to wait before checking a growing file for more data again.
+                (Default = 0.1)
+
+            idle_timeout (float):
+                Number of seconds that a growing file may go without growing before the stream is considered over.
+                Not used for the standard input or a file object, which end when they are closed.
+                (Default = 10)
+
+        Raises:
+            AssertionError:
+                If the stream is not an uncompressed WAV stream.
+        """
+
+        self.is_pipe = not isinstance(source, str) or source == "-"
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+
+        if not self.is_pipe:
+            self._file = open(source, "rb")
+        else:
+            self._file = sys.stdin.buffer if source == "-" else source
+        self._ended = False
+
+        # Read the header
+        self.sample_rate, self.channels, self.sample_width = self._read_header()
+        self.frame_width = self.channels * self.sample_width
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # Properties
+    @property
+    def ended(self):
+        """Whether the stream has ended."""
+        return self._ended
+
+    # Public Methods
+    def read(self, duration):
+        """
+        Method that reads the next frames of the stream, waiting for them to arrive.
+
+        Args:
+            duration (float):
+                Number of seconds of audio to read.
+
+        Returns:
+            bytes:
+                The raw frames. Shorter than `duration` only if the stream ended; empty once it has.
+        """
+
+        return self._read_exactly(int(duration * self.sample_rate) * self.frame_width, whole_frames=True)
+
+    def close(self):
+        """
+        Method that closes the stream.
+        """
+
+        if not self.is_pipe:
+            self._file.close()
+
+    # Helper Methods
+    def _read_header(self):
+        """
+        Helper method that reads the header of the WAV stream up to the start of its frames.
+
+        Returns:
+            tuple[int, int, int]:
+                The sample rate, number of channels and sample width of the stream.
+        """
+
+        riff = self._read_exactly(12)
+        assert len(riff) == 12 and riff[:4] == b"RIFF" and riff[8:] == b"WAVE", "The stream is not a WAV stream."
+
+        audio_format = None
+
+        while True:
+            chunk_header = self._read_exactly(8)
+            assert len(chunk_header) == 8, "The WAV stream has no frames."
+
+            chunk_id, chunk_size = chunk_header[:4], struct.unpack("<I", chunk_header[4:])[0]
+
+            if chunk_id == b"data":
+                assert audio_format is not None, "The WAV stream has no format chunk."
+                return audio_format
+
+            chunk = self._read_exactly(chunk_size + chunk_size % 2)  # Chunks are padded to an even size
+
+            if chunk_id == b"fmt ":
+                format_tag, channels, sample_rate = struct.unpack("<HHI", chunk[:8])
+                sample_width = struct.unpack("<H", chunk[14:16])[0] // 8
+
+                assert format_tag in (1, 0xFFFE), "Only uncompressed WAV streams are supported."
+                audio_format = (sample_rate, channels, sample_width)
+
+    def _read_exactly(self, num_bytes, whole_frames=False):
+        """
+        Helper method that reads a number of bytes, waiting for them to arrive.
+
+        Args:
+            num_bytes (int):
+                Number of bytes to read.
+
+            whole_frames (bool):
+                Whether the bytes returned at the end of the stream should be trimmed to whole frames.
+                (Default = False)
+
+        Returns:
+            bytes:
+                The bytes read. Shorter than `num_bytes` only if the stream ended.
+        """
+
+        data = b""
+        last_growth_time = time.time()
+
+        while len(data) < num_bytes and not self._ended:
+            chunk = self._file.read(num_bytes - len(data))
+
+            if chunk:
+                data += chunk
+                last_growth_time = time.time()
+            elif self.is_pipe or time.time() - last_growth_time > self.idle_timeout:
+                self._ended = True  # The pipe was closed, or the file stopped growing
+            else:
+                time.sleep(self.poll_interval)
+
+        if whole_frames:
+            data = data[:len(data) - len(data) % self.frame_width]
+
+        return data
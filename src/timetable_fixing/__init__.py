@@ -1 +1,2 @@
+from .parallel_aligner import align_sentence_parallel, find_shard_boundaries
 from .transcript_aligner import Aligner
@@ -0,0 +1,236 @@
+"""
+parallel_aligner.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Aligns the transcript by sentence in several processes, by cutting the timetable into shards at sentence
+             boundaries.
+
+Notes:
+    - `Aligner.align_sentence` forgets almost everything about the previous caption block when a sentence ends on a
+      word that has an end time: the next block only needs that end time and the current block length. Cutting the
+      timetable right after such words gives shards whose starting state is known in advance, so each shard can be
+      aligned independently and the results concatenated. The output is identical to the serial output.
+    - The workers memory-map the timetable file instead of receiving copies of the words, so only the shard bounds are
+      sent to them and only the caption blocks are sent back.
+"""
+
+# IMPORTS
+import concurrent.futures
+import os
+
+import numpy as np
+
+from src.timetable_fixing.transcript_aligner import Aligner
+from src.timetable_storage import load_timetable, save_timetable, Timetable
+from src.workspace import Workspace
+
+# CONSTANTS
+SENTENCE_ENDING_CHARACTERS = ".!?"  # Same as the `Aligner`'s
+
+SHARDS_PER_PROCESS = 4  # More shards than processes, so that a slow shard does not hold up the others
+MIN_WORDS_PER_SHARD = 5000  # Shorter shards cost more to dispatch than they save
+
+WORKER_STATE = {}  # Filled in by `init_worker` in each worker process
+
+
+# HELPER FUNCTIONS
+def init_worker(transcript, timetable_path):
+    """
+    Prepares a worker process by memory-mapping the timetable file.
+
+    Args:
+        transcript (str):
+            The transcript.
+
+        timetable_path (str):
+            Path to the timetable file.
+    """
+
+    WORKER_STATE["aligner"] = Aligner(transcript, load_timetable(timetable_path))
+
+
+def align_shard(shard, max_block_length):
+    """
+    Aligns one shard of the timetable by sentence in a worker process.
+
+    Args:
+        shard (tuple[int, int, float, int]):
+            The index of the first word of the shard, the index of the word one after the shard, and the block end
+            time and block length that the shard starts with.
+
+        max_block_length (int):
+            The maximum number of timetabled words that can be in each caption block.
+
+    Returns:
+        list[dict]:
+            The aligned text dictionary of the shard.
+    """
+
+    start_index, end_index, block_end_time, block_length = shard
+    return WORKER_STATE["aligner"].align_sentence_range(start_index, end_index, max_block_length=max_block_length,
+                                                        block_end_time=block_end_time, block_length=block_length)
+
+
+# FUNCTIONS
+def find_shard_boundaries(transcript, timetable, num_shards):
+    """
+    Cuts a timetable into shards at sentence boundaries.
+
+    Args:
+        transcript (str):
+            The transcript.
+
+        timetable (Timetable):
+            The columnar timetable.
+
+        num_shards (int):
+            The desired number of shards. Fewer shards are returned if there are not enough sentence boundaries.
+
+    Returns:
+        list[tuple[int, int, float, int]]:
+            The index of the first word of each shard, the index of the word one after the shard, and the block end
+            time and block length that the shard starts with, in order.
+    """
+
+    num_words = len(timetable)
+    end_offsets = timetable.columns["end_offset"].astype(np.int64)
+    end_times = timetable.columns["end"]
+
+    # Find the words that end a sentence and have an end time, checking the cheap conditions on all words at once
+    codes = np.frombuffer(transcript.encode("utf-32-le"), dtype="<u4")
+    has_next_character = end_offsets + 1 < len(codes)
+
+    ending_codes = [ord(char) for char in SENTENCE_ENDING_CHARACTERS]
+
+    candidates = np.flatnonzero(has_next_character & ~np.isnan(end_times))
+    candidates = candidates[np.isin(codes[end_offsets[candidates]], ending_codes)]
+    candidates = np.array([i for i in candidates if transcript[end_offsets[i] + 1].isspace()], dtype=np.int64)
+
+    # Cut after the boundary nearest to each evenly spaced target, never at the very end
+    cut_words = []
+    for shard_num in range(1, num_shards):
+        position = np.searchsorted(candidates, num_words * shard_num // num_shards)
+        if position < len(candidates) and candidates[position] < num_words - 1 and \
+                (not cut_words or candidates[position] > cut_words[-1]):
+            cut_words.append(int(candidates[position]))
+
+    # Build the shards
+    shards = []
+    start_index, block_end_time, block_length = 0, None, 0
+
+    for cut_word in cut_words:
+        shards.append((start_index, cut_word + 1, block_end_time, block_length))
+
+        # A sentence ended on the cut word, leaving a block length of one (see `Aligner.align_sentence_range`)
+        start_index, block_end_time, block_length = cut_word + 1, float(end_times[cut_word]), 1
+
+    shards.append((start_index, num_words, block_end_time, block_length))
+    return shards
+
+
+def align_sentence_parallel(transcript, timetable, max_block_length=15, num_processes=None):
+    """
+    Aligns the transcript by sentence, splitting the work between several processes.
+
+    The output is identical to `Aligner(transcript, timetable).align_sentence(max_block_length)`.
+
+    Args:
+        transcript (str):
+            The transcript.
+
+        timetable (union[list[dict], Timetable]):
+            The timetable of spoken words. If it is not memory-mapped from a timetable file, it is saved to a temporary
+            one first so that the workers can share it.
+
+        max_block_length (int):
+            The maximum number of timetabled words that can be in each caption block.
+            (Default = 15)
+
+        num_processes (int):
+            Number of processes to use. Use `None` to use one per CPU.
+            (Default = None)
+
+    Returns:
+        list[dict]:
+            The aligned text dictionary.
+    """
+
+    num_processes = num_processes or os.cpu_count() or 1
+    num_shards = min(num_processes * SHARDS_PER_PROCESS, len(timetable) // MIN_WORDS_PER_SHARD)
+
+    if num_processes <= 1 or num_shards <= 1:
+        return Aligner(transcript, timetable).align_sentence(max_block_length)
+
+    with Workspace(prefix="timetable_", expected_size=len(timetable) * 64) as workspace:
+        # Make sure that the workers can memory-map the timetable
+        if not (isinstance(timetable, Timetable) and timetable.path is not None):
+            save_timetable(timetable, workspace.path("shared.timetable"))
+            timetable = load_timetable(workspace.path("shared.timetable"))
+
+        shards = find_shard_boundaries(transcript, timetable, num_shards)
+        if len(shards) <= 1:
+            return Aligner(transcript, timetable).align_sentence(max_block_length)
+
+        # Align the shards, and merge the caption blocks in order
+        with concurrent.futures.ProcessPoolExecutor(max_workers=num_processes, initializer=init_worker,
+                                                    initargs=(transcript, timetable.path)) as executor:
+            shard_blocks = executor.map(align_shard, shards, [max_block_length] * len(shards))
+            return [block for blocks in shard_blocks for block in blocks]
+
+
+# TESTING CODE
+if __name__ == "__main__":
+    # Imports
+    import random
+    import time
+
+    from src.conversion import timetable_to_webvtt
+
+    # Generate a book-length transcript and timetable
+    random.seed(0)
+    numWords = 1_000_000
+
+    transcriptParts, bookTimetable = [], []
+    position, currTime = 0, 0.0
+
+    for wordNum in range(numWords):
+        word = random.choice(["the", "voice", "room", "again", "resonant", "frequencies", "I", "am"])
+        punctuation = random.choice([".", "?", ",", ""] + [""] * 8)
+
+        bookWord = {"case": "success", "word": word, "alignedWord": word.lower(), "startOffset": position,
+                    "endOffset": position + len(word), "start": round(currTime, 2),
+                    "end": round(currTime + 0.3, 2)}
+        if random.random() < 0.02:  # Some words were not aligned
+            bookWord = {"case": "not-found-in-audio", "word": word, "startOffset": position,
+                        "endOffset": position + len(word)}
+
+        bookTimetable.append(bookWord)
+        transcriptParts.append(word + punctuation + " ")
+        position += len(word) + len(punctuation) + 1
+        currTime += 0.35
+
+    bookTranscript = "".join(transcriptParts)
+
+    # Time the serial path
+    startTime = time.time()
+    serialOutput = timetable_to_webvtt(Aligner(bookTranscript, bookTimetable).align_sentence()).encode("utf-8")
+    serialDuration = time.time() - startTime
+    print(f"Serial: {serialDuration:.2f}s")
+
+    # Time the parallel path across core counts, checking that the output is byte-identical
+    for numProcesses in [1, 2, 4, 8, 16]:
+        if numProcesses > 2 * (os.cpu_count() or 1):
+            break
+
+        startTime = time.time()
+        parallelOutput = timetable_to_webvtt(align_sentence_parallel(bookTranscript, bookTimetable,
+                                                                     num_processes=numProcesses)).encode("utf-8")
+        parallelDuration = time.time() - startTime
+
+        assert parallelOutput == serialOutput, f"The output with {numProcesses} processes differs."
+        print(f"{numProcesses} process(es): {parallelDuration:.2f}s ({serialDuration / parallelDuration:.2f}x); "
+              f"output is identical")
@@ -2,7 +2,7 @@
 transcript_aligner.py
 
 Created on 2021-05-02
-Updated on 2021-05-13
+Updated on 2026-10-19
 
 Copyright © Ryan Kan
 
@@ -13,6 +13,8 @@ Description: Uses the timetable and transcript to align text according to a cert
 import re
 from math import ceil
 
+from src.timetable_storage import iterate_timetable, WORDS_PER_CHUNK
+
 
 # CLASS
 class Aligner:
@@ -21,7 +23,7 @@ class Aligner:
     """
 
     # Dunder methods
-    def __init__(self, transcript, timetable):
+    def __init__(self, transcript, timetable, words_per_chunk=WORDS_PER_CHUNK):
         """
         Initialisation method.
 
@@ -31,11 +33,16 @@ class Aligner:
 
             timetable (list[dict]):
                 The timetable of the spoken words, as returned by the gentle interface.
+
+            words_per_chunk (int):
+                Number of words of a `Timetable` to decode at a time when aligning by sentence.
+                (Default = WORDS_PER_CHUNK)
         """
 
         # Object attributes
         self.transcript = transcript
         self.timetable = timetable
+        self.words_per_chunk = words_per_chunk
         self.duration = int(ceil(timetable[-1]["end"]))  # Get the time that the last word was spoken
 
     # Methods
@@ -59,6 +66,27 @@ class Aligner:
                 - If `self.duration` is less than or equal to `block_duration`.
         """
 
+        return list(self.iterate_time_blocks(block_duration))
+
+    def iterate_time_blocks(self, block_duration=5):
+        """
+        Method that aligns the transcript by time, yielding each caption block as soon as it is made.
+
+        Args:
+            block_duration (float):
+                The length of time that makes up each block.
+                (Default = 5)
+
+        Yields:
+            dict:
+                The caption blocks of the aligned text dictionary.
+
+        Raises:
+            AssertionError:
+                - If the value of `block_duration` is less than 3.
+                - If `self.duration` is less than or equal to `block_duration`.
+        """
+
         # Assert that the value of `block_duration` is valid
         assert block_duration >= 3, "The value of `block_duration` must be more than 3."
         assert self.duration > block_duration, "The length of the audio file is less than the block " \
@@ -71,7 +99,6 @@ class Aligner:
         num_processed_words = len(self.timetable)  # Of course, some of the words may not have been processed
 
         # Start creating the aligned transcript
-        aligned_words = []
         curr_processed_word_index = 0  # Stores the current processed word index
 
         for block_num in range(num_blocks):
@@ -110,11 +137,8 @@ class Aligner:
                 "text": words
             }
 
-            # Append that dictionary to the `aligned_words` list
-            aligned_words.append(dict_with_more_info)
-
-        # Return the `aligned_words` list
-        return aligned_words
+            # Yield that dictionary
+            yield dict_with_more_info
 
     def align_sentence(self, max_block_length=15):
         """
@@ -134,18 +158,79 @@ class Aligner:
             - A sentence is defined to be a string of text that ends with a punctuation mark (".", "?" and "!" only).
         """
 
+        return self.align_sentence_range(0, len(self.timetable), max_block_length=max_block_length)
+
+    def iterate_sentences(self, max_block_length=15):
+        """
+        Method that aligns the transcript by sentence, yielding each caption block as soon as it is made, so that only
+        a chunk of the timetable's words is held in memory at a time.
+
+        Args:
+            max_block_length (int):
+                The maximum number of timetabled words that can be in each caption block.
+                (Default = 15)
+
+        Yields:
+            dict:
+                The caption blocks of the aligned text dictionary.
+        """
+
+        return self.iterate_sentence_range(0, len(self.timetable), max_block_length=max_block_length)
+
+    def align_sentence_range(self, start_index, end_index, max_block_length=15, block_end_time=None,
+                             block_length=0):
+        """
+        Method that aligns a range of the timetable by sentence, carrying on from the state that the words before the
+        range left behind. Used to align shards of the timetable in parallel.
+
+        Args:
+            start_index (int):
+                Index of the first timetable word of the range.
+
+            end_index (int):
+                Index of the timetable word that is one after the range.
+
+            max_block_length (int):
+                The maximum number of timetabled words that can be in each caption block.
+                (Default = 15)
+
+            block_end_time (float):
+                The ending time of the last caption block before the range.
+                (Default = None)
+
+            block_length (int):
+                The length of the current caption block at the start of the range.
+                (Default = 0)
+
+        Returns:
+            list[dict]:
+                The aligned text dictionary of the range.
+        """
+
+        return list(self.iterate_sentence_range(start_index, end_index, max_block_length=max_block_length,
+                                                block_end_time=block_end_time, block_length=block_length))
+
+    def iterate_sentence_range(self, start_index, end_index, max_block_length=15, block_end_time=None,
+                               block_length=0):
+        """
+        Method that aligns a range of the timetable by sentence, yielding each caption block as soon as it is made.
+        See `align_sentence_range` for the arguments.
+
+        Yields:
+            dict:
+                The caption blocks of the aligned text dictionary of the range.
+        """
+
         # Define sentence ending characters
         sentence_ending_characters = [".", "!", "?"]
 
         # Iterate through every timetable word
-        aligned_words = []  # Stores the sentences with the start and end times
         block_start_time = None  # The starting time of the current caption block
-        block_end_time = None  # The ending time of the current caption block
         block_start_index = None  # The starting index of the current caption block
-        block_length = 0  # Stores the length of the current caption block
         start_of_sentence = True  # Whether the current word is the start of a new sentence
 
-        for timetable_word in self.timetable:
+        for timetable_word in iterate_timetable(self.timetable, start_index, end_index,
+                                                words_per_chunk=self.words_per_chunk):
             # Update the block's starting time & starting index, if needed
             if block_start_time is None:
                 # Set the block's starting index
@@ -177,15 +262,15 @@ class Aligner:
                     second_per_char = block_start_time / block_start_index  # Speed of reading each character
                     block_end_time = second_per_char * end_pos
 
-                # Create the dictionary that will go into the `aligned_words` array
+                # Create the dictionary of the caption block
                 text = self.transcript[block_start_index:end_pos + 1]  # Get text from transcript
                 text = re.sub(r"\s+", " ", text.strip().replace("\n", " "))  # Process the text for display
 
-                aligned_words.append({
+                yield {
                     "start_time": block_start_time,
                     "end_time": block_end_time,
                     "text": text
-                })
+                }
 
                 # Update the block's starting time, starting index and block length
                 block_start_time = None  # Wait for the new word to override this
@@ -215,15 +300,15 @@ class Aligner:
                         second_per_char = block_start_time / block_start_index  # Speed of reading each character
                         block_end_time = second_per_char * non_whitespace_char_pos
 
-                    # Create the dictionary that will go into the `aligned_words` array
+                    # Create the dictionary of the caption block
                     text = self.transcript[block_start_index:non_whitespace_char_pos + 1]
                     text = re.sub(r"\s+", " ", text.strip().replace("\n", " "))  # Process the text for display
 
-                    aligned_words.append({
+                    yield {
                         "start_time": block_start_time,
                         "end_time": block_end_time,
                         "text": text
-                    })
+                    }
 
                     # Update the block's starting time, starting index and block length
                     block_start_time = block_end_time  # The sentence already started
@@ -240,15 +325,15 @@ class Aligner:
                         second_per_char = block_start_time / block_start_index  # Speed of reading each character
                         block_end_time = second_per_char * end_pos
 
-                    # Create the dictionary that will go into the `aligned_words` array
+                    # Create the dictionary of the caption block
                     text = self.transcript[block_start_index:end_pos + 1]
                     text = re.sub(r"\s+", " ", text.strip().replace("\n", " "))  # Process the text for display
 
-                    aligned_words.append({
+                    yield {
                         "start_time": block_start_time,
                         "end_time": block_end_time,
                         "text": text
-                    })
+                    }
 
                     # Update the block's starting time
                     block_start_time = block_end_time  # Continue the sentence in the next block
@@ -259,18 +344,15 @@ class Aligner:
             start_of_sentence = False
             block_length += 1  # Added one more timetabled word
 
-        # Return the `aligned_words` array
-        return aligned_words
-
 
 # TESTING CODE
 if __name__ == "__main__":
     # Imports
-    import ast
+    from src.timetable_storage import load_timetable
 
     # Read the timetable and transcript
     aTranscript = open("../../TranscriptClean.txt", "r").read()
-    aTimetable = ast.literal_eval(open("TestResponse.txt", "r").read())
+    aTimetable = load_timetable("TestResponse.timetable")  # Saved with `main.py --save-timetable`
 
     # Create an `Aligner` object
     aligner = Aligner(aTranscript, aTimetable)
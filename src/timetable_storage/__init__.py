@@ -0,0 +1,2 @@
+from .timetable_file import iterate_timetable, load_timetable, save_timetable, Timetable, timetable_to_columns, \
+    TimetableWriter, WORDS_PER_CHUNK
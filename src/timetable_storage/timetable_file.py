@@ -0,0 +1,550 @@
+"""
+timetable_file.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Saves timetables in a compact columnar binary format, and loads them back by memory-mapping the file.
+
+Notes:
+    - The file starts with `MAGIC`, followed by the length of a JSON header (as a little-endian unsigned 32-bit integer)
+      and the JSON header itself. The header holds the number of words, the names of the cases and the dtype, offset
+      and length of every column. Every column starts on an 8-byte boundary so that it can be viewed in place.
+    - Missing start and end times (i.e. words that were not aligned) are stored as NaN.
+"""
+
+# IMPORTS
+import json
+import math
+import os
+import shutil
+import struct
+from collections.abc import Sequence
+
+import numpy as np
+
+# CONSTANTS
+MAGIC = b"VTCTIME1"
+HEADER_LENGTH_FORMAT = "<I"
+ALIGNMENT = 8
+
+COLUMN_DTYPES = {
+    "start": "<f8",
+    "end": "<f8",
+    "start_offset": "<u4",
+    "end_offset": "<u4",
+    "case": "u1",
+    "word_bounds": "<u4",  # Bounds of each word inside the "words" blob; has one more entry than there are words
+    "words": "u1",  # UTF-8 encoded words, concatenated
+    "aligned_word_bounds": "<u4",
+    "aligned_words": "u1"
+}
+
+WORDS_PER_CHUNK = 65536  # Number of words that `iterate_timetable` decodes at a time
+
+
+# HELPER FUNCTIONS
+def encode_strings(strings):
+    """
+    Concatenates strings into one UTF-8 blob.
+
+    Args:
+        strings (list[str])
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]:
+            The bounds of each string inside the blob and the blob itself.
+    """
+
+    encoded = [string.encode("utf-8") for string in strings]
+
+    bounds = np.zeros(len(encoded) + 1, dtype=COLUMN_DTYPES["word_bounds"])
+    np.cumsum([len(string) for string in encoded], out=bounds[1:])
+
+    return bounds, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def build_header(num_words, cases, column_sizes):
+    """
+    Lays out the columns of a timetable file and builds its header.
+
+    Args:
+        num_words (int):
+            Number of words in the timetable.
+
+        cases (list[str]):
+            The names of the cases.
+
+        column_sizes (dict[str, tuple[int, int]]):
+            The number of entries and number of bytes of each column, in the order that the columns are written.
+
+    Returns:
+        tuple[bytes, dict[str, dict]]:
+            The header, padded so that the data starts on an aligned boundary, and the layout of the columns relative
+            to the end of the header.
+    """
+
+    # Work out where each column goes, relative to the end of the header
+    layout = {}
+    position = 0
+    for name, (length, num_bytes) in column_sizes.items():
+        position += -position % ALIGNMENT
+        layout[name] = {"dtype": COLUMN_DTYPES[name], "offset": position, "length": length}
+        position += num_bytes
+
+    # Build the header, padding it so that the data starts on an aligned boundary
+    header = json.dumps({"num_words": num_words, "cases": cases, "columns": layout}).encode("utf-8")
+    header += b" " * (-(len(MAGIC) + struct.calcsize(HEADER_LENGTH_FORMAT) + len(header)) % ALIGNMENT)
+
+    return header, layout
+
+
+# CLASS
+class Timetable(Sequence):
+    """
+    A read-only timetable whose words are stored in columns, usually memory-mapped from a timetable file.
+
+    Indexing a `Timetable` gives the same word dictionaries as the alignment backends produce, so it can be used
+    wherever a timetable list is used (e.g. by the `Aligner`).
+    """
+
+    # Dunder methods
+    def __init__(self, columns, cases, path=None):
+        """
+        Initialisation method.
+
+        Args:
+            columns (dict[str, np.ndarray]):
+                The columns, keyed by the names in `COLUMN_DTYPES`.
+
+            cases (list[str]):
+                The names of the cases; the "case" column holds indices into this list.
+
+            path (str):
+                Path to the timetable file that the columns are memory-mapped from, so that other processes can map
+                the same file. Use `None` if the columns are not memory-mapped.
+                (Default = None)
+        """
+
+        self.columns = columns
+        self.cases = cases
+        self.path = path
+
+    def __len__(self):
+        return len(self.columns["start"])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+
+            return self._get_words(start, max(start, stop))
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Timetable index out of range.")
+
+        columns = self.columns
+        word = {
+            "case": self.cases[columns["case"][index]],
+            "endOffset": int(columns["end_offset"][index]),
+            "startOffset": int(columns["start_offset"][index]),
+            "word": self._get_string("word_bounds", "words", index)
+        }
+
+        start = float(columns["start"][index])
+        end = float(columns["end"][index])
+
+        if not math.isnan(start):
+            word["start"] = start
+        if not math.isnan(end):
+            word["end"] = end
+
+        aligned_word = self._get_string("aligned_word_bounds", "aligned_words", index)
+        if aligned_word:
+            word["alignedWord"] = aligned_word
+
+        return word
+
+    # Helper methods
+    def _get_words(self, start, stop):
+        """
+        Helper method that decodes a run of consecutive words at once, which is much faster than decoding them one by
+        one.
+
+        Args:
+            start (int):
+                Index of the first word.
+
+            stop (int):
+                Index of the word one after the run.
+
+        Returns:
+            list[dict]
+        """
+
+        columns = self.columns
+        cases = [self.cases[case] for case in columns["case"][start:stop].tolist()]
+        words = self._get_strings("word_bounds", "words", start, stop)
+        aligned_words = self._get_strings("aligned_word_bounds", "aligned_words", start, stop)
+
+        run = []
+        for case, end_offset, start_offset, word, start_time, end_time, aligned_word in zip(
+                cases, columns["end_offset"][start:stop].tolist(), columns["start_offset"][start:stop].tolist(), words,
+                columns["start"][start:stop].tolist(), columns["end"][start:stop].tolist(), aligned_words):
+            word = {"case": case, "endOffset": end_offset, "startOffset": start_offset, "word": word}
+
+            if not math.isnan(start_time):
+                word["start"] = start_time
+            if not math.isnan(end_time):
+                word["end"] = end_time
+            if aligned_word:
+                word["alignedWord"] = aligned_word
+
+            run.append(word)
+
+        return run
+
+    def _get_strings(self, bounds_column, blob_column, start, stop):
+        """
+        Helper method that decodes a run of consecutive strings from a blob column.
+
+        Args:
+            bounds_column (str):
+                Name of the column that holds the bounds of the strings.
+
+            blob_column (str):
+                Name of the column that holds the blob.
+
+            start (int):
+                Index of the first string.
+
+            stop (int):
+                Index of the string one after the run.
+
+        Returns:
+            list[str]
+        """
+
+        bounds = self.columns[bounds_column][start:stop + 1].tolist()
+        blob = bytes(self.columns[blob_column][bounds[0]:bounds[-1]])
+
+        return [blob[string_start - bounds[0]:string_end - bounds[0]].decode("utf-8")
+                for string_start, string_end in zip(bounds, bounds[1:])]
+
+    def _get_string(self, bounds_column, blob_column, index):
+        """
+        Helper method that decodes one string from a blob column.
+
+        Args:
+            bounds_column (str):
+                Name of the column that holds the bounds of the strings.
+
+            blob_column (str):
+                Name of the column that holds the blob.
+
+            index (int):
+                Index of the string.
+
+        Returns:
+            str
+        """
+
+        bounds = self.columns[bounds_column]
+        return bytes(self.columns[blob_column][bounds[index]:bounds[index + 1]]).decode("utf-8")
+
+
+class TimetableWriter:
+    """
+    Writes a timetable file a few words at a time, so that the whole timetable is never held in memory.
+
+    The columns are spooled to temporary files next to the timetable file as the words are added, and are joined into
+    the timetable file when the writer is closed. Use it as a context manager:
+
+        with TimetableWriter("captions.timetable") as writer:
+            writer.add_words(words)
+    """
+
+    # Dunder methods
+    def __init__(self, path):
+        """
+        Initialisation method.
+
+        Args:
+            path (str):
+                Path to the timetable file. It is only written once the writer is closed.
+        """
+
+        self.path = path
+        self.num_words = 0
+        self.cases = []
+
+        self._case_indices = {}
+        self._column_sizes = {name: (0, 0) for name in COLUMN_DTYPES}
+        self._blob_lengths = {"word_bounds": 0, "aligned_word_bounds": 0}  # Current length of the blob of each bounds
+        self._spools = {name: open(self._spool_path(name), "wb") for name in COLUMN_DTYPES}
+
+        # The bounds columns have one more entry than there are words
+        for bounds_column in self._blob_lengths:
+            self._write_column(bounds_column, np.zeros(1, dtype=COLUMN_DTYPES[bounds_column]))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close(discard=exc_type is not None)
+
+    # Methods
+    def add_words(self, words):
+        """
+        Method that appends words to the timetable.
+
+        Args:
+            words (list[dict]):
+                The words, in the same format as the timetable's words.
+
+        Raises:
+            AssertionError:
+                If the timetable has more cases than the case column can index.
+        """
+
+        if not words:
+            return
+
+        columns, cases = timetable_to_columns(words)
+
+        # Index the cases in the order that they first appear in the whole timetable
+        for case in cases:
+            if case not in self._case_indices:
+                self._case_indices[case] = len(self.cases)
+                self.cases.append(case)
+
+        assert len(self.cases) <= np.iinfo(COLUMN_DTYPES["case"]).max + 1, "The timetable has too many cases."
+
+        case_indices = np.array([self._case_indices[case] for case in cases], dtype=COLUMN_DTYPES["case"])
+        columns["case"] = case_indices[columns["case"]]
+
+        # Continue the bounds from the end of the blobs so far, dropping their leading zero
+        for bounds_column, blob_column in (("word_bounds", "words"), ("aligned_word_bounds", "aligned_words")):
+            columns[bounds_column] = columns[bounds_column][1:] + self._blob_lengths[bounds_column]
+            self._blob_lengths[bounds_column] += len(columns[blob_column])
+
+        for name, column in columns.items():
+            self._write_column(name, column)
+
+        self.num_words += len(words)
+
+    def close(self, discard=False):
+        """
+        Method that joins the spooled columns into the timetable file.
+
+        Args:
+            discard (bool):
+                Whether the spooled columns should be thrown away instead, without writing the timetable file.
+                (Default = False)
+        """
+
+        if self._spools is None:
+            return
+
+        for spool in self._spools.values():
+            spool.close()
+
+        self._spools = None
+
+        try:
+            if discard:
+                return
+
+            header, layout = build_header(self.num_words, self.cases, self._column_sizes)
+
+            with open(self.path, "wb") as f:
+                f.write(MAGIC)
+                f.write(struct.pack(HEADER_LENGTH_FORMAT, len(header)))
+                f.write(header)
+
+                data_start = f.tell()
+                for name in COLUMN_DTYPES:
+                    f.write(b"\x00" * (data_start + layout[name]["offset"] - f.tell()))
+
+                    with open(self._spool_path(name), "rb") as spool:
+                        shutil.copyfileobj(spool, f)
+        finally:
+            for name in COLUMN_DTYPES:
+                os.remove(self._spool_path(name))
+
+    # Helper methods
+    def _spool_path(self, name):
+        """
+        Helper method that gets the path to the file that a column is spooled to.
+
+        Args:
+            name (str):
+                Name of the column.
+
+        Returns:
+            str
+        """
+
+        return f"{self.path}.{name}.part"
+
+    def _write_column(self, name, column):
+        """
+        Helper method that appends entries to a spooled column.
+
+        Args:
+            name (str):
+                Name of the column.
+
+            column (np.ndarray):
+                The entries.
+        """
+
+        column = column.astype(COLUMN_DTYPES[name], copy=False)
+        self._spools[name].write(column.tobytes())
+
+        length, num_bytes = self._column_sizes[name]
+        self._column_sizes[name] = (length + len(column), num_bytes + column.nbytes)
+
+
+# FUNCTIONS
+def iterate_timetable(timetable, start_index=0, end_index=None, words_per_chunk=WORDS_PER_CHUNK):
+    """
+    Iterates over a range of the words of a timetable, decoding a `Timetable`'s words in chunks.
+
+    Args:
+        timetable (union[list[dict], Timetable]):
+            The timetable of spoken words.
+
+        start_index (int):
+            Index of the first word.
+            (Default = 0)
+
+        end_index (int):
+            Index of the word one after the range. Use `None` to iterate to the end.
+            (Default = None)
+
+        words_per_chunk (int):
+            Number of words to decode at a time.
+            (Default = WORDS_PER_CHUNK)
+
+    Yields:
+        dict:
+            The words of the timetable.
+    """
+
+    end_index = len(timetable) if end_index is None else end_index
+
+    for chunk_start in range(start_index, end_index, words_per_chunk):
+        yield from timetable[chunk_start:min(chunk_start + words_per_chunk, end_index)]
+
+
+def timetable_to_columns(timetable):
+    """
+    Converts a timetable into columns.
+
+    Args:
+        timetable (list[dict]):
+            The timetable of spoken words.
+
+    Returns:
+        tuple[dict[str, np.ndarray], list[str]]:
+            The columns and the names of the cases.
+    """
+
+    cases = sorted({word.get("case", "") for word in timetable})
+    case_indices = {case: i for i, case in enumerate(cases)}
+
+    word_bounds, words = encode_strings([word.get("word", "") for word in timetable])
+    aligned_word_bounds, aligned_words = encode_strings([word.get("alignedWord", "") for word in timetable])
+
+    columns = {
+        "start": np.array([word.get("start", np.nan) for word in timetable], dtype=COLUMN_DTYPES["start"]),
+        "end": np.array([word.get("end", np.nan) for word in timetable], dtype=COLUMN_DTYPES["end"]),
+        "start_offset": np.array([word["startOffset"] for word in timetable], dtype=COLUMN_DTYPES["start_offset"]),
+        "end_offset": np.array([word["endOffset"] for word in timetable], dtype=COLUMN_DTYPES["end_offset"]),
+        "case": np.array([case_indices[word.get("case", "")] for word in timetable], dtype=COLUMN_DTYPES["case"]),
+        "word_bounds": word_bounds,
+        "words": words,
+        "aligned_word_bounds": aligned_word_bounds,
+        "aligned_words": aligned_words
+    }
+
+    return columns, cases
+
+
+def save_timetable(timetable, path):
+    """
+    Saves a timetable to a timetable file.
+
+    Args:
+        timetable (list[dict]):
+            The timetable of spoken words.
+
+        path (str):
+            Path to the timetable file.
+    """
+
+    columns, cases = timetable_to_columns(timetable)
+    header, layout = build_header(len(timetable), cases,
+                                  {name: (len(column), column.nbytes) for name, column in columns.items()})
+
+    # Write the file
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack(HEADER_LENGTH_FORMAT, len(header)))
+        f.write(header)
+
+        data_start = f.tell()
+        for name, column in columns.items():
+            f.write(b"\x00" * (data_start + layout[name]["offset"] - f.tell()))
+            f.write(column.tobytes())
+
+
+def load_timetable(path):
+    """
+    Loads a timetable from a timetable file by memory-mapping it.
+
+    Args:
+        path (str):
+            Path to the timetable file.
+
+    Returns:
+        Timetable
+
+    Raises:
+        AssertionError:
+            If the file is not a timetable file.
+
+        FileNotFoundError:
+            If the timetable file does not exist or is not found.
+    """
+
+    # Check if the timetable file exists
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"A timetable file does not exist at the path '{path}'.")
+
+    # Read the header
+    with open(path, "rb") as f:
+        assert f.read(len(MAGIC)) == MAGIC, f"The file at '{path}' is not a timetable file."
+        header_length, = struct.unpack(HEADER_LENGTH_FORMAT, f.read(struct.calcsize(HEADER_LENGTH_FORMAT)))
+        header = json.loads(f.read(header_length).decode("utf-8"))
+        data_start = f.tell()
+
+    # Memory-map the data and view each column in place
+    if os.path.getsize(path) > data_start:
+        data = np.memmap(path, dtype=np.uint8, mode="r", offset=data_start)
+    else:
+        data = np.zeros(0, dtype=np.uint8)  # An empty timetable; empty files cannot be memory-mapped
+
+    columns = {}
+    for name, column_layout in header["columns"].items():
+        dtype = np.dtype(column_layout["dtype"])
+        start = column_layout["offset"]
+        columns[name] = data[start:start + column_layout["length"] * dtype.itemsize].view(dtype)
+
+    return Timetable(columns, header["cases"], path=os.path.abspath(path))
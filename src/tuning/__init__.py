@@ -0,0 +1,2 @@
+from .calibration import make_calibration_workload, measure_job_time, measure_throughput, tune_dtw, tune_gentle
+from .profile import DEFAULT_PROFILE, load_backend_settings, load_profile, PROFILE_PATH, save_backend_settings
@@ -0,0 +1,398 @@
+"""
+calibration.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Measures the captioning throughput of this machine over a sweep of settings to find the fastest ones.
+"""
+
+# IMPORTS
+import itertools
+import math
+import os
+import queue
+import subprocess
+import threading
+import time
+import wave
+
+from src import alignment_backends  # Not importing names, since the DTW backend imports this package
+from src.conversion import extract_audio, get_audio_duration, negotiate_audio_format
+
+# CONSTANTS
+CALIBRATION_MEDIA = os.path.join(os.path.dirname(__file__), "..", "..", "examples", "lucier.mp3")
+CALIBRATION_TRANSCRIPT = os.path.join(os.path.dirname(__file__), "..", "..", "examples", "lucier.txt")
+CALIBRATION_DURATION = 180  # Minimum number of seconds of audio in each calibration job
+
+DEFAULT_GENTLE_IMAGE = "lowerquality/gentle"
+TUNING_CONTAINER_PREFIX = "gentle-tuned"
+TUNING_PORT_START = 8800  # Port of the first container that the tuner makes
+
+
+# FUNCTIONS
+def make_calibration_workload(work_dir, audio_format, media_file=CALIBRATION_MEDIA,
+                              transcript_path=CALIBRATION_TRANSCRIPT, min_duration=CALIBRATION_DURATION):
+    """
+    Makes the audio and transcripts that the settings are measured on.
+
+    The media file is repeated until it is at least `min_duration` long, so that the measurements are dominated by
+    the alignment rather than by fixed costs. The media file on its own is also kept, to separate the two.
+
+    Args:
+        work_dir (str):
+            Directory to write the workload to.
+
+        audio_format (AudioFormat):
+            Format to extract the audio in. Its container must be "wav".
+
+        media_file (str):
+            Path to the video or audio file to calibrate on.
+            (Default = CALIBRATION_MEDIA)
+
+        transcript_path (str):
+            Path to the transcript of the media file.
+            (Default = CALIBRATION_TRANSCRIPT)
+
+        min_duration (float):
+            Minimum number of seconds of audio in the long workload.
+            (Default = 180)
+
+    Returns:
+        tuple[tuple[str, str], tuple[str, str]]:
+            The paths to the audio file and transcript of the short workload and of the long workload.
+    """
+
+    # Extract the audio once
+    short_audio_path = extract_audio(media_file, wav_file_name=os.path.join(work_dir, "short"),
+                                     audio_format=audio_format)
+    short_transcript_path = os.path.join(work_dir, "short.txt")
+
+    with open(transcript_path, "r") as f:
+        transcript = f.read()
+    with open(short_transcript_path, "w") as f:
+        f.write(transcript)
+
+    # Repeat it to make the long workload
+    repeats = max(1, math.ceil(min_duration / get_audio_duration(short_audio_path)))
+    long_audio_path = os.path.join(work_dir, "long.wav")
+    long_transcript_path = os.path.join(work_dir, "long.txt")
+
+    with wave.open(short_audio_path, "rb") as source, wave.open(long_audio_path, "wb") as destination:
+        destination.setparams(source.getparams())
+        frames = source.readframes(source.getnframes())
+
+        for _ in range(repeats):
+            destination.writeframes(frames)
+
+    with open(long_transcript_path, "w") as f:
+        f.write("\n".join([transcript] * repeats))
+
+    return (short_audio_path, short_transcript_path), (long_audio_path, long_transcript_path)
+
+
+def measure_throughput(backends, audio_file_path, transcript_path, jobs_per_worker=2):
+    """
+    Measures how many seconds of audio the workers align per second when all of them are busy.
+
+    Args:
+        backends (list[AlignmentBackend]):
+            The started backend of each worker.
+
+        audio_file_path (str):
+            Path to the audio file of each job.
+
+        transcript_path (str):
+            Path to the transcript of each job.
+
+        jobs_per_worker (int):
+            Number of jobs to give each worker.
+            (Default = 2)
+
+    Returns:
+        float:
+            Seconds of audio aligned per second.
+    """
+
+    pending_jobs = queue.Queue()
+    for job in range(len(backends) * jobs_per_worker):
+        pending_jobs.put(job)
+
+    errors = []
+
+    def work(backend):
+        """Helper function that aligns jobs on one worker until there are none left."""
+        while True:
+            try:
+                pending_jobs.get_nowait()
+            except queue.Empty:
+                return
+
+            try:
+                backend.get_timetables(audio_file_path, [transcript_path])
+            except Exception as e:
+                errors.append(e)
+
+    start_time = time.time()
+
+    threads = [threading.Thread(target=work, args=(backend,)) for backend in backends]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise errors[0]
+
+    return get_audio_duration(audio_file_path) * len(backends) * jobs_per_worker / (time.time() - start_time)
+
+
+def measure_job_time(backend, workload):
+    """
+    Measures how long one worker takes to align a short and a long job, and fits the time per second of audio and the
+    fixed time per job.
+
+    Args:
+        backend (AlignmentBackend):
+            The started backend.
+
+        workload (tuple[tuple[str, str], tuple[str, str]]):
+            The short and long workloads, as from `make_calibration_workload()`.
+
+    Returns:
+        tuple[float, float]:
+            The number of seconds taken per second of audio and the number of seconds taken by each job regardless of
+            its duration.
+    """
+
+    durations, times = [], []
+
+    for audio_file_path, transcript_path in workload:
+        start_time = time.time()
+        backend.get_timetables(audio_file_path, [transcript_path])
+
+        times.append(time.time() - start_time)
+        durations.append(get_audio_duration(audio_file_path))
+
+    real_time_factor = max(0.0, (times[1] - times[0]) / (durations[1] - durations[0]))
+    job_overhead = max(0.0, times[0] - durations[0] * real_time_factor)
+
+    return real_time_factor, job_overhead
+
+
+def tune_dtw(work_dir, worker_counts=(1, 2, 4), window_durations=(30, 60, 120), **workload_kwargs):
+    """
+    Finds the number of workers and the window duration that align the fastest with the DTW backend.
+
+    Args:
+        work_dir (str):
+            Directory to write the calibration workload to.
+
+        worker_counts (tuple[int]):
+            Numbers of workers to try.
+            (Default = (1, 2, 4))
+
+        window_durations (tuple[float]):
+            Window durations to try.
+            (Default = (30, 60, 120))
+
+        **workload_kwargs:
+            Keyword arguments for `make_calibration_workload()`.
+
+    Returns:
+        tuple[dict, list[dict]]:
+            The settings for the tuning profile, and the throughput of every combination that was tried.
+    """
+
+    backend_class = alignment_backends.DTWBackend
+    workload = make_calibration_workload(work_dir, negotiate_audio_format([backend_class.audio_format]),
+                                         **workload_kwargs)
+
+    results = []
+
+    for num_workers, window_duration in itertools.product(worker_counts, window_durations):
+        # Use new backends for every measurement, since they cache the features of the last audio file
+        backends = [backend_class(window_duration=window_duration) for _ in range(num_workers)]
+
+        results.append({"workers": num_workers, "window_duration": window_duration,
+                        "throughput": measure_throughput(backends, *workload[1])})
+        print_result(results[-1])
+
+    best = max(results, key=lambda result: result["throughput"])
+    real_time_factor, job_overhead = measure_job_time(backend_class(window_duration=best["window_duration"]),
+                                                      workload)
+
+    return {"workers": best["workers"], "window_duration": best["window_duration"],
+            "real_time_factor": real_time_factor, "job_overhead": job_overhead}, results
+
+
+def tune_gentle(work_dir, worker_counts=(1, 2, 4), thread_counts=(1, 2, 4), image=None, **workload_kwargs):
+    """
+    Finds the number of gentle servers and the number of threads per server that align the fastest.
+
+    A container is made for each server with the given number of threads. The containers of the fastest combination are
+    kept (stopped) for the pipeline to use; the others are removed. If the tuning fails, every container is removed.
+
+    Args:
+        work_dir (str):
+            Directory to write the calibration workload to.
+
+        worker_counts (tuple[int]):
+            Numbers of gentle servers to try.
+            (Default = (1, 2, 4))
+
+        thread_counts (tuple[int]):
+            Numbers of threads per gentle server to try.
+            (Default = (1, 2, 4))
+
+        image (str):
+            The gentle docker image. Use `None` to use the image of the default gentle container.
+            (Default = None)
+
+        **workload_kwargs:
+            Keyword arguments for `make_calibration_workload()`.
+
+    Returns:
+        tuple[dict, list[dict]]:
+            The settings for the tuning profile, and the throughput of every combination that was tried.
+
+    Raises:
+        AssertionError:
+            If no combination was tried.
+
+        ModuleNotFoundError:
+            If a container could not be created or started.
+
+        TimeoutError:
+            If a gentle server did not become ready in time.
+    """
+
+    backend_class = alignment_backends.GentleBackend
+    workload = make_calibration_workload(work_dir, negotiate_audio_format([backend_class.audio_format]),
+                                         **workload_kwargs)
+    image = image or get_container_image("gentle-container")
+
+    results = []
+    best = None  # Fastest combination so far
+
+    try:
+        for num_threads in thread_counts:
+            # Make enough containers with this number of threads for the largest number of workers
+            containers = []
+
+            try:
+                for i in range(max(worker_counts)):
+                    containers.append(create_gentle_container(f"{TUNING_CONTAINER_PREFIX}-{num_threads}-{i + 1}",
+                                                              TUNING_PORT_START + i, num_threads, image))
+
+                backends = [backend_class(container_name=name, port=port) for name, port in containers]
+                for backend in backends:
+                    backend.start()
+
+                thread_results = []
+                for num_workers in worker_counts:
+                    thread_results.append({"workers": num_workers, "threads": num_threads,
+                                           "throughput": measure_throughput(backends[:num_workers], *workload[1])})
+                    print_result(thread_results[-1])
+
+                results += thread_results
+
+                # Measure the time per job while the containers are up, if these are the fastest settings so far
+                thread_best = max(thread_results, key=lambda result: result["throughput"])
+
+                if best is None or thread_best["throughput"] > best["throughput"]:
+                    best = thread_best
+                    real_time_factor, job_overhead = measure_job_time(backends[0], workload)
+            finally:
+                for name, _ in containers:
+                    subprocess.run(["docker", "stop", name], capture_output=True)
+    except BaseException:
+        best = None  # Keep none of the containers of a failed run
+        raise
+    finally:
+        # Remove the containers that are not needed, or all of them if the tuning failed
+        for num_threads in thread_counts:
+            for i in range(max(worker_counts)):
+                if best is None or num_threads != best["threads"] or i >= best["workers"]:
+                    subprocess.run(["docker", "rm", "-f", f"{TUNING_CONTAINER_PREFIX}-{num_threads}-{i + 1}"],
+                                   capture_output=True)
+
+    assert best is not None, "No combination of worker and thread counts was tried."
+
+    workers = [f"{TUNING_CONTAINER_PREFIX}-{best['threads']}-{i + 1}:{TUNING_PORT_START + i}"
+               for i in range(best["workers"])]
+
+    return {"workers": workers, "threads": best["threads"], "real_time_factor": real_time_factor,
+            "job_overhead": job_overhead}, results
+
+
+# HELPER FUNCTIONS
+def get_container_image(container_name):
+    """
+    Gets the image of a docker container.
+
+    Args:
+        container_name (str):
+            Name of the container.
+
+    Returns:
+        str:
+            The image, or `DEFAULT_GENTLE_IMAGE` if the container does not exist.
+    """
+
+    output = subprocess.run(["docker", "inspect", "--format", "{{.Config.Image}}", container_name],
+                            capture_output=True, text=True)
+
+    return output.stdout.strip() if output.returncode == 0 else DEFAULT_GENTLE_IMAGE
+
+
+def create_gentle_container(name, port, num_threads, image):
+    """
+    Creates (or re-creates) a stopped gentle container whose server uses a number of threads.
+
+    Args:
+        name (str):
+            Name of the container.
+
+        port (int):
+            Port of the host to expose the server on.
+
+        num_threads (int):
+            Number of threads of the server.
+
+        image (str):
+            The gentle docker image.
+
+    Returns:
+        tuple[str, int]:
+            The name and port of the container.
+
+    Raises:
+        ModuleNotFoundError:
+            If the container could not be created.
+    """
+
+    subprocess.run(["docker", "rm", "-f", name], capture_output=True)
+    output = subprocess.run(["docker", "create", "--name", name, "-p", f"{port}:8765", image, "sh", "-c",
+                             f"cd /gentle && python3 serve.py --nthreads {num_threads}"], capture_output=True,
+                            text=True)
+
+    if output.returncode != 0:
+        raise ModuleNotFoundError(f"Creating the gentle container '{name}' failed: {output.stderr.strip()}")
+
+    return name, port
+
+
+def print_result(result):
+    """
+    Prints the throughput of a combination of settings.
+
+    Args:
+        result (dict):
+            The settings and their `throughput`.
+    """
+
+    settings = ", ".join(f"{key} = {value}" for key, value in result.items() if key != "throughput")
+    print(f"{settings}: {result['throughput']:.1f} seconds of audio per second")
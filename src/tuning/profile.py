@@ -0,0 +1,113 @@
+"""
+profile.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Reads and writes the tuning profile, which holds the fastest settings that the `tune` command found.
+"""
+
+# IMPORTS
+import copy
+import json
+import os
+
+# CONSTANTS
+PROFILE_PATH = os.path.join(os.path.expanduser("~"), ".video-to-captions", "profile.json")
+
+DEFAULT_PROFILE = {
+    "gentle": {
+        "workers": ["gentle-container:8765"],  # Gentle servers to spread batches over, as "[container_name]:[port]"
+        "threads": None,  # Number of threads of each gentle server; `None` if the servers were not made by the tuner
+        "chunk_duration": 20,  # Length of the chunks that gentle splits the audio into; matches gentle's value
+        "chunk_overlap": 2,  # Overlap of the chunks that gentle splits the audio into; matches gentle's value
+        "real_time_factor": 0.5,  # Seconds taken to caption each second of audio
+        "job_overhead": 5  # Seconds taken by each job regardless of its duration
+    },
+    "dtw": {
+        "workers": 1,  # Number of files to align at the same time
+        "window_duration": 60,  # Length of the windows that the audio is aligned in
+        "real_time_factor": 0.05,
+        "job_overhead": 1
+    },
+    "approximate": {
+        "workers": 1,
+        "real_time_factor": 0.002,
+        "job_overhead": 0.5
+    }
+}
+
+
+# FUNCTIONS
+def load_profile(profile_path=PROFILE_PATH):
+    """
+    Loads the tuning profile, filling in the settings that it does not have with the defaults.
+
+    Args:
+        profile_path (str):
+            Path to the profile.
+            (Default = PROFILE_PATH)
+
+    Returns:
+        dict:
+            The settings of each backend, as in `DEFAULT_PROFILE`.
+    """
+
+    profile = copy.deepcopy(DEFAULT_PROFILE)
+
+    if os.path.isfile(profile_path):
+        with open(profile_path, "r") as f:
+            for backend, settings in json.load(f).items():
+                profile.setdefault(backend, {}).update(settings)
+
+    return profile
+
+
+def load_backend_settings(backend, profile_path=PROFILE_PATH):
+    """
+    Loads the settings of one backend from the tuning profile.
+
+    Args:
+        backend (str):
+            Name of the backend.
+
+        profile_path (str):
+            Path to the profile.
+            (Default = PROFILE_PATH)
+
+    Returns:
+        dict
+    """
+
+    return load_profile(profile_path).get(backend, {})
+
+
+def save_backend_settings(backend, settings, profile_path=PROFILE_PATH):
+    """
+    Saves the settings of one backend to the tuning profile, keeping the settings of the other backends.
+
+    Args:
+        backend (str):
+            Name of the backend.
+
+        settings (dict):
+            The settings to save.
+
+        profile_path (str):
+            Path to the profile.
+            (Default = PROFILE_PATH)
+    """
+
+    profile = {}
+
+    if os.path.isfile(profile_path):
+        with open(profile_path, "r") as f:
+            profile = json.load(f)
+
+    profile.setdefault(backend, {}).update(settings)
+
+    os.makedirs(os.path.dirname(os.path.abspath(profile_path)), exist_ok=True)
+    with open(profile_path, "w") as f:
+        json.dump(profile, f, indent=2)
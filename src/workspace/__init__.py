@@ -0,0 +1 @@
+from .workspace import estimate_audio_size, Workspace
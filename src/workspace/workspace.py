@@ -0,0 +1,234 @@
+"""
+workspace.py
+
+Created on 2026-10-19
+Updated on 2026-10-19
+
+Copyright © Ryan Kan
+
+Description: Gives each job its own temporary directory, on a RAM-backed filesystem when there is space for it, that is
+             always removed once the job is done.
+"""
+
+# IMPORTS
+import errno
+import os
+import shutil
+import tempfile
+
+from src.conversion.audio_info import probe_media_duration
+
+# CONSTANTS
+MEMORY_FILESYSTEM_DIRS = ("/dev/shm",)  # RAM-backed filesystems to try, in order of preference
+MEMORY_FILL_FRACTION = 0.5  # Fraction of a RAM-backed filesystem's free space that one workspace may expect to use
+
+DEFAULT_SAMPLE_RATE = 44100  # Used to estimate the size of audio whose format keeps the source's properties
+DEFAULT_CHANNELS = 2
+DEFAULT_SAMPLE_WIDTH = 2
+
+
+# CLASS
+class Workspace:
+    """
+    A uniquely named temporary directory for the files of one job.
+
+    Use it as a context manager; the directory and everything in it is removed when the context exits, even if the job
+    failed:
+
+        with Workspace(prefix="job_", expected_size=10 ** 8) as workspace:
+            audio_file_path = workspace.path("audio.wav")
+    """
+
+    # Dunder methods
+    def __init__(self, prefix="job_", expected_size=None, quota=None, prefer_memory=True, base_dir=None):
+        """
+        Initialisation method.
+
+        Args:
+            prefix (str):
+                Prefix of the directory's name.
+                (Default = "job_")
+
+            expected_size (int):
+                Number of bytes that the job is expected to write. The workspace is only put on a RAM-backed filesystem
+                if there is room for this. Use `None` if it is unknown, which always puts the workspace on disk.
+                (Default = None)
+
+            quota (int):
+                Maximum number of bytes that may be stored in the workspace. Use `None` for no quota.
+                (Default = None)
+
+            prefer_memory (bool):
+                Whether the workspace should be put on a RAM-backed filesystem when there is space for it.
+                (Default = True)
+
+            base_dir (str):
+                Directory to create the workspace in on disk. Use `None` to use the system's temporary directory.
+                (Default = None)
+        """
+
+        self.prefix = prefix
+        self.expected_size = expected_size
+        self.quota = quota
+        self.prefer_memory = prefer_memory
+        self.base_dir = base_dir
+
+        self.directory = None
+        self.in_memory = False
+
+    def __enter__(self):
+        self.create()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.remove()
+
+    def __repr__(self):
+        return f"Workspace(directory={self.directory!r}, in_memory={self.in_memory}, quota={self.quota})"
+
+    # Properties
+    @property
+    def used_bytes(self):
+        """
+        Number of bytes stored in the workspace.
+
+        Returns:
+            int
+        """
+
+        total = 0
+
+        for dir_path, _, file_names in os.walk(self.directory):
+            for file_name in file_names:
+                try:
+                    total += os.path.getsize(os.path.join(dir_path, file_name))
+                except FileNotFoundError:
+                    pass  # Removed while walking
+
+        return total
+
+    # Methods
+    def create(self):
+        """
+        Method that creates the workspace's directory.
+
+        Raises:
+            OSError:
+                If the job is expected to write more than the quota allows.
+        """
+
+        if self.quota is not None and self.expected_size is not None and self.expected_size > self.quota:
+            raise OSError(errno.EDQUOT, f"The job is expected to write {self.expected_size} bytes, which is more than "
+                                        f"the workspace's quota of {self.quota} bytes.")
+
+        # Use a RAM-backed filesystem if there is room for the job there
+        memory_dir = find_memory_dir(self.expected_size) if self.prefer_memory else None
+
+        self.in_memory = memory_dir is not None
+        self.directory = tempfile.mkdtemp(prefix=self.prefix, dir=memory_dir or self.base_dir)
+
+    def remove(self):
+        """
+        Method that removes the workspace's directory and everything in it.
+        """
+
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+    def path(self, name):
+        """
+        Method that gets the path to a file in the workspace.
+
+        Args:
+            name (str):
+                Name of the file.
+
+        Returns:
+            str
+
+        Raises:
+            AssertionError:
+                If the workspace has not been created.
+        """
+
+        assert self.directory is not None, "The workspace must be created (e.g. with `with`) before it is used."
+        return os.path.join(self.directory, name)
+
+    def check_quota(self):
+        """
+        Method that checks that the workspace has not grown beyond its quota.
+
+        Raises:
+            OSError:
+                If the workspace stores more than its quota allows.
+        """
+
+        if self.quota is None:
+            return
+
+        used_bytes = self.used_bytes
+
+        if used_bytes > self.quota:
+            raise OSError(errno.EDQUOT, f"The workspace stores {used_bytes} bytes, which is more than its quota of "
+                                        f"{self.quota} bytes.")
+
+
+# FUNCTIONS
+def find_memory_dir(expected_size):
+    """
+    Finds a RAM-backed filesystem with room for a job.
+
+    Args:
+        expected_size (int):
+            Number of bytes that the job is expected to write. Use `None` if it is unknown.
+
+    Returns:
+        union[str, None]:
+            Path to the RAM-backed filesystem, or `None` if there is none with room for the job.
+    """
+
+    if expected_size is None:
+        return None
+
+    for memory_dir in MEMORY_FILESYSTEM_DIRS:
+        if not os.path.isdir(memory_dir) or not os.access(memory_dir, os.W_OK):
+            continue
+
+        # Leave room for the other jobs that are running at the same time
+        if shutil.disk_usage(memory_dir).free * MEMORY_FILL_FRACTION >= expected_size:
+            return memory_dir
+
+    return None
+
+
+def estimate_audio_size(video_or_audio_file, audio_format=None):
+    """
+    Estimates the size of the uncompressed audio that will be extracted from a video or audio file.
+
+    Args:
+        video_or_audio_file (str):
+            Path to the video or audio file.
+
+        audio_format (AudioFormat):
+            The audio format that the audio will be converted into. Use `None` to keep the source's format.
+            (Default = None)
+
+    Returns:
+        union[int, None]:
+            The estimated number of bytes, or `None` if the duration of the file could not be probed.
+    """
+
+    try:
+        duration = probe_media_duration(video_or_audio_file)
+    except Exception:  # E.g. `ffprobe` is not installed
+        return None
+
+    sample_rate, channels, sample_width = DEFAULT_SAMPLE_RATE, DEFAULT_CHANNELS, DEFAULT_SAMPLE_WIDTH
+
+    if audio_format is not None:
+        sample_rate = audio_format.sample_rate or sample_rate
+        channels = audio_format.channels or channels
+        sample_width = audio_format.sample_width or sample_width
+
+    return int(duration * sample_rate * channels * sample_width)